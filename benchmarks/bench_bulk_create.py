@@ -0,0 +1,80 @@
+"""Benchmark : import de N fiches, une par une vs BulkCreateFicheUsecase.
+
+Usage : python -m benchmarks.bench_bulk_create [N] [chunk_size]
+Les deux chemins écrivent dans une base SQLite temporaire sur disque.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from contact_fiche.contact_fiche_usecases import (  # noqa: E402
+    BulkCreateFicheUsecase,
+    CreateFicheUsecase,
+)
+from contact_fiche.enums import OriginContact  # noqa: E402
+from infrastructure.database.fiche_model import Base  # noqa: E402
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+
+
+def lead(n: int) -> dict:
+    return {
+        "lastname": f"Nom{n}",
+        "firstname": "Prénom",
+        "date_rdv": "2025-03-01",
+        "heure_rdv": "10:00",
+        "telephone": f"06{n:08d}",
+        "email": f"lead{n}@salon.fr",
+        "address": f"{n} avenue du Salon",
+        "code_postal": "75000",
+        "city": "Paris",
+        "type_logement": "Maison",
+        "statut_habitation": "Propriétaire",
+        "origin_contact": OriginContact.SALON.value,
+        "commentary": "",
+        "planned_works": ["fenetre"],
+    }
+
+
+def fresh_session(directory: str, name: str) -> Session:
+    engine = create_engine(f"sqlite:///{directory}/{name}.db")
+    Base.metadata.create_all(engine)
+    return Session(engine)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    leads = [lead(n) for n in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with fresh_session(directory, "per_fiche") as session:
+            usecase = CreateFicheUsecase(SQLiteFicheRepository(session))
+            start = time.perf_counter()
+            for item in leads:
+                usecase(**{**item, "origin_contact": OriginContact.SALON})
+            per_fiche = time.perf_counter() - start
+
+        with fresh_session(directory, "bulk") as session:
+            usecase = BulkCreateFicheUsecase(SQLiteFicheRepository(session))
+            start = time.perf_counter()
+            results = usecase(leads, chunk_size=chunk_size)
+            bulk = time.perf_counter() - start
+            assert all(r.status == "created" for r in results)
+
+    print(f"{count} fiches, lots de {chunk_size}")
+    print(f"une par une : {per_fiche:.2f} s ({count / per_fiche:,.0f} fiches/s)")
+    print(f"par lots    : {bulk:.2f} s ({count / bulk:,.0f} fiches/s)")
+    print(f"gain        : x{per_fiche / bulk:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark : taille et latence de GET /fiches selon la compression négociée.
+
+Usage : python -m benchmarks.bench_compression [N] [works_per_fiche] [Mbit/s]
+N fiches (3 travaux chacune par défaut) sont écrites dans une base SQLite
+temporaire, puis pour chaque Accept-Encoding (identity, gzip, br si le paquet
+`brotli` est installé) :
+- parcours de toutes les pages de GET /fiches (limit=500) ;
+- export NDJSON en streaming (GET /fiches/export).
+Sont affichés les octets transférés, le temps serveur (TestClient, meilleure
+de plusieurs passes) et une latence estimée sur un lien au débit donné
+(1 Mbit/s par défaut) : temps serveur + octets / débit.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Tuple
+
+# La base doit exister avant l'import de l'application (engines du processus)
+DIRECTORY = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{DIRECTORY}/fiches.db"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from benchmarks.bench_list_response import fiche  # noqa: E402
+from contact_fiche.pagination import MAX_PAGE_SIZE  # noqa: E402
+from infrastructure.api.compression import available_encodings  # noqa: E402
+from infrastructure.api.main import app  # noqa: E402
+from infrastructure.database.connexion import session_scope  # noqa: E402
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+
+REPEAT = 5
+
+
+def get(client: TestClient, path: str, encoding: str, **params) -> Tuple[int, str]:
+    """Octets reçus (avant décompression) et curseur suivant."""
+    headers = {"Accept-Encoding": encoding}
+    with client.stream("GET", path, params=params, headers=headers) as response:
+        response.raise_for_status()
+        size = sum(len(chunk) for chunk in response.iter_raw())
+        return size, response.headers.get("X-Next-Cursor")
+
+
+def walk(client: TestClient, encoding: str) -> int:
+    """Parcourt toutes les pages de /fiches ; retourne les octets reçus."""
+    total, cursor = 0, None
+    while True:
+        params = {"limit": MAX_PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        size, cursor = get(client, "/fiches", encoding, **params)
+        total += size
+        if cursor is None:
+            return total
+
+
+def export(client: TestClient, encoding: str) -> int:
+    return get(client, "/fiches/export", encoding)[0]
+
+
+def measure(action, client: TestClient, encoding: str) -> Tuple[int, float]:
+    size, best = 0, float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        size = action(client, encoding)
+        best = min(best, time.perf_counter() - start)
+    return size, best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    works = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    mbits = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+    with session_scope() as session:
+        SQLiteFicheRepository(session).save_many(
+            [fiche(n, works) for n in range(count)], chunk_size=1000
+        )
+    print(f"{count} fiches, {works} travaux chacune, lien à {mbits:g} Mbit/s")
+
+    for logger_name in ("httpx", "infrastructure.api.main"):
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
+    encodings = ("identity", *reversed(available_encodings()))
+    with TestClient(app) as client:
+        for name, action in (("GET /fiches", walk), ("GET /fiches/export", export)):
+            print(f"{name} :")
+            for encoding in encodings:
+                size, elapsed = measure(action, client, encoding)
+                link = size * 8 / (mbits * 1_000_000)
+                print(
+                    f"{encoding:>10} : {size / 1024:9.1f} Kio"
+                    f"  serveur {elapsed * 1000:7.1f} ms"
+                    f"  estimé {(elapsed + link) * 1000:9.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark : conversion ligne ORM -> Fiche, avant / après le chemin rapide.
+
+Usage : python -m benchmarks.bench_converter [N] [works_per_fiche]
+Les FicheModel sont construits en mémoire (pas de base) pour ne mesurer que
+la conversion :
+- avant     : Fiche(...) et un WorksPlanned(...) par travail (ancien chemin)
+- construct : Fiche.model_construct / WorksPlanned.model_construct, sans
+              validation (pour comparaison : plus lent en Pydantic 2)
+- après     : FicheConverter.model_to_entity, une validation du dict projeté
+- dict      : FicheConverter.model_to_dict seul (projection pour l'export)
+Chaque mesure garde la meilleure de plusieurs passes.
+"""
+
+import os
+import sys
+import time
+from datetime import date
+from datetime import time as clock
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from contact_fiche.entities.fiche_entity import Fiche  # noqa: E402
+from contact_fiche.entities.works_planned_entity import WorksPlanned  # noqa: E402
+from contact_fiche.enums import OriginContact, Status  # noqa: E402
+from infrastructure.database.fiche_converter import FicheConverter  # noqa: E402
+from infrastructure.database.fiche_model import (  # noqa: E402
+    FicheModel,
+    WorkPlannedModel,
+)
+
+
+def fiche_model(n: int, works: int) -> FicheModel:
+    return FicheModel(
+        id=f"{n:032x}",
+        lastname=f"Nom{n}",
+        firstname="Hélène",
+        date_rdv=date(2025, 3, 1),
+        heure_rdv=clock(10, 0),
+        telephone=f"06{n:08d}",
+        email=f"lead{n}@salon.fr",
+        address=f"{n} avenue du Salon",
+        code_postal="75000",
+        city="Paris",
+        type_logement="Maison",
+        statut_habitation="Propriétaire",
+        origin_contact=OriginContact.SALON,
+        status=Status.IN_PROGRESS,
+        commentary="Rappeler après 18h",
+        planned_works=["fenetre", "volet_roulant"],
+        version=1,
+        work_planned=[
+            WorkPlannedModel(
+                work="fenetre",
+                details={
+                    "material_color": {"materiau": "PVC", "color": "BLANC"},
+                    "type_pose": "Renovation",
+                    "hauteur": 150 + w,
+                    "largeur": 120,
+                },
+            )
+            for w in range(works)
+        ],
+    )
+
+
+def _fields(model: FicheModel, work: Callable) -> Dict[str, Any]:
+    return {
+        "id": model.id,
+        "lastname": model.lastname,
+        "firstname": model.firstname,
+        "date_rdv": model.date_rdv,
+        "heure_rdv": model.heure_rdv,
+        "telephone": model.telephone,
+        "email": model.email,
+        "address": model.address,
+        "code_postal": model.code_postal,
+        "city": model.city,
+        "type_logement": model.type_logement,
+        "statut_habitation": model.statut_habitation,
+        "origin_contact": model.origin_contact,
+        "status": model.status,
+        "commentary": model.commentary,
+        "planned_works": model.planned_works or [],
+        "works_planned": [
+            work(work=wp.work, details=wp.details) for wp in model.work_planned
+        ],
+        "version": model.version,
+    }
+
+
+def kwargs_entity(model: FicheModel) -> Fiche:
+    """Ancien FicheConverter.model_to_entity."""
+    return Fiche(**_fields(model, WorksPlanned))
+
+
+def constructed_entity(model: FicheModel) -> Fiche:
+    return Fiche.model_construct(**_fields(model, WorksPlanned.model_construct))
+
+
+def measure(convert: Callable, models: List[FicheModel], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for model in models:
+            convert(model)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    works = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    models = [fiche_model(n, works) for n in range(count)]
+
+    # Tous les chemins doivent produire la même entité
+    expected = kwargs_entity(models[0])
+    assert constructed_entity(models[0]) == expected
+    assert FicheConverter.model_to_entity(models[0]) == expected
+
+    paths: Dict[str, Callable[[FicheModel], Any]] = {
+        "avant": kwargs_entity,
+        "construct": constructed_entity,
+        "après": FicheConverter.model_to_entity,
+        "dict": FicheConverter.model_to_dict,
+    }
+    print(f"{count} fiches, {works} travaux chacune")
+    baseline = None
+    for name, convert in paths.items():
+        elapsed = measure(convert, models)
+        baseline = baseline or elapsed
+        print(
+            f"{name:>9} : {elapsed * 1000:8.1f} ms "
+            f"({elapsed / count * 1e6:6.1f} µs/fiche, x{baseline / elapsed:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
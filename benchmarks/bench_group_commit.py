@@ -0,0 +1,115 @@
+"""Benchmark : rafales de POST /fiche, un COMMIT par fiche vs group commit.
+
+Usage : python -m benchmarks.bench_group_commit [fiches_par_client] [clients...]
+(par défaut 10 fiches par client, 50, 200 et 500 clients concurrents)
+
+Chaque client crée ses fiches l'une après l'autre via AsyncCreateFicheUsecase,
+comme une tablette qui attend sa réponse avant l'envoi suivant. Base SQLite
+temporaire sur disque, pool réglé comme l'API (engine_options) : une seule
+connexion d'écriture, partagée par les lots du group commit.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from benchmarks.bench_bulk_create import lead  # noqa: E402
+from contact_fiche.contact_fiche_usecases import AsyncCreateFicheUsecase  # noqa: E402
+from contact_fiche.enums import OriginContact  # noqa: E402
+from infrastructure.database.connexion import engine_options  # noqa: E402
+from infrastructure.database.fiche_model import Base  # noqa: E402
+from infrastructure.repositories.async_sqlite_fiche_repository import (  # noqa: E402
+    AsyncSQLiteFicheRepository,
+)
+from infrastructure.repositories.batch_writer import (  # noqa: E402
+    AsyncSessionBatchWriter,
+    GroupCommitFicheRepository,
+)
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+
+
+def count_commits(engine) -> list:
+    commits: list = []
+    event.listen(engine, "commit", lambda conn: commits.append(None))
+    return commits
+
+
+async def burst(create, clients: int, per_client: int):
+    latencies = []
+
+    async def client(number: int) -> None:
+        for n in range(per_client):
+            fields = lead(number * per_client + n)
+            start = time.perf_counter()
+            await create({**fields, "origin_contact": OriginContact.SALON})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(clients)))
+    return time.perf_counter() - start, latencies
+
+
+async def run(directory: str, clients: int, per_client: int, group_commit: bool):
+    url = f"sqlite:///{directory}/{'group' if group_commit else 'direct'}{clients}.db"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(sync_engine)
+    async_url = url.replace("sqlite://", "sqlite+aiosqlite://")
+    async_engine = create_async_engine(async_url, **engine_options(async_url))
+    sync_engine.dispose()
+    commits = count_commits(async_engine.sync_engine)
+    # Comme l'API : les lots passent par l'unique engine d'écriture asynchrone
+    writer = AsyncSessionBatchWriter(
+        async_sessionmaker(bind=async_engine),
+        lambda session: SQLiteFicheRepository(session=session),
+    )
+
+    async def create(fields: dict) -> None:
+        async with AsyncSession(async_engine) as session:
+            repository = AsyncSQLiteFicheRepository(session=session)
+            if group_commit:
+                repository = GroupCommitFicheRepository(repository, writer)
+            await AsyncCreateFicheUsecase(repository)(**fields)
+
+    elapsed, latencies = await burst(create, clients, per_client)
+    await writer.close()
+    await async_engine.dispose()
+    return elapsed, latencies, len(commits)
+
+
+def main() -> None:
+    per_client = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    levels = [int(arg) for arg in sys.argv[2:]] or [50, 200, 500]
+
+    print(f"{per_client} fiches par client")
+    print(f"{'clients':>7} {'mode':<13} {'fiches/s':>9} {'commits':>8} {'p95 ms':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for clients in levels:
+            for group_commit in (False, True):
+                elapsed, latencies, commits = asyncio.run(
+                    run(directory, clients, per_client, group_commit)
+                )
+                total = clients * per_client
+                p95 = statistics.quantiles(latencies, n=20)[-1] * 1000
+                mode = "group commit" if group_commit else "commit/fiche"
+                print(
+                    f"{clients:>7} {mode:<13} {total / elapsed:>9,.0f} "
+                    f"{commits:>8} {p95:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
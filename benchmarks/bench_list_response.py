@@ -0,0 +1,158 @@
+"""Benchmark : sérialisation des listes de fiches renvoyées par GET /fiches.
+
+Usage : python -m benchmarks.bench_list_response [N] [works_per_fiche]
+N fiches (3 travaux chacune par défaut) sont écrites dans une base SQLite
+temporaire, puis :
+- sérialisation seule de N fiches déjà validées :
+  - response_model : revalidation List[Fiche] puis dump_json (FastAPI) ;
+  - response_class : revalidation, model_dump puis json.dumps (chemin d'un
+    response_class JSON déclaré sur la route) ;
+  - jsonable_encoder + json.dumps (route sans response_model) ;
+  - FicheListResponse.render ;
+- de bout en bout : parcours de toutes les pages de GET /fiches (limit=500)
+  via TestClient, comparé à une route identique qui renvoie la liste au
+  response_model comme avant.
+Chaque mesure garde la meilleure de plusieurs passes.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+# La base doit exister avant l'import de l'application (engines du processus)
+DIRECTORY = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{DIRECTORY}/fiches.db"
+
+from fastapi import Depends, Query, Response  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from benchmarks.bench_bulk_create import lead  # noqa: E402
+from contact_fiche.contact_fiche_usecases import (  # noqa: E402
+    AsyncSearchFichesUsecase,
+)
+from contact_fiche.entities.fiche_entity import Fiche  # noqa: E402
+from contact_fiche.entities.works_planned_entity import WorksPlanned  # noqa: E402
+from contact_fiche.enums import OriginContact, Status  # noqa: E402
+from contact_fiche.fiche_filter import FicheFilter  # noqa: E402
+from contact_fiche.pagination import MAX_PAGE_SIZE  # noqa: E402
+from infrastructure.api.main import (  # noqa: E402
+    app,
+    get_fiche_filter,
+    get_search_fiches_usecase,
+    read_page,
+)
+from infrastructure.api.responses import FicheListResponse  # noqa: E402
+from infrastructure.database.connexion import session_scope  # noqa: E402
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+
+STATUSES = list(Status)
+REPEAT = 5
+
+
+def fiche(n: int, works: int) -> Fiche:
+    return Fiche(
+        **{
+            **lead(n),
+            "origin_contact": OriginContact.SALON,
+            "commentary": "Rappeler après 18h",
+        },
+        id=f"{n:032x}",
+        status=STATUSES[n % len(STATUSES)],
+        works_planned=[
+            WorksPlanned(
+                work="fenetre",
+                details={
+                    "material_color": {"materiau": "PVC", "color": "BLANC"},
+                    "type_pose": "Renovation",
+                    "hauteur": 150 + w,
+                    "largeur": 120,
+                },
+            )
+            for w in range(works)
+        ],
+    )
+
+
+@app.get("/bench/fiches", response_model=List[Fiche])
+async def read_fiches_validated(
+    response: Response,
+    filters: FicheFilter = Depends(get_fiche_filter),
+    limit: int = Query(MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    usecase: AsyncSearchFichesUsecase = Depends(get_search_fiches_usecase),
+):
+    """Ancienne version de GET /fiches : liste revalidée par response_model."""
+    page = await read_page(usecase, filters, limit, cursor)
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+def best_of(action: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def walk(client: TestClient, path: str) -> int:
+    """Parcourt toutes les pages de `path` ; retourne le nombre de fiches."""
+    count, cursor = 0, None
+    while True:
+        params = {"limit": MAX_PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        response.raise_for_status()
+        count += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    works = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    fiches = [fiche(n, works) for n in range(count)]
+    with session_scope() as session:
+        SQLiteFicheRepository(session).save_many(fiches, chunk_size=1000)
+    print(f"{count} fiches, {works} travaux chacune")
+
+    adapter = TypeAdapter(List[Fiche])
+    encoders = {
+        "response_model": lambda: adapter.dump_json(adapter.validate_python(fiches)),
+        "response_class": lambda: json.dumps(
+            adapter.dump_python(adapter.validate_python(fiches), mode="json"),
+            ensure_ascii=False,
+        ).encode("utf-8"),
+        "jsonable_encoder": lambda: json.dumps(
+            jsonable_encoder(fiches), ensure_ascii=False
+        ).encode("utf-8"),
+        "FicheListResponse": lambda: FicheListResponse(fiches).body,
+    }
+    expected = json.loads(encoders["response_model"]())
+    assert all(json.loads(encode()) == expected for encode in encoders.values())
+    print("sérialisation seule :")
+    for name, encode in encoders.items():
+        elapsed = best_of(encode)
+        print(f"{name:>18} : {elapsed * 1000:7.1f} ms")
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(f"GET de toutes les pages (limit={MAX_PAGE_SIZE}) :")
+    with TestClient(app) as client:
+        for name, path in (("avant", "/bench/fiches"), ("après", "/fiches")):
+            assert walk(client, path) == count
+            elapsed = best_of(lambda: walk(client, path))
+            print(f"{name:>18} : {elapsed * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Micro-benchmark : validation JSON Schema compilée vs `jsonschema.validate`.
+
+Usage : python -m benchmarks.bench_schema_validation
+"""
+
+import timeit
+
+from jsonschema import validate
+
+from config.works_schemas_config import WorkSchemaConfigService
+
+CONFIG_PATH = "config/config_works.json"
+WORKS_PER_REQUEST = 12
+REPEAT = 200
+
+DETAILS = {
+    "material_color": {"materiau": "PVC", "color": "BLANC"},
+    "type_window": "Fenetre 1 vantail",
+    "tirant": "Droit",
+    "hauteur": 120,
+    "largeur": 80,
+}
+
+
+def main() -> None:
+    service = WorkSchemaConfigService(config_path=CONFIG_PATH)
+    schema = service.get_schema("fenetre")
+    validator = service.get_validator("fenetre")
+
+    def current_path() -> None:
+        for _ in range(WORKS_PER_REQUEST):
+            validate(instance=DETAILS, schema=schema)
+
+    def compiled_path() -> None:
+        for _ in range(WORKS_PER_REQUEST):
+            validator.validate(DETAILS)
+
+    current = min(timeit.repeat(current_path, number=REPEAT, repeat=3)) / REPEAT
+    compiled = min(timeit.repeat(compiled_path, number=REPEAT, repeat=3)) / REPEAT
+
+    print(f"{WORKS_PER_REQUEST} travaux par requête")
+    print(f"jsonschema.validate : {current * 1e3:.3f} ms / requête")
+    print(f"validateur compilé  : {compiled * 1e3:.3f} ms / requête")
+    print(f"gain                : x{current / compiled:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark : recherche plein texte (FTS5) sur N fiches.
+
+Usage : python -m benchmarks.bench_search [N]
+Les fiches sont importées par lots dans une base SQLite temporaire sur
+disque, puis chaque requête est exécutée plusieurs fois via
+SQLiteFicheRepository.search.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from contact_fiche.contact_fiche_usecases import BulkCreateFicheUsecase  # noqa: E402
+from infrastructure.database.fiche_model import Base  # noqa: E402
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+
+from benchmarks.bench_bulk_create import lead  # noqa: E402
+
+FIRSTNAMES = ["Hélène", "Jérôme", "François", "Anaïs", "Noël", "Zoé", "Loïc"]
+STREETS = ["rue de la République", "avenue Émile Zola", "boulevard Pasteur"]
+
+QUERIES = ["helene", "Jérôme Nom12", "zola", "06000123", "nom9999", "introuvable"]
+REPEAT = 50
+
+
+def contact(n: int) -> dict:
+    return {
+        **lead(n),
+        "firstname": FIRSTNAMES[n % len(FIRSTNAMES)],
+        "address": f"{n % 200} {STREETS[n % len(STREETS)]}",
+        "commentary": "Rappeler après 18h" if n % 3 == 0 else "",
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/search.db")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            repository = SQLiteFicheRepository(session)
+            BulkCreateFicheUsecase(repository)(
+                [contact(n) for n in range(count)], chunk_size=1000
+            )
+
+            print(f"{count} fiches indexées")
+            for query in QUERIES:
+                timings = []
+                for _ in range(REPEAT):
+                    start = time.perf_counter()
+                    results = repository.search(query, limit=20)
+                    timings.append((time.perf_counter() - start) * 1000)
+                print(
+                    f"{query!r:>16} : {len(results):>2} résultats, "
+                    f"médiane {statistics.median(timings):.2f} ms, "
+                    f"max {max(timings):.2f} ms"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
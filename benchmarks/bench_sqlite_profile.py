@@ -0,0 +1,135 @@
+"""Benchmark : lectures et écritures concurrentes sur une base SQLite sur disque.
+
+Usage : python -m benchmarks.bench_sqlite_profile [secondes] [écrivains] [lecteurs]
+(par défaut 5 s, 4 processus écrivains, 8 processus lecteurs)
+
+Compare l'engine d'avant le profil (un seul pool, aucun pragma, journal
+rollback) au profil SQLite de connexion.py (WAL, pragmas, une connexion
+d'écriture et un pool de lecteurs en lecture seule). Un processus par
+client, comme plusieurs workers uvicorn sur la même base : les écrivains
+créent des fiches une par une, les lecteurs lisent des fiches par id.
+Une opération qui attend un verrou plus de `busy_timeout` (5 s) échoue
+avec "database is locked" : colonne `locked`.
+"""
+
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from infrastructure.database.connexion import (  # noqa: E402
+    configure_engine,
+    engine_options,
+)
+from infrastructure.database.fiche_model import Base  # noqa: E402
+from infrastructure.database.instrumentation import instrument_engine  # noqa: E402
+from infrastructure.repositories.sqlite_fiche_repository import (  # noqa: E402
+    SQLiteFicheRepository,
+)
+from tests.test_sqlite_fiche_repository import make_fiche  # noqa: E402
+
+SEED = 2000
+
+
+def engines(url: str, profile: bool):
+    """(engine d'écriture, engine de lecture) d'un processus client."""
+    if not profile:
+        engine = create_engine(url, **engine_options(url, read_only=True))
+        return instrument_engine(engine), engine
+    writer = configure_engine(create_engine(url, **engine_options(url)))
+    reader = configure_engine(
+        create_engine(url, **engine_options(url, read_only=True)), read_only=True
+    )
+    return writer, reader
+
+
+def client(url: str, profile: bool, role: str, ids: list, seconds: float):
+    """Boucle d'un processus client : (rôle, durées des succès, échecs locked)."""
+    writer, reader = engines(url, profile)
+
+    def write() -> None:
+        with Session(writer) as session:
+            SQLiteFicheRepository(session).save(make_fiche())
+
+    def read() -> None:
+        with Session(reader) as session:
+            SQLiteFicheRepository(session).get_by_id(random.choice(ids))
+
+    action = write if role == "write" else read
+    latencies, locked = [], 0
+    stop = time.monotonic() + seconds
+    while time.monotonic() < stop:
+        start = time.perf_counter()
+        try:
+            action()
+        except (OperationalError, RuntimeError) as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+    return role, latencies, locked
+
+
+def run(url: str, profile: bool, seconds: float, writers: int, readers: int):
+    writer, _ = engines(url, profile)
+    Base.metadata.create_all(writer)
+    seeded = [make_fiche() for _ in range(SEED)]
+    with Session(writer) as session:
+        SQLiteFicheRepository(session).save_many(seeded)
+    writer.dispose()
+    ids = [fiche.id for fiche in seeded]
+
+    roles = ["write"] * writers + ["read"] * readers
+    with multiprocessing.Pool(len(roles)) as pool:
+        results = pool.starmap(
+            client, [(url, profile, role, ids, seconds) for role in roles]
+        )
+
+    latencies = {"write": [], "read": []}
+    locked = 0
+    for role, role_latencies, role_locked in results:
+        latencies[role].extend(role_latencies)
+        locked += role_locked
+    return latencies, locked
+
+
+def p99(latencies: list) -> float:
+    if len(latencies) < 2:
+        return 0.0
+    return statistics.quantiles(latencies, n=100)[-1] * 1000
+
+
+def main() -> None:
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    print(f"{seconds:g} s, {writers} écrivains, {readers} lecteurs, {SEED} fiches")
+    print(
+        f"{'profil':<8} {'lectures/s':>11} {'p99 lecture':>12} "
+        f"{'écritures/s':>12} {'p99 écriture':>13} {'locked':>7}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, profile in (("défaut", False), ("sqlite", True)):
+            url = f"sqlite:///{directory}/{name}.db"
+            latencies, locked = run(url, profile, seconds, writers, readers)
+            reads, writes = latencies["read"], latencies["write"]
+            print(
+                f"{name:<8} {len(reads) / seconds:>11,.0f} {p99(reads):>9.1f} ms "
+                f"{len(writes) / seconds:>12,.0f} {p99(writes):>10.1f} ms "
+                f"{locked:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
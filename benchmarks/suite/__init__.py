@@ -0,0 +1,9 @@
+"""Suite de benchmarks reproductible de l'API (python -m benchmarks.suite).
+
+Chaque taille de jeu de données (1 000, 10 000 et 100 000 fiches par défaut)
+est mesurée dans un sous-processus, sur une base fraîche remplie de fiches
+synthétiques déterministes : micro-benchmarks par route (min / médiane /
+p95 / p99 par requête, à la pytest-benchmark), puis une charge concurrente
+(débit, latences, erreurs). Les résultats sont écrits en JSON dans
+`.benchmarks/` pour comparer deux commits (`compare`).
+"""
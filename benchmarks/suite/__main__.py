@@ -0,0 +1,279 @@
+"""CLI de la suite de benchmarks.
+
+    python -m benchmarks.suite run [--sizes 1000 10000 100000] [--rounds 100]
+        [--concurrency 20] [--duration 10] [--database-url URL]
+        [--base-url URL] [--output FICHIER]
+    python -m benchmarks.suite seed --size N --database-url URL
+    python -m benchmarks.suite compare AVANT.json APRES.json [--threshold 0.1]
+
+`run` mesure chaque taille dans un sous-processus, sur une base SQLite
+temporaire sur disque, ou sur la base de --database-url (une base Postgres
+locale par exemple), vidée et remplie à nouveau pour chaque taille.
+`run` signale aussi les scénarios dont la médiane est multipliée par plus
+de 3 entre la plus petite et la plus grande taille (DÉGRADATION).
+`compare` sort avec le code 1 si une médiane se dégrade de plus de
+--threshold (10 %) ou si le débit de la charge baisse d'autant.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.suite.results import (
+    DEFAULT_SCALING_LIMIT,
+    DEFAULT_THRESHOLD,
+    commit_info,
+    compare,
+    compare_load,
+    load_results,
+    machine_info,
+    scaling,
+    write_results,
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+# Réglages de l'API qui changent les résultats, recopiés dans le JSON
+SETTINGS_PREFIXES = (
+    "FICHE_CACHE_",
+    "GROUP_COMMIT_",
+    "SQLITE_",
+    "DB_POOL_",
+    "DB_MAX_OVERFLOW",
+    "COMPRESSION_",
+)
+
+
+def redact(url: str) -> str:
+    from sqlalchemy.engine import make_url
+
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def measure(args: argparse.Namespace) -> None:
+    """Sous-processus d'une taille (base : DATABASE_URL) : remplissage,
+    scénarios, charge."""
+    from benchmarks.suite.driver import Scenarios, load, measure_scenarios, open_client
+
+    for logger_name in ("httpx", "infrastructure.api"):
+        logging.getLogger(logger_name).setLevel(logging.WARNING)
+
+    seed_seconds = None
+    if not args.base_url:
+        from benchmarks.suite.seeding import seed
+
+        seed_seconds = seed(args.size)
+    scenarios = Scenarios(args.size, reserved=args.warmup + args.rounds)
+
+    async def session() -> Dict[str, Any]:
+        async with open_client(args.base_url) as client:
+            benchmarks = await measure_scenarios(
+                client, scenarios, args.rounds, args.warmup
+            )
+            result: Dict[str, Any] = {"benchmarks": benchmarks, "load": None}
+            if args.duration > 0:
+                result["load"] = await load(
+                    client, scenarios, args.concurrency, args.duration
+                )
+            return result
+
+    result = asyncio.run(session())
+    result["seed"] = {"size": args.size, "seconds": seed_seconds}
+    Path(args.output).write_text(json.dumps(result))
+
+
+def measure_size(args: argparse.Namespace, size: int, directory: str) -> Dict:
+    output = Path(directory) / f"{size}.json"
+    database_url = args.database_url or f"sqlite:///{directory}/bench{size}.db"
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.suite",
+        "measure",
+        f"--size={size}",
+        f"--rounds={args.rounds}",
+        f"--warmup={args.warmup}",
+        f"--concurrency={args.concurrency}",
+        f"--duration={args.duration}",
+        f"--output={output}",
+    ]
+    if args.base_url:
+        command.append(f"--base-url={args.base_url}")
+    env = {**os.environ, "DATABASE_URL": database_url}
+    subprocess.run(command, env=env, check=True)
+    return load_results(output)
+
+
+def print_size(measured: Dict[str, Any]) -> None:
+    print(
+        f"{'benchmark':<22} {'médiane ms':>11} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'ops/s':>8} {'erreurs':>8}"
+    )
+    for bench in measured["benchmarks"]:
+        stats = bench["stats"]
+        if not stats["rounds"]:
+            print(
+                f"{bench['name']:<22} {'-':>11} {'':>8} {'':>8} {'':>8} "
+                f"{bench['errors']:>8}"
+            )
+            continue
+        print(
+            f"{bench['name']:<22} {stats['median'] * 1000:>11.2f} "
+            f"{stats['p95'] * 1000:>8.2f} {stats['p99'] * 1000:>8.2f} "
+            f"{stats['ops']:>8,.0f} {bench['errors']:>8}"
+        )
+    charge = measured["load"]
+    if charge:
+        latency = charge["latency"]
+        p99 = latency["p99"] * 1000 if latency["rounds"] else 0.0
+        print(
+            f"charge : {charge['concurrency']} utilisateurs, "
+            f"{charge['throughput']:,.0f} req/s, p99 {p99:.1f} ms, "
+            f"{charge['errors']} erreurs"
+        )
+
+
+def run(args: argparse.Namespace) -> None:
+    if args.base_url and len(args.sizes) != 1:
+        sys.exit("--base-url : une seule taille, celle de la base remplie par seed")
+    report: Dict[str, Any] = {
+        "version": 1,
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "machine_info": machine_info(),
+        "commit_info": commit_info(),
+        "database": args.base_url
+        or (redact(args.database_url) if args.database_url else "sqlite temporaire"),
+        "config": {
+            "sizes": args.sizes,
+            "rounds": args.rounds,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "settings": {
+                name: value
+                for name, value in sorted(os.environ.items())
+                if name.startswith(SETTINGS_PREFIXES)
+            },
+        },
+        "benchmarks": [],
+        "load": [],
+        "seed": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            print(f"== {size} fiches")
+            measured = measure_size(args, size, directory)
+            report["benchmarks"].extend(measured["benchmarks"])
+            if measured["load"]:
+                report["load"].append(measured["load"])
+            report["seed"].append(measured["seed"])
+            print_size(measured)
+    print_scaling(report)
+    path = write_results(report, Path(args.output) if args.output else None)
+    print(f"Résultats : {path}")
+
+
+def print_scaling(report: Dict[str, Any]) -> None:
+    rows = scaling(report)
+    if not rows:
+        return
+    print(f"== volumétrie (DÉGRADATION au-delà de x{DEFAULT_SCALING_LIMIT:g})")
+    for scenario, small, before, large, after, degraded in rows:
+        flag = "  DÉGRADATION" if degraded else ""
+        print(
+            f"{scenario:<22} {small:>7} : {before * 1000:>8.2f} ms  "
+            f"{large:>7} : {after * 1000:>8.2f} ms  x{after / before:.1f}{flag}"
+        )
+
+
+def seed_command(args: argparse.Namespace) -> None:
+    os.environ["DATABASE_URL"] = args.database_url
+    from benchmarks.suite.seeding import seed
+
+    seconds = seed(args.size)
+    print(f"{args.size} fiches insérées en {seconds:.1f} s")
+
+
+def compare_command(args: argparse.Namespace) -> None:
+    old, new = load_results(args.old), load_results(args.new)
+    regressions = 0
+    print(f"{'benchmark':<22} {'avant ms':>9} {'après ms':>9} {'écart':>8}")
+    for name, before, after, change, regression in compare(old, new, args.threshold):
+        regressions += regression
+        flag = "  RÉGRESSION" if regression else ""
+        print(
+            f"{name:<22} {before * 1000:>9.2f} {after * 1000:>9.2f} "
+            f"{change:>+8.1%}{flag}"
+        )
+    for size, before, after, change, regression in compare_load(
+        old, new, args.threshold
+    ):
+        regressions += regression
+        flag = "  RÉGRESSION" if regression else ""
+        print(
+            f"{f'charge[{size}]':<22} {before:>7,.0f}/s {after:>7,.0f}/s "
+            f"{change:>+8.1%}{flag}"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_measure_options(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--rounds", type=int, default=100)
+        command.add_argument("--warmup", type=int, default=10)
+        command.add_argument("--concurrency", type=int, default=20)
+        command.add_argument(
+            "--duration", type=float, default=10.0, help="charge, en s (0 : aucune)"
+        )
+        command.add_argument("--base-url", help="serveur déjà démarré (et rempli)")
+
+    run_parser = commands.add_parser("run", help="mesurer et écrire le JSON")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument(
+        "--database-url", help="base vidée puis remplie (défaut : SQLite temporaire)"
+    )
+    run_parser.add_argument(
+        "--output", help="défaut : .benchmarks/<date>_<commit>.json"
+    )
+    add_measure_options(run_parser)
+    run_parser.set_defaults(handler=run)
+
+    seed_parser = commands.add_parser("seed", help="remplir une base pour --base-url")
+    seed_parser.add_argument("--size", type=int, required=True)
+    seed_parser.add_argument("--database-url", required=True)
+    seed_parser.set_defaults(handler=seed_command)
+
+    compare_parser = commands.add_parser("compare", help="comparer deux résultats")
+    compare_parser.add_argument("old", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.set_defaults(handler=compare_command)
+
+    # Sous-processus lancé par `run`, une taille par processus
+    measure_parser = commands.add_parser("measure")
+    measure_parser.add_argument("--size", type=int, required=True)
+    measure_parser.add_argument("--output", required=True)
+    add_measure_options(measure_parser)
+    measure_parser.set_defaults(handler=measure)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
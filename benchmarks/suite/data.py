@@ -0,0 +1,120 @@
+"""Jeu de données synthétique et déterministe de la suite.
+
+La fiche numéro n ne dépend que de n (et de SEED) : le driver retrouve les
+ids et les statuts sans interroger la base, y compris quand l'API tourne
+dans un autre processus sur une base remplie par `seed`.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+SEED = 2024
+
+CITIES = [
+    "Paris",
+    "Lyon",
+    "Marseille",
+    "Toulouse",
+    "Nantes",
+    "Lille",
+    "Bordeaux",
+    "Rennes",
+    "Strasbourg",
+    "Montpellier",
+    "Nice",
+    "Tours",
+]
+LASTNAMES = ["Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand"]
+FIRSTNAMES = ["Camille", "Louis", "Emma", "Hugo", "Léa", "Jules", "Chloé", "Adam"]
+ORIGINS = ["Salon", "Ancien client", "Réseaux sociaux", "Affichage"]
+PLANNED_WORKS = ["fenetre", "porte_entree", "volet_roulant", "portail", "pergola"]
+# Couleurs valides par matériau (config/config_works.json)
+COLORS = {
+    "PVC": ["GRIS", "BEIGE", "BLANC"],
+    "BOIS": ["CHENE CLAIR", "CHENE FONCE"],
+    "ALU": ["ALU_OPTION1", "ALU_OPTION2"],
+}
+FIRST_RDV = date(2025, 1, 6)
+
+
+def fiche_id(n: int) -> str:
+    return f"bench{n:07d}"
+
+
+def fenetre_details(rng: random.Random) -> Dict[str, Any]:
+    """Détails d'une fenêtre valides pour le schéma de configuration."""
+    materiau = rng.choice(list(COLORS))
+    return {
+        "material_color": {"materiau": materiau, "color": rng.choice(COLORS[materiau])},
+        "choice_piece": rng.choice(["Salon", "Chambre", "Cuisine"]),
+        "type_pose": rng.choice(["Renovation", "Neuf", "Feuillure"]),
+        "type_window": "Fenetre 2 vantaux",
+        "hauteur": rng.randrange(60, 240, 5),
+        "largeur": rng.randrange(40, 200, 5),
+        "allege": rng.choice(["Oui", "Non"]),
+        "hab_int": rng.choice(["Oui", "Non"]),
+        "hab_ext": rng.choice(["Oui", "Non"]),
+        "grille_ventilation": rng.choice(["Oui", "Non"]),
+        "commentary": "https://example.com/photos/fenetre",
+    }
+
+
+def fiche_fields(n: int) -> Dict[str, Any]:
+    """Champs JSON de la fiche synthétique numéro n.
+
+    Environ 60 % des fiches sont en cours, 25 % validées (avec des travaux
+    détaillés) et 15 % au statut par défaut.
+    """
+    rng = random.Random(SEED * 1_000_003 + n)
+    lastname = rng.choice(LASTNAMES)
+    draw = rng.random()
+    status = "In Progress" if draw < 0.6 else "Completed" if draw < 0.85 else "Default"
+    works_planned = []
+    if status == "Completed":
+        works_planned = [
+            {"work": "fenetre", "details": fenetre_details(rng)}
+            for _ in range(rng.randint(1, 3))
+        ]
+    rdv = FIRST_RDV + timedelta(days=rng.randrange(365))
+    return {
+        "id": fiche_id(n),
+        "lastname": f"{lastname}{n}",
+        "firstname": rng.choice(FIRSTNAMES),
+        "date_rdv": rdv.isoformat(),
+        "heure_rdv": f"{rng.randrange(8, 19):02d}:{rng.choice([0, 15, 30, 45]):02d}",
+        "telephone": f"06{n:08d}",
+        "email": f"contact{n}@example.com",
+        "address": f"{rng.randint(1, 200)} rue des Artisans",
+        "code_postal": f"{rng.randint(1, 95):02d}{rng.randint(0, 999):03d}",
+        "city": rng.choice(CITIES),
+        "type_logement": rng.choice(["Maison", "Appartement"]),
+        "statut_habitation": rng.choice(["Propriétaire", "Locataire"]),
+        "origin_contact": rng.choice(ORIGINS),
+        "planned_works": rng.sample(PLANNED_WORKS, rng.randint(1, 3)),
+        "works_planned": works_planned,
+        "commentary": "",
+        "status": status,
+    }
+
+
+def reserved_ids(size: int, count: int) -> Dict[str, List[str]]:
+    """Fiches consommées par les scénarios destructifs, prises en fin de jeu.
+
+    `completion` reçoit des fiches en cours (la validation les fait passer à
+    COMPLETED), `delete` d'autres fiches : chaque requête mesurée porte sur
+    une fiche que le scénario n'a pas encore modifiée.
+    """
+    completion: List[str] = []
+    delete: List[str] = []
+    for n in range(size - 1, -1, -1):
+        in_progress = fiche_fields(n)["status"] == "In Progress"
+        if in_progress and len(completion) < count:
+            completion.append(fiche_id(n))
+        elif len(delete) < count:
+            delete.append(fiche_id(n))
+        if len(completion) == count and len(delete) == count:
+            return {"completion": completion, "delete": delete}
+    raise ValueError(
+        f"{size} fiches ne suffisent pas pour réserver {count} fiches par scénario"
+    )
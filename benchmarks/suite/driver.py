@@ -0,0 +1,223 @@
+"""Scénarios HTTP de la suite et driver de charge (httpx).
+
+Sans `base_url`, les requêtes passent par l'application en mémoire
+(httpx.ASGITransport) : middlewares, dépendances et base comprises, sans
+réseau ni serveur. Avec `base_url`, elles visent un serveur déjà démarré
+sur une base remplie par `python -m benchmarks.suite seed`.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from benchmarks.suite.data import (
+    CITIES,
+    SEED,
+    fenetre_details,
+    fiche_fields,
+    fiche_id,
+    reserved_ids,
+)
+from benchmarks.suite.results import benchmark_entry, summarize
+
+# Scénarios mesurés, dans l'ordre d'exécution : lectures d'abord, puis les
+# écritures (delete en dernier, il retire des fiches du jeu)
+SCENARIOS = [
+    "get",
+    "list",
+    "en_cours",
+    "villes",
+    "create",
+    "update",
+    "completion",
+    "delete",
+]
+# Mélange de la charge concurrente : poids relatif de chaque opération
+LOAD_MIX = {
+    "get": 50,
+    "list": 15,
+    "en_cours": 10,
+    "villes": 5,
+    "create": 15,
+    "update": 5,
+}
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str] = None) -> AsyncIterator[Any]:
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+    from infrastructure.api.main import app
+
+    # Sans lifespan, ASGITransport ne démarre ni n'arrête l'application
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            yield client
+
+
+def new_fiche(n: int) -> Dict[str, Any]:
+    """Corps de POST /fiche : une fiche hors du jeu (ids et téléphones propres)."""
+    fields = fiche_fields(n)
+    fields.update(id=f"new{n:07d}", telephone=f"07{n:08d}", works_planned=[])
+    return fields
+
+
+class Scenarios:
+    """Requêtes des scénarios pour un jeu de `size` fiches.
+
+    `request(name)` retourne la fonction (client, i) -> réponse de la
+    i-ème requête du scénario ; les requêtes destructives consomment les
+    fiches de `reserved_ids`, chacune une seule fois.
+    """
+
+    def __init__(self, size: int, reserved: int) -> None:
+        self.size = size
+        self.reserved = reserved_ids(size, reserved)
+        taken = set(self.reserved["completion"]) | set(self.reserved["delete"])
+        self.free = [n for n in range(size) if fiche_id(n) not in taken]
+        self.rng = random.Random(SEED)
+        self.created = 0
+
+    def any_fiche(self) -> int:
+        return self.rng.choice(self.free)
+
+    async def get(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(f"/fiche/{fiche_id(self.any_fiche())}")
+
+    async def list(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get(
+            "/fiches", params={"limit": 50, "city": self.rng.choice(CITIES)}
+        )
+
+    async def en_cours(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/fiches/en-cours", params={"limit": 50})
+
+    async def villes(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.get("/fiches/villes")
+
+    async def create(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        self.created += 1
+        return await client.post("/fiche", json=new_fiche(self.created))
+
+    async def update(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        n = self.any_fiche()
+        body = fiche_fields(n)
+        body["commentary"] = f"Rappel {i}"
+        return await client.patch(f"/fiche/{fiche_id(n)}", json=body)
+
+    async def completion(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        works = [{"work": "fenetre", "details": fenetre_details(self.rng)}]
+        return await client.put(
+            f"/fiche/{self.reserved['completion'][i]}/travaux",
+            json={"works_planned": works},
+        )
+
+    async def delete(self, client: httpx.AsyncClient, i: int) -> httpx.Response:
+        return await client.delete(f"/fiche/{self.reserved['delete'][i]}")
+
+    def request(self, name: str) -> Request:
+        request: Request = getattr(self, name)
+        return request
+
+
+async def timed(
+    request: Request, client: httpx.AsyncClient, i: int
+) -> Tuple[float, bool]:
+    start = time.perf_counter()
+    response = await request(client, i)
+    elapsed = time.perf_counter() - start
+    return elapsed, response.is_success
+
+
+async def measure_scenarios(
+    client: httpx.AsyncClient,
+    scenarios: Scenarios,
+    rounds: int,
+    warmup: int,
+    names: List[str] = SCENARIOS,
+) -> List[Dict[str, Any]]:
+    """Micro-benchmarks : requêtes séquentielles, `warmup` tours non comptés."""
+    entries = []
+    for name in names:
+        request = scenarios.request(name)
+        durations, errors = [], 0
+        for i in range(warmup + rounds):
+            elapsed, ok = await timed(request, client, i)
+            if i < warmup:
+                continue
+            if ok:
+                durations.append(elapsed)
+            else:
+                errors += 1
+        entries.append(benchmark_entry(name, scenarios.size, durations, errors))
+    return entries
+
+
+async def load(
+    client: httpx.AsyncClient,
+    scenarios: Scenarios,
+    concurrency: int,
+    duration: float,
+    mix: Dict[str, int] = LOAD_MIX,
+) -> Dict[str, Any]:
+    """Charge : `concurrency` utilisateurs virtuels enchaînent des requêtes
+    tirées selon `mix` pendant `duration` secondes, sans temps de pause."""
+    names, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    deadline = time.monotonic() + duration
+
+    async def user(number: int) -> None:
+        rng = random.Random(SEED + number)
+        i = 0
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            try:
+                elapsed, ok = await timed(scenarios.request(name), client, i)
+            except httpx.HTTPError:
+                elapsed, ok = 0.0, False
+            if ok:
+                latencies[name].append(elapsed)
+            else:
+                errors[name] += 1
+            i += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    everything = [value for values in latencies.values() for value in values]
+    total = len(everything) + sum(errors.values())
+    return {
+        "size": scenarios.size,
+        "concurrency": concurrency,
+        "duration": elapsed,
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput": total / elapsed if elapsed else 0.0,
+        "latency": summarize(everything),
+        "operations": {
+            name: {"errors": errors[name], "stats": summarize(latencies[name])}
+            for name in names
+        },
+    }
@@ -0,0 +1,203 @@
+"""Statistiques et fichiers de résultats de la suite.
+
+Le JSON reprend la structure de pytest-benchmark (`machine_info`,
+`commit_info`, `benchmarks[].stats` en secondes) avec les percentiles en
+plus ; `compare` confronte deux fichiers, typiquement deux commits.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+RESULTS_DIR = Path(".benchmarks")
+# Écart relatif de la médiane au-delà duquel `compare` signale une régression
+DEFAULT_THRESHOLD = 0.10
+# Rapport des médianes entre la plus grande et la plus petite taille au-delà
+# duquel `run` signale un scénario qui ne tient pas la volumétrie
+DEFAULT_SCALING_LIMIT = 3.0
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Percentile par interpolation linéaire d'une liste déjà triée."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(durations: Iterable[float]) -> Dict[str, Any]:
+    """Statistiques d'une série de durées (secondes), noms de pytest-benchmark."""
+    values = sorted(durations)
+    if not values:
+        return {"rounds": 0}
+    mean = statistics.fmean(values)
+    q1, q3 = percentile(values, 0.25), percentile(values, 0.75)
+    return {
+        "min": values[0],
+        "max": values[-1],
+        "mean": mean,
+        "stddev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "median": percentile(values, 0.5),
+        "iqr": q3 - q1,
+        "q1": q1,
+        "q3": q3,
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "rounds": len(values),
+        "total": sum(values),
+        "ops": 1 / mean if mean else 0.0,
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def commit_info() -> Dict[str, Any]:
+    return {
+        "id": _git("rev-parse", "HEAD"),
+        "branch": _git("rev-parse", "--abbrev-ref", "HEAD"),
+        "time": _git("show", "-s", "--format=%cI", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def benchmark_entry(
+    scenario: str, size: int, durations: List[float], errors: int = 0
+) -> Dict[str, Any]:
+    return {
+        "group": scenario,
+        "name": f"{scenario}[{size}]",
+        "fullname": f"benchmarks.suite::{scenario}[{size}]",
+        "params": {"size": size},
+        "errors": errors,
+        "stats": summarize(durations),
+    }
+
+
+def default_output(commit: Dict[str, Any]) -> Path:
+    """.benchmarks/<date>_<commit court>[_dirty].json"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    name = f"{stamp}_{commit['id'][:10] or 'nogit'}"
+    if commit["dirty"]:
+        name += "_dirty"
+    return RESULTS_DIR / f"{name}.json"
+
+
+def write_results(report: Dict[str, Any], output: Optional[Path] = None) -> Path:
+    path = output or default_output(report["commit_info"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    report: Dict[str, Any] = json.loads(Path(path).read_text())
+    return report
+
+
+def compare(
+    old: Dict[str, Any], new: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> List[Tuple[str, float, float, float, bool]]:
+    """(nom, médiane avant, médiane après, écart relatif, régression ?) par
+    benchmark présent dans les deux fichiers, dans l'ordre du nouveau.
+
+    Un benchmark dont les requêtes ont échoué dans le nouveau fichier (et
+    pas dans l'ancien) est une régression quelle que soit sa durée.
+    """
+    before = {bench["fullname"]: bench for bench in old["benchmarks"]}
+    rows = []
+    for bench in new["benchmarks"]:
+        previous = before.get(bench["fullname"])
+        if previous is None or not bench["stats"]["rounds"]:
+            continue
+        old_median = previous["stats"].get("median", 0.0)
+        new_median = bench["stats"]["median"]
+        change = (new_median - old_median) / old_median if old_median else 0.0
+        new_errors = bench.get("errors", 0) > previous.get("errors", 0)
+        rows.append(
+            (
+                bench["name"],
+                old_median,
+                new_median,
+                change,
+                change > threshold or new_errors,
+            )
+        )
+    return rows
+
+
+def scaling(
+    report: Dict[str, Any], limit: float = DEFAULT_SCALING_LIMIT
+) -> List[Tuple[str, int, float, int, float, bool]]:
+    """(scénario, plus petite taille, médiane, plus grande taille, médiane,
+    dégradation ?) pour chaque scénario mesuré à au moins deux tailles.
+
+    Un scénario par id (lecture, mise à jour, suppression) doit coûter à peu
+    près autant sur 100 000 fiches que sur 1 000 : une médiane multipliée
+    par plus de `limit` trahit un parcours de table.
+    """
+    medians: Dict[str, Dict[int, float]] = {}
+    for bench in report["benchmarks"]:
+        stats = bench["stats"]
+        if stats["rounds"]:
+            by_size = medians.setdefault(bench["group"], {})
+            by_size[bench["params"]["size"]] = stats["median"]
+    rows = []
+    for scenario, by_size in medians.items():
+        if len(by_size) < 2:
+            continue
+        small, large = min(by_size), max(by_size)
+        before, after = by_size[small], by_size[large]
+        degraded = before > 0 and after / before > limit
+        rows.append((scenario, small, before, large, after, degraded))
+    return rows
+
+
+def compare_load(
+    old: Dict[str, Any], new: Dict[str, Any], threshold: float
+) -> List[Tuple[int, float, float, float, bool]]:
+    """(taille, débit avant, débit après, écart relatif, régression ?)"""
+    before = {(item["size"], item["concurrency"]): item for item in old["load"]}
+    rows = []
+    for item in new["load"]:
+        previous = before.get((item["size"], item["concurrency"]))
+        if previous is None or not previous["throughput"]:
+            continue
+        change = item["throughput"] / previous["throughput"] - 1
+        rows.append(
+            (
+                item["size"],
+                previous["throughput"],
+                item["throughput"],
+                change,
+                change < -threshold or item["errors"] > previous["errors"],
+            )
+        )
+    return rows
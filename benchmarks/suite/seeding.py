@@ -0,0 +1,40 @@
+"""Remplissage de la base de la suite (DATABASE_URL).
+
+Comme pour l'API, DATABASE_URL doit être défini avant l'import du module.
+"""
+
+import time
+from typing import List
+
+from benchmarks.suite.data import fiche_fields
+from contact_fiche.entities.fiche_entity import Fiche
+from infrastructure.database.connexion import get_engine, session_scope
+from infrastructure.database.fiche_model import Base
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+
+SEED_CHUNK_SIZE = 2000
+
+
+def reset_schema() -> None:
+    """Repart d'un schéma vide (tables, index, triggers des compteurs)."""
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def seed(size: int, chunk_size: int = SEED_CHUNK_SIZE) -> float:
+    """Recrée le schéma et insère les fiches 0 à size - 1 ; retourne la durée."""
+    start = time.perf_counter()
+    reset_schema()
+    with session_scope() as session:
+        repository = SQLiteFicheRepository(session=session)
+        for first in range(0, size, chunk_size):
+            fiches: List[Fiche] = [
+                Fiche(**fiche_fields(n))
+                for n in range(first, min(first + chunk_size, size))
+            ]
+            results = repository.save_many(fiches, chunk_size=chunk_size)
+            errors = [result.error for result in results if result.status == "error"]
+            if errors:
+                raise RuntimeError(f"Échec du remplissage : {errors[0]}")
+    return time.perf_counter() - start
@@ -1,19 +1,143 @@
+import hashlib
 import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, NamedTuple, Optional
+
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import SchemaError
+
+logger = logging.getLogger(__name__)
+
+# Clés de premier niveau du fichier qui ne décrivent pas un type de travaux
+RESERVED_KEYS = ("$schema", "definitions")
+
+DEFAULT_CONFIG_PATH = os.getenv("WORK_SCHEMAS_CONFIG_PATH", "config/config_works.json")
+DEFAULT_RELOAD_INTERVAL = float(os.getenv("WORK_SCHEMAS_RELOAD_INTERVAL", "5"))
+
+
+class _ConfigSnapshot(NamedTuple):
+    """État immuable d'une version chargée du fichier de configuration."""
+
+    config: Dict[str, Any]
+    validators: Dict[str, Draft7Validator]
+    content_hash: str
+    mtime_ns: int
+    size: int
+
 
 class WorkSchemaConfigService:
-    def __init__(self, config_path: str):
+    """Charge les schémas de travaux et leurs validateurs compilés.
+
+    Avec `reload_interval`, le fichier est surveillé par un simple `stat`
+    au plus toutes les `reload_interval` secondes ; il n'est relu et
+    recompilé que si son mtime/taille puis son empreinte SHA-256 changent.
+    """
+
+    def __init__(self, config_path: str, reload_interval: Optional[float] = None):
         self.config_path = config_path
-        self._config: Dict[str, Any] = {}
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._snapshot: _ConfigSnapshot
         self.load_config()
 
     def load_config(self):
-        with open(Path(self.config_path), "r", encoding="utf-8") as file:
-            self._config = json.load(file)
+        path = Path(self.config_path)
+        stat = path.stat()
+        raw = path.read_bytes()
+        # Le registre n'est reconstruit que lorsque le fichier est relu ;
+        # la bascule se fait par une seule affectation (atomique).
+        self._snapshot = self._build_snapshot(raw, stat)
+
+    @classmethod
+    def _build_snapshot(cls, raw: bytes, stat: os.stat_result) -> _ConfigSnapshot:
+        config = json.loads(raw.decode("utf-8"))
+        return _ConfigSnapshot(
+            config=config,
+            validators=cls._compile_validators(config),
+            content_hash=hashlib.sha256(raw).hexdigest(),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+        )
+
+    @staticmethod
+    def _compile_validators(config: Dict[str, Any]) -> Dict[str, Draft7Validator]:
+        """Compile un Draft7Validator par type de travaux.
+
+        Le bloc `definitions` partagé est rattaché à chaque schéma pour que
+        les `$ref` du type `#/definitions/...` se résolvent localement.
+        """
+        definitions = config.get("definitions", {})
+        validators: Dict[str, Draft7Validator] = {}
+        for work, schema in config.items():
+            if work in RESERVED_KEYS or not isinstance(schema, dict) or not schema:
+                continue
+            full_schema = {**schema, "definitions": definitions}
+            Draft7Validator.check_schema(full_schema)
+            validators[work] = Draft7Validator(full_schema)
+        return validators
+
+    def _current(self) -> _ConfigSnapshot:
+        if self.reload_interval is not None:
+            self._reload_if_changed()
+        return self._snapshot
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        # Une seule requête vérifie le fichier, les autres lisent l'ancien état
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._last_check = now
+            snapshot = self._snapshot
+            path = Path(self.config_path)
+            stat = path.stat()
+            if (stat.st_mtime_ns, stat.st_size) == (snapshot.mtime_ns, snapshot.size):
+                return
+            raw = path.read_bytes()
+            if hashlib.sha256(raw).hexdigest() == snapshot.content_hash:
+                self._snapshot = snapshot._replace(
+                    mtime_ns=stat.st_mtime_ns, size=stat.st_size
+                )
+                return
+            self._snapshot = self._build_snapshot(raw, stat)
+            logger.info(
+                "Work schemas reloaded",
+                extra={"config_path": self.config_path},
+            )
+        except (OSError, ValueError, SchemaError) as e:
+            # Fichier absent ou invalide : on garde la dernière version valide
+            logger.warning(
+                "Work schemas reload failed",
+                extra={"config_path": self.config_path, "error": str(e)},
+            )
+        finally:
+            self._lock.release()
+
+    @property
+    def content_hash(self) -> str:
+        return self._current().content_hash
 
     def get_schema(self, work: str) -> Dict[str, Any]:
-        return self._config.get(work, {})
+        return self._current().config.get(work, {})
+
+    def get_validator(self, work: str) -> Optional[Draft7Validator]:
+        return self._current().validators.get(work)
 
     def get_all_schemas(self) -> Dict[str, Any]:
-        return self._config
+        return self._current().config
+
+
+@lru_cache(maxsize=None)
+def get_work_schema_config_service() -> WorkSchemaConfigService:
+    """Service partagé par tout le processus, rechargé à chaud."""
+    return WorkSchemaConfigService(
+        config_path=DEFAULT_CONFIG_PATH, reload_interval=DEFAULT_RELOAD_INTERVAL
+    )
@@ -1,14 +1,32 @@
 from abc import ABC
-from typing import Any, Dict, List, Optional
+from datetime import date, time
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
-from jsonschema import ValidationError, validate
+from jsonschema import ValidationError
+from pydantic import ValidationError as PydanticValidationError
 
 from config.works_schemas_config import WorkSchemaConfigService
-from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.fiche_entity import (
+    BulkItemResult,
+    Fiche,
+    FichePage,
+    parse_date_rdv,
+    parse_heure_rdv,
+)
 from contact_fiche.entities.works_planned_entity import WorksPlanned
 from contact_fiche.enums import OriginContact, Status
-from contact_fiche.fiche_repository_protocol import FicheRepository
+from contact_fiche.exceptions import FicheConflictError
+from contact_fiche.fiche_filter import FicheFilter
+from contact_fiche.fiche_repository_protocol import (
+    AsyncFicheRepository,
+    FicheRepository,
+)
+from contact_fiche.pagination import DEFAULT_PAGE_SIZE
+
+# Reçoit le type de travaux et la durée de sa validation, en secondes
+ValidationObserver = Callable[[str, float], None]
 
 
 class Usecase(ABC):
@@ -18,13 +36,60 @@ class Usecase(ABC):
     def __call__(self, *args, **kwargs): ...
 
 
+class AsyncUsecase(ABC):
+    """Variante asynchrone : le repository expose des méthodes `async`."""
+
+    def __init__(self, repository: AsyncFicheRepository):
+        self.repository = repository
+
+    async def __call__(self, *args, **kwargs): ...
+
+
 class CreateFicheUsecase(Usecase):
     def __call__(
         self,
         lastname: str,
         firstname: str,
-        date_rdv: str,
-        heure_rdv: str,
+        date_rdv: Union[date, str],
+        heure_rdv: Union[time, str],
+        telephone: str,
+        email: str,
+        address: str,
+        city: str,
+        code_postal: str,
+        type_logement: str,
+        statut_habitation: str,
+        commentary: str,
+        origin_contact: OriginContact,
+        planned_works: Optional[List[str]] = None,
+        works_planned: Optional[List[WorksPlanned]] = None,
+    ) -> Fiche:
+        fiche = self.build_fiche(
+            lastname=lastname,
+            firstname=firstname,
+            date_rdv=date_rdv,
+            heure_rdv=heure_rdv,
+            telephone=telephone,
+            email=email,
+            address=address,
+            city=city,
+            code_postal=code_postal,
+            type_logement=type_logement,
+            statut_habitation=statut_habitation,
+            commentary=commentary,
+            origin_contact=origin_contact,
+            planned_works=planned_works,
+            works_planned=works_planned,
+        )
+        self.repository.save(fiche)
+        return fiche
+
+    @staticmethod
+    def build_fiche(
+        lastname: str,
+        firstname: str,
+        date_rdv: Union[date, str],
+        heure_rdv: Union[time, str],
         telephone: str,
         email: str,
         address: str,
@@ -40,12 +105,12 @@ class CreateFicheUsecase(Usecase):
         planned_works_list = planned_works or []
         works_planned_list = works_planned or []
 
-        fiche = Fiche(
+        return Fiche(
             id=uuid4().hex,
             lastname=lastname,
             firstname=firstname,
-            date_rdv=date_rdv,
-            heure_rdv=heure_rdv,
+            date_rdv=parse_date_rdv(date_rdv),
+            heure_rdv=parse_heure_rdv(heure_rdv),
             telephone=telephone,
             email=email,
             address=address,
@@ -60,18 +125,74 @@ class CreateFicheUsecase(Usecase):
             status=Status.IN_PROGRESS,
         )
 
-        self.repository.save(fiche)
-        return fiche
+
+class BulkCreateFicheUsecase(Usecase):
+    """Crée (ou met à jour si `upsert`) un lot de fiches en une passe.
+
+    Chaque élément est validé individuellement : un élément invalide est
+    reporté en erreur sans bloquer l'import des autres.
+    """
+
+    def __call__(
+        self,
+        items: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        upsert: bool = False,
+    ) -> List[BulkItemResult]:
+        results, fiches, positions = self.parse_items(items)
+        saved = self.repository.save_many(fiches, chunk_size=chunk_size, upsert=upsert)
+        return self.merge_results(results, positions, saved)
+
+    @staticmethod
+    def parse_items(
+        items: List[Dict[str, Any]],
+    ) -> Tuple[Dict[int, BulkItemResult], List[Fiche], List[int]]:
+        """Valide les éléments : erreurs par index, fiches valides, positions."""
+        results: Dict[int, BulkItemResult] = {}
+        fiches: List[Fiche] = []
+        positions: List[int] = []
+
+        for index, item in enumerate(items):
+            try:
+                fiche = Fiche.model_validate(
+                    {**item, "id": uuid4().hex, "status": Status.IN_PROGRESS}
+                )
+            except (PydanticValidationError, TypeError) as e:
+                results[index] = BulkItemResult(
+                    index=index, status="error", error=str(e)
+                )
+                continue
+            fiches.append(fiche)
+            positions.append(index)
+        return results, fiches, positions
+
+    @staticmethod
+    def merge_results(
+        results: Dict[int, BulkItemResult],
+        positions: List[int],
+        saved: List[BulkItemResult],
+    ) -> List[BulkItemResult]:
+        for result in saved:
+            # Repositionner le résultat sur l'index de l'élément d'origine
+            index = positions[result.index]
+            results[index] = result.model_copy(update={"index": index})
+        return [results[index] for index in sorted(results)]
 
 
 class UpdateFicheUsecase(Usecase):
+    """Use case pour modifier les champs fournis d'une fiche.
+
+    Si `expected_version` est fourni et ne correspond plus à la version en
+    base, lève FicheConflictError sans rien écrire.
+    """
+
     def __call__(
         self,
         id: str,
         new_lastname: Optional[str] = None,
         new_firstname: Optional[str] = None,
-        new_date_rdv: Optional[str] = None,
-        new_heure_rdv: Optional[str] = None,
+        new_date_rdv: Union[date, str, None] = None,
+        new_heure_rdv: Union[time, str, None] = None,
         new_tel: Optional[str] = None,
         new_email: Optional[str] = None,
         new_address: Optional[str] = None,
@@ -82,20 +203,70 @@ class UpdateFicheUsecase(Usecase):
         new_origin: Optional[OriginContact] = None,
         new_works_planned: Optional[List[WorksPlanned]] = None,
         new_commentary: Optional[str] = None,
+        expected_version: Optional[int] = None,
     ) -> Fiche:
-        fiche = self.repository.get_by_id(id)
+        fiche = self.repository.get_for_update(id)
 
         if fiche is None:
             raise ValueError(f"Fiche with id {id} not found")
+        self.check_version(fiche, expected_version)
+
+        self.apply_changes(
+            fiche,
+            new_lastname=new_lastname,
+            new_firstname=new_firstname,
+            new_date_rdv=new_date_rdv,
+            new_heure_rdv=new_heure_rdv,
+            new_tel=new_tel,
+            new_email=new_email,
+            new_address=new_address,
+            new_code_postal=new_code_postal,
+            new_city=new_city,
+            new_type_logement=new_type_logement,
+            new_statut_habitation=new_statut_habitation,
+            new_origin=new_origin,
+            new_works_planned=new_works_planned,
+            new_commentary=new_commentary,
+        )
+
+        self.repository.update(id, fiche)
+        return fiche
+
+    @staticmethod
+    def check_version(fiche: Fiche, expected_version: Optional[int]) -> None:
+        # Le repository vérifie ensuite que la version lue n'a pas changé
+        # avant l'écriture : la comparaison vaut jusqu'au COMMIT
+        if expected_version is not None and fiche.version != expected_version:
+            raise FicheConflictError(
+                f"Fiche {fiche.id} modifiée entre-temps (version {fiche.version})"
+            )
 
+    @staticmethod
+    def apply_changes(
+        fiche: Fiche,
+        new_lastname: Optional[str] = None,
+        new_firstname: Optional[str] = None,
+        new_date_rdv: Union[date, str, None] = None,
+        new_heure_rdv: Union[time, str, None] = None,
+        new_tel: Optional[str] = None,
+        new_email: Optional[str] = None,
+        new_address: Optional[str] = None,
+        new_code_postal: Optional[str] = None,
+        new_city: Optional[str] = None,
+        new_type_logement: Optional[str] = None,
+        new_statut_habitation: Optional[str] = None,
+        new_origin: Optional[OriginContact] = None,
+        new_works_planned: Optional[List[WorksPlanned]] = None,
+        new_commentary: Optional[str] = None,
+    ) -> None:
         if new_lastname is not None:
             fiche.lastname = new_lastname
         if new_firstname is not None:
             fiche.firstname = new_firstname
         if new_date_rdv is not None:
-            fiche.date_rdv = new_date_rdv
+            fiche.date_rdv = parse_date_rdv(new_date_rdv)
         if new_heure_rdv is not None:
-            fiche.heure_rdv = new_heure_rdv
+            fiche.heure_rdv = parse_heure_rdv(new_heure_rdv)
         if new_tel is not None:
             fiche.telephone = new_tel
         if new_email is not None:
@@ -117,67 +288,249 @@ class UpdateFicheUsecase(Usecase):
         if new_commentary is not None:
             fiche.commentary = new_commentary
 
-        self.repository.update(id, fiche)
-        return fiche
-
 
 class DeleteFicheUsecase(Usecase):
     def __call__(self, id: str) -> None:
-        fiche = self.repository.get_by_id(id)
+        fiche = self.repository.get_for_update(id)
         if fiche is None:
             raise ValueError(f"Fiche with id {id} not found")
         self.repository.delete(fiche.id)
 
 
+class SearchFichesUsecase(Usecase):
+    """Use case pour rechercher une page de fiches selon des critères."""
+
+    def __call__(
+        self,
+        filters: FicheFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> FichePage:
+        return self.repository.find(filters, limit=limit, cursor=cursor)
+
+
+class AgendaUsecase(Usecase):
+    """Use case pour lister les rendez-vous d'un intervalle de dates inclusif."""
+
+    def __call__(
+        self,
+        date_from: date,
+        date_to: date,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> FichePage:
+        check_agenda_range(date_from, date_to)
+        return self.repository.agenda(date_from, date_to, limit=limit, cursor=cursor)
+
+
+def check_agenda_range(date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        raise ValueError("from doit précéder to")
+
+
+# Statuts depuis lesquels une fiche peut être validée
+VALIDATABLE_STATUSES = (Status.DEFAULT, Status.IN_PROGRESS)
+
+
 class ValidateFicheUsecase(Usecase):
-    """Use case pour valider une fiche et passer son statut à COMPLETED."""
+    """Use case pour valider une fiche et passer son statut à COMPLETED.
 
-    def __call__(self, fiche_id: str) -> Fiche:
-        fiche = self.repository.get_by_id(fiche_id)
-        if fiche is None:
-            raise ValueError(f"Fiche with id {fiche_id} not found")
+    La transition est un UPDATE conditionnel : une fiche déjà validée (ou
+    dont la version ne vaut plus `expected_version`) lève FicheConflictError.
+    """
 
-        fiche.status = Status.COMPLETED
-        self.repository.update(fiche_id, fiche)
-        return fiche
+    def __call__(self, fiche_id: str, expected_version: Optional[int] = None) -> Fiche:
+        return self.repository.transition_status(
+            fiche_id,
+            Status.COMPLETED,
+            from_statuses=VALIDATABLE_STATUSES,
+            expected_version=expected_version,
+        )
+
+
+def validate_works(
+    config_service: WorkSchemaConfigService,
+    works_data: List[Dict[str, Any]],
+    observe: Optional[ValidationObserver] = None,
+) -> List[WorksPlanned]:
+    """Valide chaque travail contre le schéma de son type et le convertit.
+
+    `observe`, s'il est fourni, reçoit la durée de chaque validation.
+    """
+    if not works_data:
+        raise ValueError("works_data cannot be empty")
+
+    for item in works_data:
+        if "work" not in item or "details" not in item:
+            raise ValueError("Chaque item doit contenir 'work' et 'details'")
+        work_type = item["work"]
+        details = item["details"]
+        validator = config_service.get_validator(work_type)
+        if validator is None:
+            raise ValueError(f"Aucun schéma défini pour le work '{work_type}'")
+        start = perf_counter()
+        try:
+            validator.validate(details)
+        except ValidationError as e:
+            raise ValueError(
+                f"Erreur de validation pour le work '{work_type}': {e.message}"
+            )
+        finally:
+            if observe is not None:
+                observe(work_type, perf_counter() - start)
+
+    # Convertir la liste de dictionnaires en liste d'instances de WorksPlanned
+    return [WorksPlanned(**item) for item in works_data]
 
 
 class CompletionFicheUsecase(Usecase):
     def __init__(
-        self, repository: FicheRepository, config_service: WorkSchemaConfigService
+        self,
+        repository: FicheRepository,
+        config_service: WorkSchemaConfigService,
+        observe_validation: Optional[ValidationObserver] = None,
     ):
         super().__init__(repository)
         self.config_service = config_service
+        self.observe_validation = observe_validation
 
-    def __call__(self, fiche_id: str, works_data: List[Dict[str, Any]]) -> Fiche:
-        fiche = self.repository.get_by_id(fiche_id)
-        if fiche is None:
-            raise ValueError("Fiche not found")
-
-        if not works_data:
-            raise ValueError("works_data cannot be empty")
-
-        for item in works_data:
-            if "work" not in item or "details" not in item:
-                raise ValueError("Chaque item doit contenir 'work' et 'details'")
-            work_type = item["work"]
-            details = item["details"]
-            schema = self.config_service.get_schema(work_type)
-            if not schema:
-                raise ValueError(f"Aucun schéma défini pour le work '{work_type}'")
-            try:
-                validate(instance=details, schema=schema)
-            except ValidationError as e:
-                raise ValueError(
-                    f"Erreur de validation pour le work '{work_type}': {e.message}"
-                )
+    def __call__(
+        self,
+        fiche_id: str,
+        works_data: List[Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ) -> Fiche:
+        # Les travaux sont validés avant tout accès à la base
+        works_planned = validate_works(
+            self.config_service, works_data, self.observe_validation
+        )
 
-        # Convertir la liste de dictionnaires en liste d'instances de WorksPlanned
-        works_planned_list = [WorksPlanned(**item) for item in works_data]
-        fiche.works_planned = (
-            works_planned_list  # On assigne la liste d'instances, pas les dictionnaires
+        return self.repository.transition_status(
+            fiche_id,
+            Status.COMPLETED,
+            expected_version=expected_version,
+            works_planned=works_planned,
         )
 
-        fiche.status = Status.COMPLETED
-        self.repository.update(fiche_id, fiche)
+
+class AsyncCreateFicheUsecase(AsyncUsecase):
+    """Voir CreateFicheUsecase ; mêmes paramètres nommés."""
+
+    async def __call__(self, **fields: Any) -> Fiche:
+        fiche = CreateFicheUsecase.build_fiche(**fields)
+        await self.repository.save(fiche)
+        return fiche
+
+
+class AsyncBulkCreateFicheUsecase(AsyncUsecase):
+    """Voir BulkCreateFicheUsecase."""
+
+    async def __call__(
+        self,
+        items: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        upsert: bool = False,
+    ) -> List[BulkItemResult]:
+        results, fiches, positions = BulkCreateFicheUsecase.parse_items(items)
+        saved = await self.repository.save_many(
+            fiches, chunk_size=chunk_size, upsert=upsert
+        )
+        return BulkCreateFicheUsecase.merge_results(results, positions, saved)
+
+
+class AsyncUpdateFicheUsecase(AsyncUsecase):
+    """Voir UpdateFicheUsecase ; mêmes paramètres nommés `new_*` et
+    `expected_version`."""
+
+    async def __call__(
+        self, id: str, expected_version: Optional[int] = None, **changes: Any
+    ) -> Fiche:
+        fiche = await self.repository.get_for_update(id)
+
+        if fiche is None:
+            raise ValueError(f"Fiche with id {id} not found")
+        UpdateFicheUsecase.check_version(fiche, expected_version)
+
+        UpdateFicheUsecase.apply_changes(fiche, **changes)
+
+        await self.repository.update(id, fiche)
         return fiche
+
+
+class AsyncDeleteFicheUsecase(AsyncUsecase):
+    async def __call__(self, id: str) -> None:
+        fiche = await self.repository.get_for_update(id)
+        if fiche is None:
+            raise ValueError(f"Fiche with id {id} not found")
+        await self.repository.delete(fiche.id)
+
+
+class AsyncSearchFichesUsecase(AsyncUsecase):
+    """Voir SearchFichesUsecase."""
+
+    async def __call__(
+        self,
+        filters: FicheFilter,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> FichePage:
+        return await self.repository.find(filters, limit=limit, cursor=cursor)
+
+
+class AsyncAgendaUsecase(AsyncUsecase):
+    """Voir AgendaUsecase."""
+
+    async def __call__(
+        self,
+        date_from: date,
+        date_to: date,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> FichePage:
+        check_agenda_range(date_from, date_to)
+        return await self.repository.agenda(
+            date_from, date_to, limit=limit, cursor=cursor
+        )
+
+
+class AsyncValidateFicheUsecase(AsyncUsecase):
+    """Voir ValidateFicheUsecase."""
+
+    async def __call__(
+        self, fiche_id: str, expected_version: Optional[int] = None
+    ) -> Fiche:
+        return await self.repository.transition_status(
+            fiche_id,
+            Status.COMPLETED,
+            from_statuses=VALIDATABLE_STATUSES,
+            expected_version=expected_version,
+        )
+
+
+class AsyncCompletionFicheUsecase(AsyncUsecase):
+    def __init__(
+        self,
+        repository: AsyncFicheRepository,
+        config_service: WorkSchemaConfigService,
+        observe_validation: Optional[ValidationObserver] = None,
+    ):
+        super().__init__(repository)
+        self.config_service = config_service
+        self.observe_validation = observe_validation
+
+    async def __call__(
+        self,
+        fiche_id: str,
+        works_data: List[Dict[str, Any]],
+        expected_version: Optional[int] = None,
+    ) -> Fiche:
+        works_planned = validate_works(
+            self.config_service, works_data, self.observe_validation
+        )
+
+        return await self.repository.transition_status(
+            fiche_id,
+            Status.COMPLETED,
+            expected_version=expected_version,
+            works_planned=works_planned,
+        )
@@ -1,17 +1,30 @@
-from typing import List, Optional
+from datetime import date, datetime, time
+from typing import List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    field_serializer,
+    field_validator,
+)
 
 from contact_fiche.entities.works_planned_entity import WorksPlanned
 from contact_fiche.enums import OriginContact, Status
 
 
 class Fiche(BaseModel):
+    # Une affectation (`fiche.date_rdv = "2025-02-01"`) est convertie comme
+    # à la construction
+    model_config = ConfigDict(validate_assignment=True)
+
     id: str
     lastname: str
     firstname: str
-    date_rdv: str
-    heure_rdv: str
+    # Rendez-vous : AAAA-MM-JJ et HH:MM (à la minute) en entrée comme en sortie
+    date_rdv: date
+    heure_rdv: time
     telephone: str
     email: str
     address: str
@@ -26,3 +39,77 @@ class Fiche(BaseModel):
     works_planned: Optional[List[WorksPlanned]] = Field(default_factory=list)
     commentary: str
     status: Status = Status.DEFAULT
+    # Version de la ligne en base, à renvoyer pour une écriture conditionnelle
+    version: int = 1
+    # Date (UTC) de la dernière écriture en base, renseignée par le repository
+    updated_at: Optional[datetime] = None
+
+    @field_validator("heure_rdv")
+    @classmethod
+    def truncate_to_minute(cls, value: time) -> time:
+        return value.replace(second=0, microsecond=0)
+
+    @field_serializer("heure_rdv")
+    def serialize_heure_rdv(self, value: time) -> str:
+        return value.strftime("%H:%M")
+
+    def natural_key(self) -> Tuple[str, str, str]:
+        """Clé métier d'un contact, utilisée pour dédoublonner les imports."""
+        return (self.lastname, self.firstname, self.telephone)
+
+
+_DATE = TypeAdapter(date)
+_TIME = TypeAdapter(time)
+
+
+def parse_date_rdv(value: Union[date, str]) -> date:
+    """Date de rendez-vous saisie (AAAA-MM-JJ), convertie comme par Fiche.
+
+    Lève pydantic.ValidationError (un ValueError) si elle est illisible.
+    """
+    return _DATE.validate_python(value)
+
+
+def parse_heure_rdv(value: Union[time, str]) -> time:
+    """Heure de rendez-vous saisie (HH:MM), à la minute comme dans Fiche."""
+    return Fiche.truncate_to_minute(_TIME.validate_python(value))
+
+
+class FichePage(BaseModel):
+    """Page de fiches triées par (date_rdv, id) avec le curseur suivant.
+
+    Les pages de l'agenda sont triées par (date_rdv, heure_rdv, id).
+    """
+
+    items: List[Fiche]
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    """Résultat de l'import d'un élément d'un lot, repéré par sa position."""
+
+    index: int
+    status: Literal["created", "updated", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkCreateReport(BaseModel):
+    """Bilan d'un import groupé : compteurs et résultat de chaque élément."""
+
+    created: int
+    updated: int
+    errors: int
+    results: List[BulkItemResult]
+
+    @classmethod
+    def from_results(cls, results: List[BulkItemResult]) -> "BulkCreateReport":
+        counts = {"created": 0, "updated": 0, "error": 0}
+        for result in results:
+            counts[result.status] += 1
+        return cls(
+            created=counts["created"],
+            updated=counts["updated"],
+            errors=counts["error"],
+            results=results,
+        )
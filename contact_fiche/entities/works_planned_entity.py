@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -10,3 +10,6 @@ class WorksPlanned(BaseModel):
 
 class FicheCompletionData(BaseModel):
     works_planned: List[Dict[str, Any]]
+    # Version lue par le client : si fournie, la complétion échoue (409)
+    # lorsque la fiche a été modifiée entre-temps
+    version: Optional[int] = None
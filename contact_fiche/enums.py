@@ -18,3 +18,12 @@ class Status(Enum):
     DEFAULT = "Default"
     IN_PROGRESS = "In Progress"
     COMPLETED = "Completed"
+
+
+class StatsDimension(Enum):
+    """Axes des compteurs de fiches (GET /stats)."""
+
+    STATUS = "status"
+    ORIGIN_CONTACT = "origin_contact"
+    CITY = "city"
+    WORK = "work"
@@ -0,0 +1,2 @@
+class FicheConflictError(Exception):
+    """La fiche a changé (statut ou version) depuis qu'elle a été lue."""
@@ -0,0 +1,173 @@
+import json
+import unicodedata
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel, field_validator, model_validator
+
+from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import OriginContact, Status
+
+# Chemins de `details` promus en colonnes indexées de work_planned (voir
+# config/config_works.json) : le premier chemin renseigné donne la valeur.
+# Les stores n'ont pas de material_color mais une couleur à la racine.
+PROMOTED_PATHS: Dict[str, Tuple[str, ...]] = {
+    "materiau": ("material_color.materiau",),
+    "color": ("material_color.color", "color"),
+}
+
+_MISSING = object()
+
+
+def name_key(value: str) -> str:
+    """Forme de comparaison d'un nom : casse repliée, composée (NFC).
+
+    "Émile", "ÉMILE" et "e\u0301mile" donnent "émile". Calculée en Python et
+    stockée à côté du nom (lower() de SQLite ne replie que l'ASCII).
+    """
+    return unicodedata.normalize("NFC", value.casefold())
+
+
+def detail_value(details: Dict[str, Any], path: str) -> Any:
+    """Valeur de `details` au chemin pointé `a.b.c` (_MISSING si absente)."""
+    value: Any = details
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def promoted_value(details: Dict[str, Any], name: str) -> Any:
+    for path in PROMOTED_PATHS[name]:
+        value = detail_value(details, path)
+        if value is not _MISSING:
+            return value
+    return None
+
+
+def parse_detail_criteria(criteria: Iterable[str]) -> Dict[str, Any]:
+    """Traduit des critères `chemin:valeur` en {chemin: valeur}.
+
+    La valeur est lue en JSON quand c'est possible (`hauteur:150` compare
+    un nombre, `pose:true` un booléen), sinon gardée telle quelle.
+    """
+    details: Dict[str, Any] = {}
+    for criterion in criteria:
+        path, separator, raw = criterion.partition(":")
+        if not separator:
+            raise ValueError(f"Critère de détail invalide (chemin:valeur): {criterion}")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        if not isinstance(value, (str, int, float)):
+            value = raw
+        details[path.strip()] = value
+    return details
+
+
+class FicheFilter(BaseModel):
+    """Critères de recherche combinables (ET logique) sur les fiches.
+
+    Les critères absents (None ou chaîne vide) sont ignorés. Les préfixes de
+    nom et prénom sont insensibles à la casse ; la ville est une égalité
+    stricte (valeurs issues de /fiches/villes) ; l'intervalle de dates est
+    inclusif aux deux bornes, au format ISO (AAAA-MM-JJ).
+
+    Les critères sur les travaux (`work`, `materiau`, `color`, `details`)
+    portent sur un même travail validé : la fiche est retenue si l'un de
+    ses travaux les vérifie tous. `details` associe un chemin pointé dans
+    les détails (`type_pose`, `material_color.materiau`) à la valeur
+    attendue, comparée avec son type JSON.
+
+    `matches` fait référence : les repositories SQL compilent les mêmes
+    critères en une requête indexée.
+    """
+
+    status: Optional[Status] = None
+    origin_contact: Optional[OriginContact] = None
+    city: Optional[str] = None
+    code_postal_prefix: Optional[str] = None
+    date_rdv_from: Optional[date] = None
+    date_rdv_to: Optional[date] = None
+    lastname_prefix: Optional[str] = None
+    firstname_prefix: Optional[str] = None
+    work: Optional[str] = None
+    materiau: Optional[str] = None
+    color: Optional[str] = None
+    details: Dict[str, Any] = {}
+
+    @field_validator("date_rdv_from", "date_rdv_to", mode="before")
+    @classmethod
+    def empty_date_is_absent(cls, value):
+        return value or None
+
+    @model_validator(mode="after")
+    def check_date_range(self) -> "FicheFilter":
+        if self.date_rdv_from and self.date_rdv_to:
+            if self.date_rdv_from > self.date_rdv_to:
+                raise ValueError("date_rdv_from doit précéder date_rdv_to")
+        return self
+
+    @field_validator("details")
+    @classmethod
+    def check_detail_paths(cls, details: Dict[str, Any]) -> Dict[str, Any]:
+        for path in details:
+            if not all(path.split(".")):
+                raise ValueError(f"Chemin de détail invalide: {path!r}")
+        return details
+
+    @property
+    def filters_works(self) -> bool:
+        return bool(self.work or self.materiau or self.color or self.details)
+
+    def matches_work(self, work: WorksPlanned) -> bool:
+        if self.work and work.work != self.work:
+            return False
+        for name in PROMOTED_PATHS:
+            expected = getattr(self, name)
+            if expected and promoted_value(work.details, name) != expected:
+                return False
+        return all(
+            _same_json_value(detail_value(work.details, path), expected)
+            for path, expected in self.details.items()
+        )
+
+    def matches(self, fiche: Fiche) -> bool:
+        if self.status is not None and fiche.status != self.status:
+            return False
+        if (
+            self.origin_contact is not None
+            and fiche.origin_contact != self.origin_contact
+        ):
+            return False
+        if self.city and fiche.city != self.city:
+            return False
+        if self.code_postal_prefix and not fiche.code_postal.startswith(
+            self.code_postal_prefix
+        ):
+            return False
+        if self.date_rdv_from and fiche.date_rdv < self.date_rdv_from:
+            return False
+        if self.date_rdv_to and fiche.date_rdv > self.date_rdv_to:
+            return False
+        if self.lastname_prefix and not name_key(fiche.lastname).startswith(
+            name_key(self.lastname_prefix)
+        ):
+            return False
+        if self.firstname_prefix and not name_key(fiche.firstname).startswith(
+            name_key(self.firstname_prefix)
+        ):
+            return False
+        if self.filters_works and not any(
+            self.matches_work(work) for work in fiche.works_planned or []
+        ):
+            return False
+        return True
+
+
+def _same_json_value(value: Any, expected: Any) -> bool:
+    # En JSON, 1 et true sont distincts : le booléen est un int pour Python
+    return value == expected and isinstance(value, bool) == isinstance(expected, bool)
@@ -1,10 +1,71 @@
-from typing import Protocol
+from datetime import date
+from typing import Dict, List, Protocol, Sequence
 
-from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.fiche_entity import BulkItemResult, Fiche, FichePage
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import StatsDimension, Status
+from contact_fiche.fiche_filter import FicheFilter
 
 
 class FicheRepository(Protocol):
     def get_by_id(self, id: str) -> Fiche | None: ...
+    def get_for_update(self, id: str) -> Fiche | None: ...
     def save(self, fiche: Fiche) -> None: ...
     def update(self, id: str, fiche: Fiche) -> None: ...
     def delete(self, id: str) -> None: ...
+    def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Sequence[Status] | None = None,
+        expected_version: int | None = None,
+        works_planned: List[WorksPlanned] | None = None,
+    ) -> Fiche: ...
+    def list_page(
+        self, limit: int, cursor: str | None = None, status: Status | None = None
+    ) -> FichePage: ...
+    def find(
+        self, filters: FicheFilter, limit: int, cursor: str | None = None
+    ) -> FichePage: ...
+    def agenda(
+        self, date_from: date, date_to: date, limit: int, cursor: str | None = None
+    ) -> FichePage: ...
+    def search(self, query: str, limit: int) -> List[Fiche]: ...
+    def stats(
+        self, dimension: StatsDimension | None = None
+    ) -> Dict[str, Dict[str, int]]: ...
+    def save_many(
+        self, fiches: List[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> List[BulkItemResult]: ...
+
+
+class AsyncFicheRepository(Protocol):
+    async def get_by_id(self, id: str) -> Fiche | None: ...
+    async def get_for_update(self, id: str) -> Fiche | None: ...
+    async def save(self, fiche: Fiche) -> None: ...
+    async def update(self, id: str, fiche: Fiche) -> None: ...
+    async def delete(self, id: str) -> None: ...
+    async def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Sequence[Status] | None = None,
+        expected_version: int | None = None,
+        works_planned: List[WorksPlanned] | None = None,
+    ) -> Fiche: ...
+    async def list_page(
+        self, limit: int, cursor: str | None = None, status: Status | None = None
+    ) -> FichePage: ...
+    async def find(
+        self, filters: FicheFilter, limit: int, cursor: str | None = None
+    ) -> FichePage: ...
+    async def agenda(
+        self, date_from: date, date_to: date, limit: int, cursor: str | None = None
+    ) -> FichePage: ...
+    async def search(self, query: str, limit: int) -> List[Fiche]: ...
+    async def stats(
+        self, dimension: StatsDimension | None = None
+    ) -> Dict[str, Dict[str, int]]: ...
+    async def save_many(
+        self, fiches: List[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> List[BulkItemResult]: ...
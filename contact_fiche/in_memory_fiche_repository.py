@@ -1,4 +1,24 @@
-from contact_fiche.entities.fiche_entity import Fiche
+from collections import Counter
+from datetime import date
+from typing import Sequence
+
+from contact_fiche.entities.fiche_entity import BulkItemResult, Fiche, FichePage
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import StatsDimension, Status
+from contact_fiche.exceptions import FicheConflictError
+from contact_fiche.fiche_filter import FicheFilter
+from contact_fiche.pagination import (
+    decode_agenda_cursor,
+    decode_cursor,
+    encode_agenda_cursor,
+    encode_cursor,
+)
+from contact_fiche.search_text import (
+    matches_terms,
+    relevance,
+    search_document,
+    search_terms,
+)
 
 
 class InMemoryFicheRepository:
@@ -11,8 +31,126 @@ class InMemoryFicheRepository:
     def get_by_id(self, id: str) -> Fiche | None:
         return self.fiches.get(id)
 
+    def get_for_update(self, id: str) -> Fiche | None:
+        return self.get_by_id(id)
+
     def update(self, id: str, fiche: Fiche) -> None:
+        current = self.fiches.get(id)
+        if current is not None and current.version != fiche.version:
+            raise FicheConflictError(f"Fiche {id} modifiée entre-temps")
+        fiche.version += 1
         self.fiches[id] = fiche
 
+    def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Sequence[Status] | None = None,
+        expected_version: int | None = None,
+        works_planned: list[WorksPlanned] | None = None,
+    ) -> Fiche:
+        current = self.fiches.get(id)
+        if current is None:
+            raise ValueError(f"Fiche avec l'id {id} non trouvée")
+        if (from_statuses is not None and current.status not in from_statuses) or (
+            expected_version is not None and current.version != expected_version
+        ):
+            raise FicheConflictError(f"Fiche {id} : passage à {status.value} refusé")
+        changes = {"status": status, "version": current.version + 1}
+        if works_planned:
+            changes["works_planned"] = works_planned
+        self.fiches[id] = current.model_copy(update=changes)
+        return self.fiches[id].model_copy(deep=True)
+
     def delete(self, id: str) -> None:
         del self.fiches[id]
+
+    def save_many(
+        self, fiches: list[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> list[BulkItemResult]:
+        by_key = {f.natural_key(): f for f in self.fiches.values()} if upsert else {}
+        results = []
+        for index, fiche in enumerate(fiches):
+            existing = by_key.get(fiche.natural_key())
+            if existing is not None:
+                updated = fiche.model_copy(
+                    update={"id": existing.id, "status": existing.status}
+                )
+                if not fiche.works_planned:
+                    updated.works_planned = existing.works_planned
+                self.fiches[existing.id] = updated
+                by_key[fiche.natural_key()] = updated
+                results.append(
+                    BulkItemResult(index=index, status="updated", id=existing.id)
+                )
+                continue
+            self.fiches[fiche.id] = fiche
+            if upsert:
+                by_key[fiche.natural_key()] = fiche
+            results.append(BulkItemResult(index=index, status="created", id=fiche.id))
+        return results
+
+    def list_page(
+        self, limit: int, cursor: str | None = None, status: Status | None = None
+    ) -> FichePage:
+        return self.find(FicheFilter(status=status), limit=limit, cursor=cursor)
+
+    def find(
+        self, filters: FicheFilter, limit: int, cursor: str | None = None
+    ) -> FichePage:
+        fiches = sorted(self.fiches.values(), key=lambda f: (f.date_rdv, f.id))
+        fiches = [f for f in fiches if filters.matches(f)]
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            fiches = [f for f in fiches if (f.date_rdv, f.id) > position]
+
+        items = fiches[:limit]
+        next_cursor = None
+        if len(fiches) > limit:
+            next_cursor = encode_cursor(items[-1].date_rdv, items[-1].id)
+        return FichePage(items=items, next_cursor=next_cursor)
+
+    def agenda(
+        self, date_from: date, date_to: date, limit: int, cursor: str | None = None
+    ) -> FichePage:
+        def position(fiche: Fiche):
+            return (fiche.date_rdv, fiche.heure_rdv, fiche.id)
+
+        fiches = sorted(
+            (f for f in self.fiches.values() if date_from <= f.date_rdv <= date_to),
+            key=position,
+        )
+        if cursor is not None:
+            after = decode_agenda_cursor(cursor)
+            fiches = [f for f in fiches if position(f) > after]
+
+        items = fiches[:limit]
+        next_cursor = None
+        if len(fiches) > limit:
+            next_cursor = encode_agenda_cursor(*position(items[-1]))
+        return FichePage(items=items, next_cursor=next_cursor)
+
+    def search(self, query: str, limit: int) -> list[Fiche]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        scored = []
+        for fiche in self.fiches.values():
+            document = search_document(fiche)
+            if matches_terms(document, terms):
+                scored.append((-relevance(document, terms), fiche.id, fiche))
+        return [fiche for *_, fiche in sorted(scored)[:limit]]
+
+    def stats(self, dimension: StatsDimension | None = None) -> dict[str, dict]:
+        dimensions = list(StatsDimension) if dimension is None else [dimension]
+        counters = {d: Counter() for d in dimensions}
+        for fiche in self.fiches.values():
+            keys = {
+                StatsDimension.STATUS: [fiche.status.value],
+                StatsDimension.ORIGIN_CONTACT: [fiche.origin_contact.value],
+                StatsDimension.CITY: [fiche.city],
+                StatsDimension.WORK: [wp.work for wp in fiche.works_planned or []],
+            }
+            for d, counter in counters.items():
+                counter.update(keys[d])
+        return {d.value: dict(sorted(c.items())) for d, c in counters.items()}
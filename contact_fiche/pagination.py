@@ -0,0 +1,60 @@
+import base64
+import binascii
+import json
+from datetime import date, time
+from typing import List, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(date_rdv: date, id: str) -> str:
+    """Encode la position (date_rdv, id) du dernier élément d'une page."""
+    return _encode([date_rdv.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """Décode un curseur opaque ; lève ValueError s'il est invalide."""
+    date_rdv, id = _decode(cursor, 2)
+    return _parse(cursor, date.fromisoformat, date_rdv), id
+
+
+def encode_agenda_cursor(date_rdv: date, heure_rdv: time, id: str) -> str:
+    """Encode la position (date_rdv, heure_rdv, id) d'une page de l'agenda."""
+    return _encode([date_rdv.isoformat(), heure_rdv.strftime("%H:%M"), id])
+
+
+def decode_agenda_cursor(cursor: str) -> Tuple[date, time, str]:
+    date_rdv, heure_rdv, id = _decode(cursor, 3)
+    return (
+        _parse(cursor, date.fromisoformat, date_rdv),
+        _parse(cursor, time.fromisoformat, heure_rdv),
+        id,
+    )
+
+
+def _encode(values: List[str]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode(cursor: str, size: int) -> List[str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError(f"Curseur de pagination invalide: {cursor}")
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise ValueError(f"Curseur de pagination invalide: {cursor}")
+    return values
+
+
+def _parse(cursor: str, parse, value: str):
+    try:
+        return parse(value)
+    except ValueError:
+        raise ValueError(f"Curseur de pagination invalide: {cursor}")
@@ -0,0 +1,79 @@
+"""
+Normalisation du texte pour la recherche de fiches.
+
+Minuscules, accents supprimés, téléphone réduit à ses chiffres : les
+repositories indexent et interrogent ce texte normalisé.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List
+
+from contact_fiche.entities.fiche_entity import Fiche
+
+# Colonnes du document indexé et leur poids dans le classement
+SEARCH_WEIGHTS = {"names": 10.0, "contact": 5.0, "address": 2.0, "commentary": 1.0}
+
+# Champs de Fiche qui alimentent le document indexé
+SEARCHABLE_FIELDS = frozenset(
+    {
+        "lastname",
+        "firstname",
+        "telephone",
+        "email",
+        "address",
+        "code_postal",
+        "city",
+        "commentary",
+    }
+)
+
+_PHONE_QUERY = re.compile(r"^[\d\s.+-]+$")
+
+
+def normalize(value: str) -> str:
+    """Minuscules et suppression des accents ("Hélène" -> "helene")."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def search_terms(query: str) -> List[str]:
+    """Découpe une saisie utilisateur en termes normalisés.
+
+    Un numéro saisi avec séparateurs ("06 12 34") forme un seul terme,
+    comparé au téléphone indexé sans séparateurs.
+    """
+    if _PHONE_QUERY.match(query) and any(c.isdigit() for c in query):
+        return [re.sub(r"\D", "", query)]
+    return re.findall(r"\w+", normalize(query))
+
+
+def search_document(fiche: Fiche) -> Dict[str, str]:
+    """Texte indexé d'une fiche, réparti par colonne de pertinence."""
+    digits = re.sub(r"\D", "", fiche.telephone)
+    return {
+        "names": normalize(f"{fiche.lastname} {fiche.firstname}"),
+        "contact": normalize(f"{digits} {fiche.telephone} {fiche.email}"),
+        "address": normalize(f"{fiche.address} {fiche.code_postal} {fiche.city}"),
+        "commentary": normalize(fiche.commentary or ""),
+    }
+
+
+def _words(value: str) -> List[str]:
+    return re.findall(r"\w+", value)
+
+
+def matches_terms(document: Dict[str, str], terms: List[str]) -> bool:
+    """Chaque terme est le début d'un mot du document (sémantique FTS5)."""
+    words = _words(" ".join(document.values()))
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def relevance(document: Dict[str, str], terms: List[str]) -> float:
+    """Score simple : poids des colonnes où chaque terme apparaît."""
+    return sum(
+        weight
+        for column, weight in SEARCH_WEIGHTS.items()
+        for term in terms
+        if any(word.startswith(term) for word in _words(document[column]))
+    )
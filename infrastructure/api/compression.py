@@ -0,0 +1,245 @@
+"""
+Compression négociée des réponses (brotli ou gzip) au-delà d'un seuil.
+
+Les listes et exports de fiches sont du JSON très répétitif (enums, villes,
+`details`) : gzip ou brotli en divisent la taille par 5 à 10. Le middleware
+suit le fonctionnement de GZipMiddleware de Starlette, sans dépendre de ses
+détails internes :
+- les réponses en streaming sont compressées bloc par bloc, chaque bloc
+  étant décodable sans attendre la suite (export) ;
+- les gros blocs sont compressés dans un thread, hors de la boucle ;
+- brotli, si le paquet optionnel `brotli` est installé et que le client
+  l'accepte (préféré à gzip à qualité égale dans Accept-Encoding) ;
+- un niveau par préfixe de route (`route_levels`), de 1 (rapide) à 9
+  (compact), utilisé comme niveau gzip et comme qualité brotli ; 0 désactive
+  la compression de la route ;
+- un ETag rendu faible sur une réponse compressée : la représentation
+  encodée n'est pas identique octet par octet (les 304 restent possibles,
+  la comparaison de If-None-Match étant faible).
+"""
+
+import os
+import zlib
+from typing import Callable, Dict, Mapping, Optional, Protocol
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    brotli = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Au-delà, un bloc est compressé dans un thread pour ne pas bloquer la boucle
+THREAD_MINIMUM_SIZE = 128 * 1024
+# Contenus déjà compressés ou diffusés en continu (préfixes de type MIME)
+EXCLUDED_CONTENT_TYPES = (
+    "application/grpc",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "audio/",
+    "font/woff",
+    "image/",
+    "text/event-stream",
+    "video/",
+)
+
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: tuple = ("br", "gzip")) -> Optional[str]:
+    """Encodage retenu pour l'en-tête Accept-Encoding, ou None (identité).
+
+    Le meilleur q l'emporte ; à q égal, l'ordre de `available` départage.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, final: bool) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        # wbits 16 + 15 : en-tête et somme de contrôle gzip
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._zlib.compress(data) + self._zlib.flush(flush_mode)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int) -> None:
+        self._brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=level)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        compressed: bytes = self._brotli.process(data)
+        # flush : le bloc doit être décodable sans attendre la suite du flux
+        compressed += self._brotli.finish() if final else self._brotli.flush()
+        return compressed
+
+
+COMPRESSORS: Dict[str, Callable[[int], Compressor]] = {
+    "br": BrotliCompressor,
+    "gzip": GzipCompressor,
+}
+
+
+class CompressionResponder:
+    """Envoie la réponse de `app`, compressée avec `encoding` (None : telle
+    quelle) si son premier bloc atteint `minimum_size` octets ou si elle est
+    diffusée en plusieurs blocs.
+
+    Le message `http.response.start` est retenu jusqu'au premier bloc, le
+    temps de décider des en-têtes (Content-Encoding, Content-Length, Vary).
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int, encoding: Optional[str], level: int
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.level = level
+        self.compressor: Optional[Compressor] = None
+        self.start: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or media_type.strip().startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+        elif self.passthrough:
+            await self.send(message)
+        elif message["type"] != "http.response.body":
+            # pathsend, trailers, ... : envoyés tels quels
+            await self._send_start()
+            await self.send(message)
+        elif self.start is not None:
+            await self._send_first_body(message)
+        elif self.compressor is not None:
+            await self.send(await self._compressed(message))
+        else:
+            await self.send(message)
+
+    async def _send_first_body(self, message: Message) -> None:
+        assert self.start is not None
+        more_body = message.get("more_body", False)
+        if len(message.get("body", b"")) < self.minimum_size and not more_body:
+            await self._send_start()
+            await self.send(message)
+            return
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is not None:
+            self.compressor = COMPRESSORS[self.encoding](self.level)
+            message = await self._compressed(message)
+            headers["Content-Encoding"] = self.encoding
+            if more_body or self.start.get("trailers", False):
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+        await self._send_start()
+        await self.send(message)
+
+    async def _compressed(self, message: Message) -> Message:
+        assert self.compressor is not None
+        body: bytes = message.get("body", b"")
+        final = not message.get("more_body", False)
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            body = await run_in_threadpool(self.compressor.compress, body, final)
+        else:
+            body = self.compressor.compress(body, final)
+        return {**message, "body": body}
+
+    async def _send_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        compresslevel: int = COMPRESSION_LEVEL,
+        route_levels: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        # Préfixe le plus long d'abord
+        self.route_levels = sorted(
+            (route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    def level_for(self, path: str) -> int:
+        for prefix, level in self.route_levels:
+            if path.startswith(prefix):
+                return level
+        return self.compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        level = self.level_for(scope["path"])
+        if level <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding, available_encodings())
+        responder = CompressionResponder(self.app, self.minimum_size, encoding, level)
+        await responder(scope, receive, _weak_etag_when_encoded(send))
+
+
+def _weak_etag_when_encoded(send: Send) -> Send:
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if "content-encoding" in headers and etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+        await send(message)
+
+    return wrapped
@@ -0,0 +1,92 @@
+"""
+Encodage incrémental des fiches pour l'export (NDJSON et CSV).
+Chaque ligne est encodée dès qu'elle est lue, sans construire la réponse complète.
+"""
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator
+
+CSV_COLUMNS = [
+    "id",
+    "lastname",
+    "firstname",
+    "date_rdv",
+    "heure_rdv",
+    "telephone",
+    "email",
+    "address",
+    "code_postal",
+    "city",
+    "type_logement",
+    "statut_habitation",
+    "origin_contact",
+    "status",
+    "commentary",
+    "planned_works",
+    "works_planned",
+]
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield (_dumps(row) + "\n").encode("utf-8")
+
+
+def csv_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+
+    def flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    writer.writeheader()
+    yield flush()
+    for row in rows:
+        # Les colonnes imbriquées sont sérialisées en JSON dans la cellule
+        writer.writerow(
+            {
+                **row,
+                "planned_works": _dumps(row["planned_works"]),
+                "works_planned": _dumps(row["works_planned"]),
+            }
+        )
+        yield flush()
+
+
+def chunked(lines: Iterable[bytes], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Regroupe les lignes en blocs d'environ `chunk_size` octets."""
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+ENCODERS = {
+    ExportFormat.NDJSON: ndjson_lines,
+    ExportFormat.CSV: csv_lines,
+}
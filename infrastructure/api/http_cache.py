@@ -0,0 +1,110 @@
+"""
+Requêtes conditionnelles (ETag / Last-Modified) et politiques Cache-Control.
+
+Chaque route en lecture fournit un validateur :
+- une fiche : sa `version` (ETag faible) et son `updated_at` (Last-Modified) ;
+- un schéma de travaux : l'empreinte SHA-256 du fichier de configuration,
+  qui change à chaque rechargement ;
+- une liste : l'empreinte du corps de la réponse.
+
+Si le client renvoie un validateur encore valable (If-None-Match, ou à
+défaut If-Modified-Since), la réponse est un 304 sans corps.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from fastapi import Request, Response
+
+# Fiches : données client, revalidées à chaque affichage (304 si inchangées)
+CACHE_CONTROL_FICHES = "private, no-cache"
+# Villes : liste qui bouge peu, réutilisée quelques minutes sans requête
+CACHE_CONTROL_CITIES = "private, max-age=300"
+# Schémas : statiques entre deux rechargements de la configuration
+CACHE_CONTROL_SCHEMAS = "public, max-age=3600"
+
+
+def version_etag(version: int) -> str:
+    """ETag faible : la représentation JSON peut varier, pas la ligne."""
+    return f'W/"{version}"'
+
+
+def content_etag(content: Union[bytes, memoryview]) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def cache_headers(
+    etag: str, cache_control: str, last_modified: Optional[datetime] = None
+) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """Le client possède déjà la représentation courante.
+
+    If-None-Match l'emporte sur If-Modified-Since (RFC 9110, 13.2.2) ; la
+    comparaison des ETags est faible.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {_opaque(tag) for tag in if_none_match.split(",")}
+        return _opaque(etag) in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # Les dates HTTP sont à la seconde près
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    """Réponse 304 si les validateurs de `headers` sont encore valables."""
+    last_modified = headers.get("Last-Modified")
+    if is_not_modified(
+        request,
+        headers["ETag"],
+        parsedate_to_datetime(last_modified) if last_modified else None,
+    ):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def conditional(request: Request, response: Response, cache_control: str) -> Response:
+    """Ajoute un ETag calculé sur le corps déjà rendu, ou répond 304."""
+    headers = cache_headers(content_etag(response.body), cache_control)
+    cached = not_modified(request, headers)
+    if cached is not None:
+        # Les en-têtes propres à la réponse (X-Next-Cursor) restent utiles
+        for name, value in response.headers.items():
+            if name not in ("content-length", "content-type"):
+                cached.headers.setdefault(name, value)
+        return cached
+    response.headers.update(headers)
+    return response
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Les colonnes DateTime stockent l'heure UTC sans fuseau
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
@@ -1,36 +1,114 @@
+import json
 import logging
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from datetime import date
+from functools import lru_cache
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BeforeValidator, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from config.works_schemas_config import WorkSchemaConfigService
+from config.works_schemas_config import (
+    WorkSchemaConfigService,
+    get_work_schema_config_service,
+)
 from contact_fiche.contact_fiche_usecases import (
-    CompletionFicheUsecase,
-    CreateFicheUsecase,
-    DeleteFicheUsecase,
-    UpdateFicheUsecase,
-    ValidateFicheUsecase,
+    AsyncAgendaUsecase,
+    AsyncBulkCreateFicheUsecase,
+    AsyncCompletionFicheUsecase,
+    AsyncCreateFicheUsecase,
+    AsyncDeleteFicheUsecase,
+    AsyncSearchFichesUsecase,
+    AsyncUpdateFicheUsecase,
+    AsyncValidateFicheUsecase,
 )
-from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.fiche_entity import BulkCreateReport, Fiche, FichePage
 from contact_fiche.entities.works_planned_entity import FicheCompletionData
-from infrastructure.database.connexion import get_session
-from infrastructure.database.fiche_model import FicheModel
+from contact_fiche.enums import OriginContact, StatsDimension, Status
+from contact_fiche.exceptions import FicheConflictError
+from contact_fiche.fiche_filter import FicheFilter, parse_detail_criteria
+from contact_fiche.fiche_repository_protocol import (
+    AsyncFicheRepository,
+    FicheRepository,
+)
+from contact_fiche.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from infrastructure.api.compression import CompressionMiddleware
+from infrastructure.api.export import ENCODERS, MEDIA_TYPES, ExportFormat, chunked
+from infrastructure.api.http_cache import (
+    CACHE_CONTROL_CITIES,
+    CACHE_CONTROL_FICHES,
+    CACHE_CONTROL_SCHEMAS,
+    cache_headers,
+    conditional,
+    not_modified,
+    version_etag,
+)
+from infrastructure.api.metrics_middleware import MetricsMiddleware
+from infrastructure.api.responses import (
+    FicheListResponse,
+    FicheResponse,
+    ModelJSONResponse,
+)
+from infrastructure.cache.read_through_cache import (
+    FICHE_CACHE_ENABLED,
+    get_fiche_cache,
+)
+from infrastructure.database.async_connexion import (
+    AsyncSessionLocal,
+    get_async_session,
+)
+from infrastructure.database.connexion import read_session_scope
 from infrastructure.logging_config import setup_logging
+from infrastructure.metrics import CONTENT_TYPE, REGISTRY, observe_schema_validation
+from infrastructure.repositories.async_sqlite_fiche_repository import (
+    AsyncSQLiteFicheRepository,
+)
+from infrastructure.repositories.batch_writer import (
+    GROUP_COMMIT_ENABLED,
+    AsyncSessionBatchWriter,
+    GroupCommitFicheRepository,
+)
+from infrastructure.repositories.cached_fiche_repository import CachedFicheRepository
 from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
 
 # Configuration du logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
 allowed_origins = ["https://pro-fiche.vercel.app", "http://localhost:5173"]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Les créations en file sont écrites avant l'arrêt du worker
+    if get_batch_writer.cache_info().currsize:
+        await get_batch_writer().close()
+        get_batch_writer.cache_clear()
+
+
 app = FastAPI(
     title="Fiche API - FB Menuiseries",
     description="API de gestion de fiches clients pour le secteur de la menuiserie",
     version="1.0.0",
     contact={"name": "Adrien", "url": "https://github.com/adrien"},
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -39,104 +117,358 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
+# Compression brotli / gzip au-delà de COMPRESSION_MINIMUM_SIZE octets ;
+# l'export (gros flux) privilégie la vitesse au taux de compression
+app.add_middleware(CompressionMiddleware, route_levels={"/fiches/export": 1})
+# Ajouté en dernier : mesure la requête entière, compression comprise
+app.add_middleware(MetricsMiddleware)
 
 
 # Dépendances pour obtenir les instances des repositories et use cases
-def get_fiche_repository(db: Session = Depends(get_session)) -> SQLiteFicheRepository:
-    return SQLiteFicheRepository(session=db)
+def decorate_repository(repository: FicheRepository) -> FicheRepository:
+    if FICHE_CACHE_ENABLED:
+        return CachedFicheRepository(repository, get_fiche_cache())
+    return repository
+
+
+@lru_cache(maxsize=None)
+def get_batch_writer() -> AsyncSessionBatchWriter:
+    """Group commit des créations, partagé par les requêtes du worker.
+
+    Les lots passent par l'engine d'écriture asynchrone (celui des autres
+    écritures) : à appeler depuis la boucle d'événements de l'application.
+    """
+    return AsyncSessionBatchWriter(
+        AsyncSessionLocal,
+        lambda session: decorate_repository(SQLiteFicheRepository(session=session)),
+    )
+
+
+async def get_fiche_repository(
+    db: AsyncSession = Depends(get_async_session),
+) -> AsyncFicheRepository:
+    repository: AsyncFicheRepository = AsyncSQLiteFicheRepository(
+        session=db, decorate=decorate_repository
+    )
+    if GROUP_COMMIT_ENABLED:
+        return GroupCommitFicheRepository(repository, get_batch_writer())
+    return repository
+
+
+# Date facultative d'un paramètre de requête (AAAA-MM-JJ) : vide vaut absente
+OptionalDate = Annotated[Optional[date], BeforeValidator(lambda value: value or None)]
+
+
+def get_fiche_filter(
+    status: Optional[Status] = None,
+    origin_contact: Optional[OriginContact] = None,
+    city: Optional[str] = None,
+    code_postal_prefix: Optional[str] = None,
+    date_rdv_from: OptionalDate = None,
+    date_rdv_to: OptionalDate = None,
+    lastname_prefix: Optional[str] = None,
+    firstname_prefix: Optional[str] = None,
+    work: Optional[str] = None,
+    materiau: Optional[str] = None,
+    color: Optional[str] = None,
+    detail: List[str] = Query(
+        [], description="Critère sur les détails d'un travail, chemin:valeur"
+    ),
+) -> FicheFilter:
+    try:
+        return FicheFilter(
+            status=status,
+            origin_contact=origin_contact,
+            city=city,
+            code_postal_prefix=code_postal_prefix,
+            date_rdv_from=date_rdv_from,
+            date_rdv_to=date_rdv_to,
+            lastname_prefix=lastname_prefix,
+            firstname_prefix=firstname_prefix,
+            work=work,
+            materiau=materiau,
+            color=color,
+            details=parse_detail_criteria(detail),
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors()[0]["msg"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def get_session_factory() -> Callable[[], ContextManager[Session]]:
+    # L'export ouvre sa propre session, gardée ouverte pendant le streaming
+    # (en lecture seule : elle ne bloque ni ne retarde les écritures)
+    return read_session_scope
 
 
 def get_create_fiche_usecase(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
-) -> CreateFicheUsecase:
-    return CreateFicheUsecase(repository=repository)
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncCreateFicheUsecase:
+    return AsyncCreateFicheUsecase(repository=repository)
+
+
+def get_bulk_create_fiche_usecase(
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncBulkCreateFicheUsecase:
+    return AsyncBulkCreateFicheUsecase(repository=repository)
 
 
 def get_update_fiche_usecase(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
-) -> UpdateFicheUsecase:
-    return UpdateFicheUsecase(repository=repository)
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncUpdateFicheUsecase:
+    return AsyncUpdateFicheUsecase(repository=repository)
 
 
 def get_delete_fiche_usecase(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
-) -> DeleteFicheUsecase:
-    return DeleteFicheUsecase(repository=repository)
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncDeleteFicheUsecase:
+    return AsyncDeleteFicheUsecase(repository=repository)
+
+
+def get_search_fiches_usecase(
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncSearchFichesUsecase:
+    return AsyncSearchFichesUsecase(repository=repository)
+
+
+def get_agenda_usecase(
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncAgendaUsecase:
+    return AsyncAgendaUsecase(repository=repository)
 
 
 def get_validate_fiche_usecase(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
-) -> ValidateFicheUsecase:
-    return ValidateFicheUsecase(repository=repository)
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+) -> AsyncValidateFicheUsecase:
+    return AsyncValidateFicheUsecase(repository=repository)
 
 
-def get_completion_fiche_usecase(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
-) -> CompletionFicheUsecase:
-    config_service = WorkSchemaConfigService(config_path="config/config_works.json")
-    return CompletionFicheUsecase(repository=repository, config_service=config_service)
+def get_config_service() -> WorkSchemaConfigService:
+    return get_work_schema_config_service()
 
 
-def get_config_service():
-    return WorkSchemaConfigService(config_path="config/work_schemas.json")
+def get_completion_fiche_usecase(
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+    config_service: WorkSchemaConfigService = Depends(get_config_service),
+) -> AsyncCompletionFicheUsecase:
+    return AsyncCompletionFicheUsecase(
+        repository=repository,
+        config_service=config_service,
+        observe_validation=observe_schema_validation,
+    )
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "API en ligne ! ✅"}
 
 
-@app.get("/schema/{work}", response_model=Dict[str, Any])
-def get_schema(
-    work: str, config_service: WorkSchemaConfigService = Depends(get_config_service)
+# GET /metrics - Métriques de performance (format texte Prometheus)
+@app.get(
+    "/metrics",
+    summary="Métriques de performance",
+    description=(
+        "Latence par route, requêtes en cours, requêtes SQL et temps en base par "
+        "requête, attente du pool de connexions, validation des schémas de travaux "
+        "et encodage JSON, au format texte Prometheus."
+    ),
+    response_class=PlainTextResponse,
+)
+async def read_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get(
+    "/schema/{work}", response_model=Dict[str, Any], response_class=ModelJSONResponse
+)
+async def get_schema(
+    work: str,
+    request: Request,
+    config_service: WorkSchemaConfigService = Depends(get_config_service),
 ):
     schema = config_service.get_schema(work)
     if not schema:
         raise HTTPException(status_code=404, detail="Schema not found")
-    return schema
+    # L'empreinte du fichier change à chaque rechargement de la configuration
+    headers = cache_headers(f'"{config_service.content_hash}"', CACHE_CONTROL_SCHEMAS)
+    return not_modified(request, headers) or ModelJSONResponse(schema, headers=headers)
 
 
 # GET /fiche/{fiche_id} - Récupérer une fiche par son ID
 @app.get(
     "/fiche/{fiche_id}",
     response_model=Fiche,
+    response_class=FicheResponse,
     summary="Récupérer une fiche par ID",
     description="Retourne les détails complets d'une fiche client à partir de son identifiant",
 )
-def read_fiche(
-    fiche_id: str, repository: SQLiteFicheRepository = Depends(get_fiche_repository)
+async def read_fiche(
+    fiche_id: str,
+    request: Request,
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
 ):
-    fiche = repository.get_by_id(fiche_id)
+    fiche = await repository.get_by_id(fiche_id)
     if fiche is None:
         raise HTTPException(status_code=404, detail="Fiche not found")
-    return fiche
+    headers = cache_headers(
+        version_etag(fiche.version), CACHE_CONTROL_FICHES, fiche.updated_at
+    )
+    return not_modified(request, headers) or FicheResponse(fiche, headers=headers)
+
+
+def paginated(page: FichePage) -> FicheListResponse:
+    """Sérialise la page sans revalidation ; curseur suivant dans X-Next-Cursor."""
+    response = FicheListResponse(page.items)
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return response
+
+
+async def read_page(
+    usecase: AsyncSearchFichesUsecase,
+    filters: FicheFilter,
+    limit: int,
+    cursor: Optional[str],
+) -> FichePage:
+    try:
+        return await usecase(filters, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # GET /fiches/en-cours - Récupérer les fiches en cours
 @app.get(
     "/fiches/en-cours",
     response_model=List[Fiche],
+    response_class=FicheListResponse,
     summary="Récupérer les fiches en cours",
-    description="Retourne toutes les fiches avec le statut IN_PROGRESS",
+    description=(
+        "Retourne une page de fiches avec le statut IN_PROGRESS, triées par "
+        "(date_rdv, id). La page suivante s'obtient en repassant l'en-tête "
+        "X-Next-Cursor dans le paramètre cursor."
+    ),
 )
-def read_fiches_en_cours(
-    repository: SQLiteFicheRepository = Depends(get_fiche_repository),
+async def read_fiches_en_cours(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    usecase: AsyncSearchFichesUsecase = Depends(get_search_fiches_usecase),
 ):
-    fiches = repository.get_en_cours()
-    return fiches
+    filters = FicheFilter(status=Status.IN_PROGRESS)
+    page = await read_page(usecase, filters, limit, cursor)
+    return conditional(request, paginated(page), CACHE_CONTROL_FICHES)
 
 
 # GET /fiches - Récupérer toutes les fiches
 @app.get(
     "/fiches",
     response_model=List[Fiche],
+    response_class=FicheListResponse,
     summary="Récupérer toutes les fiches",
-    description="Retourne la liste complète de toutes les fiches clients",
+    description=(
+        "Retourne une page de fiches clients triées par (date_rdv, id), "
+        "filtrées côté serveur par les critères fournis (statut, origine, "
+        "ville, préfixe de code postal, intervalle de date_rdv inclusif, "
+        "préfixe de nom / prénom insensible à la casse, travaux validés par "
+        "type, matériau, couleur et détails chemin:valeur). La page suivante "
+        "s'obtient en repassant l'en-tête X-Next-Cursor dans le paramètre cursor."
+    ),
+)
+async def read_all_fiches(
+    request: Request,
+    filters: FicheFilter = Depends(get_fiche_filter),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    usecase: AsyncSearchFichesUsecase = Depends(get_search_fiches_usecase),
+):
+    page = await read_page(usecase, filters, limit, cursor)
+    return conditional(request, paginated(page), CACHE_CONTROL_FICHES)
+
+
+# GET /agenda - Rendez-vous d'un intervalle de dates
+@app.get(
+    "/agenda",
+    response_model=List[Fiche],
+    response_class=FicheListResponse,
+    summary="Agenda des rendez-vous",
+    description=(
+        "Retourne les fiches dont le rendez-vous tombe entre from et to (dates "
+        "AAAA-MM-JJ incluses), triées par (date_rdv, heure_rdv, id). La page "
+        "suivante s'obtient en repassant l'en-tête X-Next-Cursor dans le "
+        "paramètre cursor."
+    ),
+)
+async def read_agenda(
+    request: Request,
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    usecase: AsyncAgendaUsecase = Depends(get_agenda_usecase),
+):
+    try:
+        page = await usecase(date_from, date_to, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return conditional(request, paginated(page), CACHE_CONTROL_FICHES)
+
+
+# GET /fiches/search - Recherche plein texte
+@app.get(
+    "/fiches/search",
+    response_model=List[Fiche],
+    response_class=FicheListResponse,
+    summary="Rechercher des fiches",
+    description=(
+        "Recherche plein texte sur le nom, le prénom, le téléphone, l'email, "
+        "l'adresse et le commentaire. Chaque mot est cherché en préfixe, sans "
+        "tenir compte des accents ni de la casse ; les résultats sont classés "
+        "par pertinence (le nom compte plus que le commentaire)."
+    ),
+)
+async def search_fiches(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+):
+    return FicheListResponse(await repository.search(q, limit))
+
+
+# GET /fiches/export - Exporter toutes les fiches en streaming
+@app.get(
+    "/fiches/export",
+    summary="Exporter toutes les fiches",
+    description=(
+        "Exporte toutes les fiches en NDJSON (une fiche JSON par ligne) ou en CSV. "
+        "La réponse est produite en streaming à partir d'un curseur serveur."
+    ),
+    response_class=StreamingResponse,
 )
-def read_all_fiches(repository: SQLiteFicheRepository = Depends(get_fiche_repository)):
-    fiches = repository.get_all()
-    return fiches
+def export_fiches(
+    format: ExportFormat = ExportFormat.NDJSON,
+    batch_size: int = Query(500, ge=1, le=5000),
+    session_factory: Callable[[], ContextManager[Session]] = Depends(
+        get_session_factory
+    ),
+):
+    encode = ENCODERS[format]
+
+    def content() -> Iterator[bytes]:
+        with session_factory() as session:
+            rows = SQLiteFicheRepository(session=session).iter_all(batch_size)
+            yield from chunked(encode(rows))
+
+    logger.info("Exporting fiches", extra={"format": format.value})
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="fiches.{format.value}"'
+        },
+    )
 
 
 # POST /fiche - Créer une nouvelle fiche
@@ -149,9 +481,9 @@ def read_all_fiches(repository: SQLiteFicheRepository = Depends(get_fiche_reposi
         "et passe automatiquement le statut à IN_PROGRESS"
     ),
 )
-def create_fiche(
+async def create_fiche(
     fiche: Fiche,
-    usecase: CreateFicheUsecase = Depends(get_create_fiche_usecase),
+    usecase: AsyncCreateFicheUsecase = Depends(get_create_fiche_usecase),
 ):
     try:
         logger.info(
@@ -162,7 +494,7 @@ def create_fiche(
                 "origin_contact": fiche.origin_contact.value,
             },
         )
-        created_fiche = usecase(
+        created_fiche = await usecase(
             lastname=fiche.lastname,
             firstname=fiche.firstname,
             date_rdv=fiche.date_rdv,
@@ -186,16 +518,69 @@ def create_fiche(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def parse_bulk_body(body: bytes, content_type: str) -> List[Any]:
+    """Lit un tableau JSON ou un flux NDJSON (une fiche par ligne)."""
+    if content_type.startswith("application/x-ndjson"):
+        return [json.loads(line) for line in body.splitlines() if line.strip()]
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Le corps doit être un tableau JSON de fiches")
+    return items
+
+
+# POST /fiches/bulk - Créer des fiches par lots
+@app.post(
+    "/fiches/bulk",
+    response_model=BulkCreateReport,
+    summary="Importer des fiches par lots",
+    description=(
+        "Crée des fiches à partir d'un tableau JSON ou d'un corps NDJSON "
+        "(Content-Type: application/x-ndjson). Les fiches sont insérées par lots "
+        "de chunk_size, une transaction par lot. Avec upsert=true, une fiche "
+        "existante (même nom, prénom et téléphone) est mise à jour. "
+        "Retourne le résultat de chaque élément."
+    ),
+)
+async def bulk_create_fiches(
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=5000),
+    upsert: bool = False,
+    usecase: AsyncBulkCreateFicheUsecase = Depends(get_bulk_create_fiche_usecase),
+):
+    try:
+        items = parse_bulk_body(
+            await request.body(), request.headers.get("content-type", "")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Corps invalide: {e}")
+
+    logger.info(
+        "Bulk creating fiches",
+        extra={"items_count": len(items), "chunk_size": chunk_size, "upsert": upsert},
+    )
+    results = await usecase(items, chunk_size=chunk_size, upsert=upsert)
+    report = BulkCreateReport.from_results(results)
+    logger.info(
+        "Bulk creation done",
+        extra={
+            "created_count": report.created,
+            "updated_count": report.updated,
+            "errors_count": report.errors,
+        },
+    )
+    return report
+
+
 @app.put(
     "/fiche/{fiche_id}/travaux",
     response_model=Fiche,
     summary="Ajouter des travaux validés à une fiche",
     description="Ajoute des travaux avec validation JSON Schema et passe le statut à COMPLETED",
 )
-def add_travaux_to_fiche(
+async def add_travaux_to_fiche(
     fiche_id: str,
     completion_data: FicheCompletionData,
-    usecase: CompletionFicheUsecase = Depends(get_completion_fiche_usecase),
+    usecase: AsyncCompletionFicheUsecase = Depends(get_completion_fiche_usecase),
 ):
     try:
         logger.info(
@@ -205,9 +590,15 @@ def add_travaux_to_fiche(
                 "works_count": len(completion_data.works_planned),
             },
         )
-        completed_fiche = usecase(fiche_id, completion_data.works_planned)
+        completed_fiche = await usecase(
+            fiche_id,
+            completion_data.works_planned,
+            expected_version=completion_data.version,
+        )
         logger.info("Works added successfully", extra={"fiche_id": fiche_id})
         return completed_fiche
+    except FicheConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         logger.error(
             "Validation error adding works",
@@ -221,15 +612,18 @@ def add_travaux_to_fiche(
     "/fiche/{fiche_id}",
     response_model=Fiche,
     summary="Mettre à jour une fiche",
-    description="Met à jour les champs modifiés d'une fiche existante",
+    description=(
+        "Met à jour les champs modifiés d'une fiche existante. Répond 409 si "
+        "`version` est fourni et ne correspond plus à la version en base."
+    ),
 )
-def update_fiche(
+async def update_fiche(
     fiche_id: str,
     fiche_update: Fiche,
-    usecase: UpdateFicheUsecase = Depends(get_update_fiche_usecase),
+    usecase: AsyncUpdateFicheUsecase = Depends(get_update_fiche_usecase),
 ):
     try:
-        updated_fiche = usecase(
+        updated_fiche = await usecase(
             id=fiche_id,
             new_lastname=fiche_update.lastname,
             new_firstname=fiche_update.firstname,
@@ -245,8 +639,17 @@ def update_fiche(
             new_origin=fiche_update.origin_contact,
             new_works_planned=fiche_update.works_planned,
             new_commentary=fiche_update.commentary,
+            # `version` a une valeur par défaut : seule une version envoyée
+            # par le client est comparée à celle en base
+            expected_version=(
+                fiche_update.version
+                if "version" in fiche_update.model_fields_set
+                else None
+            ),
         )
         return updated_fiche
+    except FicheConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -258,16 +661,27 @@ def update_fiche(
     "/fiche/{fiche_id}/valider",
     response_model=Fiche,
     summary="Valider une fiche",
-    description="Passe le statut d'une fiche à COMPLETED",
+    description=(
+        "Passe le statut d'une fiche à COMPLETED en une seule écriture "
+        "conditionnelle. Répond 409 si la fiche est déjà validée ou si "
+        "`version` est fourni et ne correspond plus à la version en base."
+    ),
 )
-def validate_fiche(
-    fiche_id: str, usecase: ValidateFicheUsecase = Depends(get_validate_fiche_usecase)
+async def validate_fiche(
+    fiche_id: str,
+    version: Optional[int] = None,
+    usecase: AsyncValidateFicheUsecase = Depends(get_validate_fiche_usecase),
 ):
     try:
         logger.info("Validating fiche", extra={"fiche_id": fiche_id})
-        validated_fiche = usecase(fiche_id)
+        validated_fiche = await usecase(fiche_id, expected_version=version)
         logger.info("Fiche validated successfully", extra={"fiche_id": fiche_id})
         return validated_fiche
+    except FicheConflictError as e:
+        logger.warning(
+            "Fiche validation conflict", extra={"fiche_id": fiche_id, "error": str(e)}
+        )
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         logger.warning("Fiche not found for validation", extra={"fiche_id": fiche_id})
         raise HTTPException(status_code=404, detail=str(e))
@@ -284,12 +698,12 @@ def validate_fiche(
     summary="Supprimer une fiche",
     description="Supprime définitivement une fiche client de la base de données",
 )
-def delete_fiche(
-    fiche_id: str, usecase: DeleteFicheUsecase = Depends(get_delete_fiche_usecase)
+async def delete_fiche(
+    fiche_id: str, usecase: AsyncDeleteFicheUsecase = Depends(get_delete_fiche_usecase)
 ):
     try:
         logger.info("Deleting fiche", extra={"fiche_id": fiche_id})
-        usecase(fiche_id)
+        await usecase(fiche_id)
         logger.info("Fiche deleted successfully", extra={"fiche_id": fiche_id})
         return {"detail": "Fiche deleted"}
     except ValueError as e:
@@ -305,9 +719,58 @@ def delete_fiche(
 @app.get(
     "/fiches/villes",
     response_model=List[str],
+    response_class=ModelJSONResponse,
     summary="Liste des villes distinctes",
     description="Retourne la liste unique de toutes les villes présentes dans les fiches",
 )
-def get_distinct_cities(db: Session = Depends(get_session)):
-    villes = db.query(FicheModel.city).distinct().all()
-    return [ville[0] for ville in villes if ville[0]]
+async def get_distinct_cities(
+    request: Request, repository: AsyncFicheRepository = Depends(get_fiche_repository)
+):
+    # Clés du compteur par ville : une ligne par ville, pas un DISTINCT sur fiche
+    counts = await repository.stats(StatsDimension.CITY)
+    villes = [ville for ville in counts[StatsDimension.CITY.value] if ville]
+    return conditional(request, ModelJSONResponse(villes), CACHE_CONTROL_CITIES)
+
+
+@app.get(
+    "/stats",
+    response_model=Dict[str, Dict[str, int]],
+    response_class=ModelJSONResponse,
+    summary="Nombre de fiches par statut, origine, ville et type de travaux",
+    description=(
+        "Compteurs tenus à jour à chaque écriture : la réponse ne dépend que "
+        "du nombre de valeurs distinctes, pas du nombre de fiches. L'axe "
+        "`work` compte les travaux validés (une fiche peut en avoir plusieurs)."
+    ),
+)
+async def get_stats(
+    request: Request, repository: AsyncFicheRepository = Depends(get_fiche_repository)
+):
+    response = ModelJSONResponse(await repository.stats())
+    return conditional(request, response, CACHE_CONTROL_FICHES)
+
+
+@app.get(
+    "/stats/{dimension}",
+    response_model=Dict[str, int],
+    response_class=ModelJSONResponse,
+    summary="Nombre de fiches par valeur d'un axe",
+)
+async def get_dimension_stats(
+    dimension: StatsDimension,
+    request: Request,
+    repository: AsyncFicheRepository = Depends(get_fiche_repository),
+):
+    counts = await repository.stats(dimension)
+    response = ModelJSONResponse(counts[dimension.value])
+    return conditional(request, response, CACHE_CONTROL_FICHES)
+
+
+@app.get(
+    "/cache/stats",
+    response_model=Dict[str, int],
+    summary="Statistiques du cache des fiches",
+    description="Compteurs hits / misses / evictions du cache de GET /fiche/{id}",
+)
+async def get_cache_stats():
+    return get_fiche_cache().stats()
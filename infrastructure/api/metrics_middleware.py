@@ -0,0 +1,76 @@
+"""
+Instrumentation des requêtes HTTP (latence, requêtes en cours, temps en base).
+
+La route est étiquetée par son gabarit (`/fiche/{fiche_id}`), connu après
+le routage : une série par route, pas par URL. Les requêtes sans route
+(404) sont regroupées sous `unmatched`. La durée court jusqu'au dernier
+bloc du corps, streaming compris.
+
+Une ligne de log « Request completed » résume chaque requête ; en
+production (format JSON), ses champs s'ajoutent à ceux de la requête
+(voir infrastructure.logging_config).
+"""
+
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    start_request,
+)
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = start_request()
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            duration = time.perf_counter() - start
+            labels = {"method": scope["method"], "route": route_template(scope)}
+            HTTP_REQUESTS.inc(**labels, status=str(status))
+            HTTP_REQUEST_DURATION.observe(duration, **labels)
+            DB_QUERIES_PER_REQUEST.observe(metrics.db_queries, **labels)
+            DB_TIME_PER_REQUEST.observe(metrics.db_time, **labels)
+            logger.info(
+                "Request completed",
+                extra={
+                    "http_method": labels["method"],
+                    "http_route": labels["route"],
+                    "http_status": status,
+                    "duration_ms": round(duration * 1000, 3),
+                },
+            )
@@ -0,0 +1,44 @@
+"""
+Réponses JSON encodées directement par le sérialiseur Rust de Pydantic.
+
+Une route qui renvoie une instance de Response court-circuite le
+`response_model` : pas de revalidation de la liste, pas de dict Python
+intermédiaire ni de json.dumps. Le TypeAdapter de la classe connaît le type
+du contenu (modèles, Enum OriginContact / Status, dicts `details`) et
+l'encode en octets en une passe, quelle que soit la version de FastAPI.
+
+À l'inverse, déclarer un `response_class` JSON (ORJSONResponse, JSONResponse)
+sans renvoyer l'instance fait passer le contenu par `model_dump` puis par
+l'encodeur Python : c'est le chemin lent (voir benchmarks/bench_list_response).
+
+Le `response_model` reste déclaré sur les routes pour la documentation OpenAPI.
+La durée de l'encodage est relevée dans les métriques de la requête.
+"""
+
+import time
+from typing import Any, List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from contact_fiche.entities.fiche_entity import Fiche
+from infrastructure.metrics import observe_serialization
+
+
+class ModelJSONResponse(Response):
+    media_type = "application/json"
+    adapter: TypeAdapter[Any] = TypeAdapter(Any)
+
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = self.adapter.dump_json(content)
+        observe_serialization(time.perf_counter() - start)
+        return body
+
+
+class FicheResponse(ModelJSONResponse):
+    adapter = TypeAdapter(Fiche)
+
+
+class FicheListResponse(ModelJSONResponse):
+    adapter = TypeAdapter(List[Fiche])
@@ -0,0 +1 @@
+# Infrastructure Cache Package
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional, Protocol, Tuple
+
+FICHE_CACHE_ENABLED = os.getenv("FICHE_CACHE_ENABLED", "true").lower() in ("1", "true")
+FICHE_CACHE_MAXSIZE = int(os.getenv("FICHE_CACHE_MAXSIZE", "1024"))
+FICHE_CACHE_TTL = float(os.getenv("FICHE_CACHE_TTL", "30"))
+
+
+class CacheBackend(Protocol):
+    """Stockage clé/valeur interchangeable (LRU local, stand-in de test, ...)."""
+
+    def get(self, key: Hashable) -> Optional[Any]: ...
+    def set(self, key: Hashable, value: Any) -> None: ...
+    def delete(self, key: Hashable) -> None: ...
+    def clear(self) -> None: ...
+    def stats(self) -> Dict[str, int]: ...
+
+
+class LRUTTLCache:
+    """Cache LRU en mémoire, borné en taille, avec expiration (TTL)."""
+
+    def __init__(
+        self,
+        maxsize: int = FICHE_CACHE_MAXSIZE,
+        ttl: float = FICHE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+class ReadThroughCache:
+    """Cache en lecture seule devant un stockage, invalidé par les écritures.
+
+    Une lecture commencée avant une invalidation ne doit pas réinsérer une
+    valeur périmée : `generation()` est relevé avant la lecture en base et
+    `put()` est ignoré si une invalidation a eu lieu entre-temps.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self.backend.set(key, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self.backend.stats()
+
+
+@lru_cache(maxsize=None)
+def get_fiche_cache() -> ReadThroughCache:
+    """Cache des fiches partagé par tout le processus."""
+    return ReadThroughCache(LRUTTLCache())
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from typing import AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from starlette.requests import Request
+
+from infrastructure.database.connexion import (
+    configure_engine,
+    db_url,
+    engine_options,
+    is_sqlite_file,
+)
+
+# Pilote asynchrone à utiliser pour chaque backend de DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Convertit DATABASE_URL (pilote synchrone) vers son pilote asynchrone."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"Aucun pilote asynchrone pour {parsed.drivername}")
+    return parsed.set(
+        drivername=f"{parsed.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """Engine asynchrone du processus, créé une seule fois avec son pool."""
+    async_url = to_async_url(db_url)
+    engine = create_async_engine(async_url, **engine_options(async_url))
+    configure_engine(engine.sync_engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_async_read_engine() -> AsyncEngine:
+    """Engine asynchrone des lectures (voir connexion.get_read_engine)."""
+    if not is_sqlite_file(db_url):
+        return get_async_engine()
+    async_url = to_async_url(db_url)
+    engine = create_async_engine(async_url, **engine_options(async_url, read_only=True))
+    configure_engine(engine.sync_engine, read_only=True)
+    return engine
+
+
+AsyncSessionLocal = async_sessionmaker(bind=get_async_engine())
+AsyncReadSessionLocal = async_sessionmaker(bind=get_async_read_engine())
+
+# Méthodes HTTP servies par l'engine des lectures
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+async def get_async_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Dépendance FastAPI : une session asynchrone par requête.
+
+    GET / HEAD lisent via le pool en lecture seule ; les autres méthodes
+    passent par l'engine d'écriture, lectures comprises, pour voir leurs
+    propres écritures dans la même transaction.
+    """
+    factory = (
+        AsyncReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal
+    )
+    async with factory() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
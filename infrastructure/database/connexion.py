@@ -1,8 +1,14 @@
 import os
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Dict, Iterator
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session, sessionmaker
+
+from infrastructure.database.instrumentation import instrument_engine
 
 load_dotenv()
 
@@ -13,12 +19,144 @@ if not DATABASE_URL:
 
 db_url = DATABASE_URL
 
+# Réglages du pool de connexions (surchargeables via l'environnement)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+
+
+# Profil SQLite, appliqué à chaque nouvelle connexion (surchargeable) :
+# WAL laisse les lectures se poursuivre pendant une écriture ; en WAL,
+# synchronous=NORMAL ne synchronise le disque qu'aux checkpoints (un COMMIT
+# survit à un crash de l'application, pas forcément à une coupure de courant :
+# SQLITE_SYNCHRONOUS=FULL pour l'exiger).
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # Attente d'un verrou avant "database is locked", en millisecondes
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # Négatif : taille en KiB (64 Mio par connexion)
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def is_sqlite_file(url: str) -> bool:
+    """Base SQLite sur disque (une base en mémoire n'existe que par connexion)."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def engine_options(url: str, read_only: bool = False) -> Dict[str, Any]:
+    """Construit les options de create_engine adaptées au backend.
+
+    Une base SQLite sur disque n'accepte qu'un écrivain à la fois : l'engine
+    d'écriture n'a qu'une connexion, les écritures concurrentes attendent
+    leur tour dans le pool (DB_POOL_TIMEOUT) plutôt que sur le verrou de la
+    base. Les lectures passent par l'engine `read_only`, avec son propre pool.
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # La connexion SQLite est partagée entre les threads du serveur
+        options["connect_args"] = {"check_same_thread": False}
+        if not is_sqlite_file(url):
+            # Base en mémoire : un pool à file d'attente n'a pas de sens
+            return options
+        if not read_only:
+            options.update(pool_size=1, max_overflow=0, pool_timeout=DB_POOL_TIMEOUT)
+            return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(engine: Engine, read_only: bool = False) -> Engine:
+    """Applique SQLITE_PRAGMAS (et query_only si `read_only`) à la connexion.
+
+    Pour un engine asynchrone, passer `async_engine.sync_engine`.
+    """
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            if read_only:
+                # Filet de sécurité : toute écriture échoue sur ces connexions
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def configure_engine(engine: Engine, read_only: bool = False) -> Engine:
+    """Pragmas SQLite éventuels et instrumentation d'un engine de l'API."""
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, read_only=read_only)
+    return instrument_engine(engine)
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Retourne l'engine du processus, créé une seule fois avec son pool."""
+    return configure_engine(create_engine(db_url, **engine_options(db_url)))
+
+
+@lru_cache(maxsize=None)
+def get_read_engine() -> Engine:
+    """Engine des lectures : pool de connexions en lecture seule sous SQLite.
+
+    Hors SQLite sur disque, c'est l'engine du processus (get_engine).
+    """
+    if not is_sqlite_file(db_url):
+        return get_engine()
+    return configure_engine(
+        create_engine(db_url, **engine_options(db_url, read_only=True)),
+        read_only=True,
+    )
+
+
+SessionLocal = sessionmaker(bind=get_engine())
+ReadSessionLocal = sessionmaker(bind=get_read_engine())
+
+
+@contextmanager
+def session_scope(
+    factory: Callable[[], Session] = SessionLocal,
+) -> Iterator[Session]:
+    """Ouvre une session, annule la transaction en cas d'erreur et la ferme."""
+    session = factory()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 
-def get_engine():
-    return create_engine(db_url)
+def read_session_scope() -> ContextManager[Session]:
+    """session_scope sur l'engine des lectures (export, ...)."""
+    return session_scope(ReadSessionLocal)
 
 
-def get_session():
-    engine = get_engine()
-    Session = sessionmaker(engine)
-    return Session()
+def get_session() -> Iterator[Session]:
+    """Dépendance FastAPI : une session par requête, toujours rendue au pool."""
+    with session_scope() as session:
+        yield session
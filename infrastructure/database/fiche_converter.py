@@ -1,37 +1,59 @@
 # converters/fiche_converter.py
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from contact_fiche.entities.fiche_entity import Fiche
-from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.fiche_filter import name_key
 from infrastructure.database.fiche_model import FicheModel, WorkPlannedModel
 
 
 class FicheConverter:
     @staticmethod
-    def model_to_entity(model: FicheModel) -> Fiche:
-        wp_list: List[WorksPlanned] = []
-        for wp in model.work_planned:
-            wp_list.append(WorksPlanned(work=wp.work, details=wp.details))
-
-        return Fiche(
-            id=model.id,
-            lastname=model.lastname,
-            firstname=model.firstname,
-            date_rdv=model.date_rdv,
-            heure_rdv=model.heure_rdv,
-            telephone=model.telephone,
-            email=model.email,
-            address=model.address,
-            code_postal=model.code_postal,
-            city=model.city,
-            type_logement=model.type_logement,
-            statut_habitation=model.statut_habitation,
-            origin_contact=model.origin_contact,
-            status=model.status,
-            commentary=model.commentary,
-            planned_works=model.planned_works or [],
-            works_planned=wp_list,
-        )
+    def model_to_entity(
+        model: FicheModel, works: Optional[List[Dict[str, Any]]] = None
+    ) -> Fiche:
+        """Construit l'entité en une seule validation Pydantic.
+
+        Le dict projeté est validé d'un bloc par le cœur Rust de Pydantic,
+        travaux compris : plus rapide que d'instancier chaque WorksPlanned
+        puis la Fiche depuis Python (et que `model_construct`, dont la
+        boucle sur les champs est en Python).
+        """
+        return Fiche.model_validate(FicheConverter.model_to_dict(model, works))
+
+    @staticmethod
+    def model_to_dict(
+        model: FicheModel, works: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Projette une ligne en dict prêt pour JSON, sans passer par Pydantic.
+
+        `works` ({"work", "details"}), s'il est fourni, remplace la relation
+        `work_planned` : les travaux déjà connus ne sont pas rechargés.
+        """
+        if works is None:
+            works = [
+                {"work": wp.work, "details": wp.details} for wp in model.work_planned
+            ]
+        return {
+            "id": model.id,
+            "lastname": model.lastname,
+            "firstname": model.firstname,
+            "date_rdv": model.date_rdv.isoformat(),
+            "heure_rdv": model.heure_rdv.strftime("%H:%M"),
+            "telephone": model.telephone,
+            "email": model.email,
+            "address": model.address,
+            "code_postal": model.code_postal,
+            "city": model.city,
+            "type_logement": model.type_logement,
+            "statut_habitation": model.statut_habitation,
+            "origin_contact": model.origin_contact.value,
+            "planned_works": model.planned_works or [],
+            "works_planned": works,
+            "commentary": model.commentary,
+            "status": model.status.value if model.status else None,
+            "version": model.version,
+            "updated_at": (model.updated_at.isoformat() if model.updated_at else None),
+        }
 
     @staticmethod
     def entity_to_model(entity: Fiche) -> FicheModel:
@@ -44,6 +66,8 @@ class FicheConverter:
             id=entity.id,
             lastname=entity.lastname,
             firstname=entity.firstname,
+            lastname_key=name_key(entity.lastname),
+            firstname_key=name_key(entity.firstname),
             date_rdv=entity.date_rdv,
             heure_rdv=entity.heure_rdv,
             telephone=entity.telephone,
@@ -59,3 +83,27 @@ class FicheConverter:
             planned_works=entity.planned_works or [],
             work_planned=wp_models,
         )
+
+    @staticmethod
+    def entity_to_row(entity: Fiche) -> Dict[str, Any]:
+        """Valeurs des colonnes de `fiche`, pour les INSERT/UPDATE groupés."""
+        return {
+            "id": entity.id,
+            "lastname": entity.lastname,
+            "firstname": entity.firstname,
+            "lastname_key": name_key(entity.lastname),
+            "firstname_key": name_key(entity.firstname),
+            "date_rdv": entity.date_rdv,
+            "heure_rdv": entity.heure_rdv,
+            "telephone": entity.telephone,
+            "email": entity.email,
+            "address": entity.address,
+            "code_postal": entity.code_postal,
+            "city": entity.city,
+            "type_logement": entity.type_logement,
+            "statut_habitation": entity.statut_habitation,
+            "origin_contact": entity.origin_contact,
+            "status": entity.status,
+            "commentary": entity.commentary,
+            "planned_works": entity.planned_works or [],
+        }
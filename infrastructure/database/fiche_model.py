@@ -1,23 +1,79 @@
-from sqlalchemy import JSON, Column
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import JSON, Column, Computed, Date, DateTime
 from sqlalchemy import Enum as SQLAEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String, Time, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.sqlite import TIME as SQLITE_TIME
 from sqlalchemy.orm import declarative_base, relationship
 
 from contact_fiche.enums import OriginContact, Status
+from contact_fiche.fiche_filter import PROMOTED_PATHS
 from infrastructure.database.connexion import get_engine
+from infrastructure.database.fiche_search import install_ddl
+from infrastructure.database.fiche_stats import install_stats_triggers
 
 Base = declarative_base()
 engine = get_engine()
 
 
+def utcnow() -> datetime:
+    """Heure UTC naïve, comme la stockent les colonnes DateTime."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# SQLite stocke les heures en texte : "HH:MM", triable et identique aux
+# valeurs saisies avant le typage de la colonne (secondes tolérées en lecture)
+RdvTime = Time().with_variant(
+    SQLITE_TIME(
+        storage_format="%(hour)02d:%(minute)02d", regexp=r"(\d+):(\d+)(?::(\d+))?"
+    ),
+    "sqlite",
+)
+
+# Noms en forme de comparaison (contact_fiche.fiche_filter.name_key). Sous
+# PostgreSQL, collation "C" : l'ordre des octets UTF-8 est celui des points de
+# code, l'intervalle de préfixe du repository équivaut alors à startswith
+NameKey = String().with_variant(String(collation="C"), "postgresql")
+
+# Documents JSON : JSONB sous PostgreSQL (index GIN, containment @>)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+def promoted_detail(details: Column, name: str) -> Any:
+    """Expression SQL d'un chemin promu de `details` (voir PROMOTED_PATHS)."""
+    values = [
+        details[tuple(path.split("."))].as_string() for path in PROMOTED_PATHS[name]
+    ]
+    return values[0] if len(values) == 1 else func.coalesce(*values)
+
+
 class FicheModel(Base):
     __tablename__ = "fiche"
+    __table_args__ = (
+        # Pagination keyset triée par (date_rdv, id), filtrée ou non par statut
+        Index("ix_fiche_date_rdv_id", "date_rdv", "id"),
+        Index("ix_fiche_status_date_rdv_id", "status", "date_rdv", "id"),
+        # Agenda : intervalle de dates parcouru dans l'ordre des rendez-vous
+        Index("ix_fiche_date_rdv_heure_rdv_id", "date_rdv", "heure_rdv", "id"),
+        # SELECT DISTINCT city de /fiches/villes
+        Index("ix_fiche_city", "city"),
+        # Recherche par préfixe de code postal
+        Index("ix_fiche_code_postal", "code_postal"),
+        # Recherche par préfixe de nom / prénom, insensible à la casse
+        Index("ix_fiche_lastname_key", "lastname_key"),
+        Index("ix_fiche_firstname_key", "firstname_key"),
+    )
 
     id = Column(String, primary_key=True)
     lastname = Column(String, nullable=False)
     firstname = Column(String, nullable=False)
-    date_rdv = Column(String, nullable=False)
-    heure_rdv = Column(String, nullable=False)
+    # name_key(lastname) / name_key(firstname), écrits par le repository
+    lastname_key = Column(NameKey, nullable=True)
+    firstname_key = Column(NameKey, nullable=True)
+    date_rdv = Column(Date, nullable=False)
+    heure_rdv = Column(RdvTime, nullable=False)
     telephone = Column(String, nullable=False)
     email = Column(String, nullable=False)
     address = Column(String, nullable=False)
@@ -30,24 +86,75 @@ class FicheModel(Base):
     commentary = Column(String, nullable=True)
     # Liste simple des travaux prévus (pense-bête lors de la création)
     # Ex: ["fenetre", "porte_entree"]
-    planned_works = Column(JSON, default=list, nullable=True)
+    planned_works = Column(JSONDocument, default=list, nullable=True)
+    # Verrou optimiste : incrémenté à chaque UPDATE de la ligne
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Date (UTC) de la dernière écriture : en-tête Last-Modified de GET /fiche
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.current_timestamp(),
+    )
     # Relation vers les travaux validés avec détails complets
     work_planned = relationship(
-        "WorkPlannedModel", back_populates="fiche", cascade="all, delete-orphan"
+        "WorkPlannedModel",
+        back_populates="fiche",
+        cascade="all, delete-orphan",
+        order_by="WorkPlannedModel.id",
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class WorkPlannedModel(Base):
     __tablename__ = "work_planned"
+    __table_args__ = (
+        # Rapports par type de travaux, matériau et couleur (GET /fiches)
+        Index("ix_work_planned_work_materiau_color", "work", "materiau", "color"),
+        # Autres chemins de `details` : containment @> sous PostgreSQL
+        Index(
+            "ix_work_planned_details",
+            "details",
+            postgresql_using="gin",
+            postgresql_ops={"details": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    fiche_id = Column(String, ForeignKey("fiche.id"), nullable=False)
+    fiche_id = Column(String, ForeignKey("fiche.id"), nullable=False, index=True)
     work = Column(String, nullable=False)
     # Stocke toutes les données dynamiques validées via vos JSON schemas
-    details = Column(JSON, nullable=False)
+    details = Column(JSONDocument, nullable=False)
+    # Chemins fréquents de `details`, calculés par la base et indexés ; STORED
+    # car PostgreSQL n'indexe pas les colonnes générées virtuelles
+    materiau = Column(
+        String, Computed(promoted_detail(details, "materiau"), persisted=True)
+    )
+    color = Column(String, Computed(promoted_detail(details, "color"), persisted=True))
 
     # Relation inverse vers la fiche
     fiche = relationship("FicheModel", back_populates="work_planned")
 
 
+class FicheStatsModel(Base):
+    """Compteur de fiches par valeur d'un axe (statut, ville, travaux, ...).
+
+    Tenu à jour par des triggers sur `fiche` et `work_planned` (voir
+    infrastructure/database/fiche_stats.py) : la lecture des statistiques
+    coûte O(valeurs distinctes) et non O(fiches).
+    """
+
+    __tablename__ = "fiche_stats"
+
+    dimension = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
+# Table de recherche plein texte et triggers des compteurs, créés avec le schéma
+install_ddl(Base.metadata)
+install_stats_triggers(Base.metadata)
+
 Base.metadata.create_all(engine)
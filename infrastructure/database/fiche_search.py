@@ -0,0 +1,224 @@
+"""
+Index de recherche plein texte des fiches (GET /fiches/search).
+
+Les fiches sont indexées dans une table annexe `fiche_search`, tenue à jour
+par SQLiteFicheRepository dans la même transaction que la fiche :
+- SQLite : table virtuelle FTS5, classement bm25 ;
+- PostgreSQL : tsvector pondéré (GIN) + trigrammes pg_trgm pour les fautes
+  de frappe, classement ts_rank + word_similarity.
+
+Le texte est normalisé côté Python (contact_fiche.search_text) : "Hélène"
+et "helene" produisent les mêmes termes sur les deux moteurs, sans
+dépendre de l'extension unaccent.
+"""
+
+import hashlib
+import sys
+from typing import Iterable, List, Protocol
+
+from sqlalchemy import DDL, MetaData, event, text
+from sqlalchemy.orm import Session
+
+from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.search_text import (
+    SEARCH_WEIGHTS,
+    search_document,
+    search_terms,
+)
+from infrastructure.database.schema_ddl import create_with_table
+
+SEARCH_TABLE = "fiche_search"
+
+# Colonnes indexées, de la plus à la moins pertinente
+SEARCH_COLUMNS = tuple(SEARCH_WEIGHTS)
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        fiche_id UNINDEXED,
+        {", ".join(SEARCH_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"""
+    CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} (
+        fiche_id VARCHAR PRIMARY KEY REFERENCES fiche (id) ON DELETE CASCADE,
+        content TEXT NOT NULL,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document "
+    f"ON {SEARCH_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_content_trgm "
+    f"ON {SEARCH_TABLE} USING GIN (content gin_trgm_ops)",
+]
+
+DROP_DDL = f"DROP TABLE IF EXISTS {SEARCH_TABLE}"
+
+
+class FicheSearchIndex(Protocol):
+    def index(
+        self, session: Session, fiches: Iterable[Fiche], new: bool = False
+    ) -> None: ...
+    def remove(self, session: Session, ids: Iterable[str]) -> None: ...
+    def search(self, session: Session, query: str, limit: int) -> List[str]: ...
+
+
+def search_rowid(fiche_id: str) -> int:
+    """rowid FTS5 d'une fiche, dérivé de son id (entier signé de 64 bits).
+
+    La colonne `fiche_id` est UNINDEXED : un DELETE ... WHERE fiche_id
+    parcourt toute la table. Le rowid, lui, est une recherche ponctuelle.
+    Il n'est pas repris de `fiche.rowid`, que VACUUM peut renuméroter
+    (la clé primaire de fiche n'est pas un INTEGER PRIMARY KEY).
+    """
+    digest = hashlib.blake2b(fiche_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SQLiteFicheSearchIndex:
+    """Recherche FTS5 : chaque terme est cherché en préfixe, tous requis.
+
+    Chaque ligne a pour rowid `search_rowid(fiche_id)`.
+    """
+
+    # Poids bm25 par colonne (fiche_id, non indexée, en premier)
+    WEIGHTS = ", ".join(str(w) for w in (0.0, *SEARCH_WEIGHTS.values()))
+
+    def index(
+        self, session: Session, fiches: Iterable[Fiche], new: bool = False
+    ) -> None:
+        """Indexe les fiches ; `new` : fiches qui viennent d'être insérées."""
+        rows = [
+            {"rowid": search_rowid(f.id), "fiche_id": f.id, **search_document(f)}
+            for f in fiches
+        ]
+        if not rows:
+            return
+        if not new:
+            self.remove(session, [row["fiche_id"] for row in rows])
+        columns = ", ".join(SEARCH_COLUMNS)
+        values = ", ".join(":" + c for c in SEARCH_COLUMNS)
+        session.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, fiche_id, {columns}) "
+                f"VALUES (:rowid, :fiche_id, {values})"
+            ),
+            rows,
+        )
+
+    def remove(self, session: Session, ids: Iterable[str]) -> None:
+        params = [{"rowid": search_rowid(id)} for id in ids]
+        if params:
+            session.execute(
+                text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), params
+            )
+
+    def search(self, session: Session, query: str, limit: int) -> List[str]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"*' for term in terms)
+        rows = session.execute(
+            text(
+                f"SELECT fiche_id FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH :match "
+                f"ORDER BY bm25({SEARCH_TABLE}, {self.WEIGHTS}) LIMIT :limit"
+            ),
+            {"match": match, "limit": limit},
+        )
+        return [row[0] for row in rows]
+
+
+class PostgresFicheSearchIndex:
+    """Recherche tsvector (préfixes, tous requis) ou trigrammes (fautes)."""
+
+    def index(
+        self, session: Session, fiches: Iterable[Fiche], new: bool = False
+    ) -> None:
+        rows = [{"fiche_id": f.id, **search_document(f)} for f in fiches]
+        if not rows:
+            return
+        session.execute(
+            text(f"""
+                INSERT INTO {SEARCH_TABLE} (fiche_id, content, document)
+                VALUES (
+                    :fiche_id,
+                    concat_ws(' ', :names, :contact, :address, :commentary),
+                    setweight(to_tsvector('simple', :names), 'A')
+                    || setweight(to_tsvector('simple', :contact), 'B')
+                    || setweight(to_tsvector('simple', :address), 'C')
+                    || setweight(to_tsvector('simple', :commentary), 'D')
+                )
+                ON CONFLICT (fiche_id) DO UPDATE
+                SET content = EXCLUDED.content, document = EXCLUDED.document
+                """),
+            rows,
+        )
+
+    def remove(self, session: Session, ids: Iterable[str]) -> None:
+        session.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE fiche_id = ANY(:ids)"),
+            {"ids": list(ids)},
+        )
+
+    def search(self, session: Session, query: str, limit: int) -> List[str]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        rows = session.execute(
+            text(f"""
+                SELECT fiche_id FROM {SEARCH_TABLE},
+                    to_tsquery('simple', :tsquery) AS query
+                WHERE document @@ query OR :text <% content
+                ORDER BY ts_rank(document, query)
+                    + word_similarity(:text, content) DESC
+                LIMIT :limit
+                """),
+            {
+                "tsquery": " & ".join(f"{term}:*" for term in terms),
+                "text": " ".join(terms),
+                "limit": limit,
+            },
+        )
+        return [row[0] for row in rows]
+
+
+def get_search_index(dialect_name: str) -> FicheSearchIndex:
+    if dialect_name == "postgresql":
+        return PostgresFicheSearchIndex()
+    return SQLiteFicheSearchIndex()
+
+
+def install_ddl(metadata: MetaData) -> None:
+    """Crée / supprime la table de recherche avec le schéma.
+
+    SQLite : les événements de MetaData sont émis à chaque `create_all`, y
+    compris sur une base existante ; grâce à IF NOT EXISTS, la table de
+    recherche est ajoutée aux bases créées avant elle. PostgreSQL : à la
+    création de la table `fiche` seulement (l'extension et les index d'une
+    base existante viennent de la migration 005), voir schema_ddl.
+    """
+    for statement in SQLITE_DDL:
+        event.listen(
+            metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
+    create_with_table(metadata, "fiche", "postgresql", POSTGRES_DDL)
+    event.listen(metadata, "before_drop", DDL(DROP_DDL))
+
+
+if __name__ == "__main__":
+    # Réindexation complète, après la migration d'une base existante
+    from infrastructure.database.connexion import session_scope
+    from infrastructure.repositories.sqlite_fiche_repository import (
+        SQLiteFicheRepository,
+    )
+
+    with session_scope() as session:
+        count = SQLiteFicheRepository(session=session).rebuild_search_index()
+        print(f"{count} fiches indexées", file=sys.stderr)
@@ -0,0 +1,230 @@
+"""
+Compteurs de fiches par statut, origine, ville et type de travaux.
+
+La table `fiche_stats` (dimension, key, count) est tenue à jour par des
+triggers sur `fiche` et `work_planned` : toute écriture, y compris les
+UPDATE / INSERT groupés en Core et les transitions de statut en un seul
+UPDATE, ajuste les compteurs dans la même transaction, sans lecture
+préalable de l'ancienne ligne côté Python. Un compteur qui tombe à zéro
+est supprimé : /fiches/villes ne liste que des villes encore présentes.
+
+PostgreSQL : triggers par instruction (FOR EACH STATEMENT) sur tables de
+transition ; les deltas d'une instruction sont agrégés par compteur, si
+bien qu'un INSERT / UPDATE / DELETE groupé n'écrit qu'une fois chaque
+compteur touché au lieu d'une fois par ligne. Les transactions
+concurrentes qui touchent le même compteur (même statut, même ville)
+attendent toujours son verrou jusqu'au commit : c'est le prix de compteurs
+exacts, limité à une écriture par instruction. SQLite n'a que des
+triggers par ligne, sans concurrence entre écrivains.
+
+Les statuts et origines sont stockés sous le nom de l'Enum (colonnes
+SQLAlchemy Enum) ; la conversion vers la valeur se fait à la lecture.
+"""
+
+import sys
+from typing import Dict, List, Tuple
+
+from sqlalchemy import DDL, MetaData, event, text
+from sqlalchemy.orm import Session
+
+from contact_fiche.enums import StatsDimension
+from infrastructure.database.schema_ddl import create_with_table
+
+STATS_TABLE = "fiche_stats"
+
+# Dimension -> colonne de la table `fiche`
+FICHE_COLUMNS = {
+    StatsDimension.STATUS: "status",
+    StatsDimension.ORIGIN_CONTACT: "origin_contact",
+    StatsDimension.CITY: "city",
+}
+# Dimension -> colonne de la table `work_planned`
+WORK_COLUMNS = {StatsDimension.WORK: "work"}
+
+
+def _keys(row: str, columns: Dict[StatsDimension, str]) -> List[Tuple[str, str]]:
+    return [
+        (dimension.value, f"CAST({row}.{column} AS VARCHAR)")
+        for dimension, column in columns.items()
+    ]
+
+
+def _sqlite_apply(keys: List[Tuple[str, str]], delta: int) -> str:
+    """Instructions de trigger SQLite ajoutant `delta` aux compteurs `keys`."""
+    rows = " UNION ALL ".join(
+        f"SELECT '{dimension}' AS dimension, {key} AS key" for dimension, key in keys
+    )
+    statements = f"""
+        INSERT INTO {STATS_TABLE} (dimension, key, count)
+        SELECT dimension, key, {delta} FROM ({rows}) WHERE key IS NOT NULL
+        ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    """
+    if delta < 0:
+        statements += f"""
+        DELETE FROM {STATS_TABLE}
+        WHERE count <= 0 AND (dimension, key) IN ({rows});
+        """
+    return statements
+
+
+def _sqlite_triggers(table: str, columns: Dict[StatsDimension, str]) -> List[str]:
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columns.values())
+    new, old = _keys("NEW", columns), _keys("OLD", columns)
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_insert
+        AFTER INSERT ON {table}
+        BEGIN {_sqlite_apply(new, 1)} END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_delete
+        AFTER DELETE ON {table}
+        BEGIN {_sqlite_apply(old, -1)} END
+        """,
+        # Nouvelles valeurs d'abord : une valeur inchangée ne passe pas par zéro
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_{table}_update
+        AFTER UPDATE OF {", ".join(columns.values())} ON {table}
+        WHEN {changed}
+        BEGIN {_sqlite_apply(new, 1)} {_sqlite_apply(old, -1)} END
+        """,
+    ]
+
+
+def _postgres_changes(columns: Dict[StatsDimension, str], rows: str) -> List[str]:
+    delta = 1 if rows == "new_rows" else -1
+    return [
+        f"SELECT '{dimension}' AS dimension, {key} AS key, {delta} AS delta "
+        f"FROM {rows}"
+        for dimension, key in _keys(rows, columns)
+    ]
+
+
+def _postgres_apply(columns: Dict[StatsDimension, str], tables: List[str]) -> str:
+    """Instructions de trigger PostgreSQL appliquant les deltas nets des
+    tables de transition `tables` ("new_rows" compte +1, "old_rows" -1)."""
+    changes = "\n            UNION ALL ".join(
+        change for rows in tables for change in _postgres_changes(columns, rows)
+    )
+    # Une écriture par compteur et par instruction, dans un ordre fixe : deux
+    # instructions concurrentes ne peuvent pas s'interbloquer. Une valeur
+    # inchangée par un UPDATE compte +1 et -1 : son delta net est nul.
+    statements = f"""
+        INSERT INTO {STATS_TABLE} (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            {changes}
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = {STATS_TABLE}.count + EXCLUDED.count;
+    """
+    if "old_rows" in tables:
+        # Seul un compteur des anciennes valeurs peut tomber à zéro
+        removed = "\n            UNION ALL ".join(
+            _postgres_changes(columns, "old_rows")
+        )
+        statements += f"""
+        DELETE FROM {STATS_TABLE}
+        WHERE count <= 0 AND (dimension, key) IN (
+            SELECT dimension, key FROM ({removed}) AS removed
+        );
+        """
+    return statements
+
+
+def _postgres_triggers(table: str, columns: Dict[StatsDimension, str]) -> List[str]:
+    # Une table de transition n'est permise que sur un trigger à un seul
+    # événement, sans liste de colonnes : trois triggers par table
+    events = {
+        "INSERT": ("REFERENCING NEW TABLE AS new_rows", ["new_rows"]),
+        "DELETE": ("REFERENCING OLD TABLE AS old_rows", ["old_rows"]),
+        "UPDATE": (
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+            ["new_rows", "old_rows"],
+        ),
+    }
+    branches = "\n            ELS".join(
+        f"IF TG_OP = '{event}' THEN {_postgres_apply(columns, tables)}"
+        for event, (_, tables) in events.items()
+    )
+    function = f"""
+        CREATE OR REPLACE FUNCTION {STATS_TABLE}_{table}() RETURNS trigger AS $$
+        BEGIN
+            {branches}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """
+    triggers = [f"""
+        CREATE TRIGGER {STATS_TABLE}_{table}_{event.lower()}
+        AFTER {event} ON {table} {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {STATS_TABLE}_{table}()
+        """ for event, (referencing, _) in events.items()]
+    return [function, *triggers]
+
+
+SQLITE_DDL = [
+    *_sqlite_triggers("fiche", FICHE_COLUMNS),
+    *_sqlite_triggers("work_planned", WORK_COLUMNS),
+]
+
+# Schéma neuf uniquement : une base existante reçoit ces triggers par les
+# migrations 008 et 013
+POSTGRES_DDL = [
+    *_postgres_triggers("fiche", FICHE_COLUMNS),
+    *_postgres_triggers("work_planned", WORK_COLUMNS),
+]
+
+
+def _rebuild_sql() -> List[str]:
+    """Recalcul complet des compteurs depuis les tables (migration, réparation)."""
+    keys = " UNION ALL ".join(
+        f"SELECT '{dimension}' AS dimension, {key} AS key FROM {table}"
+        for table, columns in (("fiche", FICHE_COLUMNS), ("work_planned", WORK_COLUMNS))
+        for dimension, key in _keys(table, columns)
+    )
+    return [
+        f"DELETE FROM {STATS_TABLE}",
+        f"""
+        INSERT INTO {STATS_TABLE} (dimension, key, count)
+        SELECT dimension, key, COUNT(*) FROM ({keys}) AS keys
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        """,
+    ]
+
+
+REBUILD_SQL = _rebuild_sql()
+
+
+def install_stats_triggers(metadata: MetaData) -> None:
+    """Crée les triggers des compteurs avec le schéma (après les tables).
+
+    SQLite : à chaque `create_all` (IF NOT EXISTS, sans verrou sur une base
+    existante). PostgreSQL : à la création de la table `fiche` seulement,
+    voir schema_ddl.
+    """
+    for statement in SQLITE_DDL:
+        event.listen(
+            metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+        )
+    create_with_table(metadata, "fiche", "postgresql", POSTGRES_DDL)
+
+
+def rebuild_stats(session: Session) -> None:
+    for statement in REBUILD_SQL:
+        session.execute(text(statement))
+
+
+if __name__ == "__main__":
+    # Recalcul complet, après la migration d'une base existante
+    from infrastructure.database.connexion import session_scope
+
+    with session_scope() as session:
+        rebuild_stats(session)
+        session.commit()
+        print("Compteurs de fiches recalculés", file=sys.stderr)
@@ -0,0 +1,62 @@
+"""
+Hooks SQLAlchemy alimentant les métriques (infrastructure.metrics).
+
+- durée de chaque requête SQL : événements before/after_cursor_execute ;
+- attente d'une connexion du pool : le pool n'a pas d'événement « avant
+  checkout », on chronomètre donc `pool.connect()` (attente dans la file,
+  ouverture éventuelle et pre-ping compris). Le pool étant remplacé par
+  `Engine.dispose()`, il est de nouveau instrumenté à ce moment-là.
+"""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from infrastructure.metrics import observe_pool_checkout, observe_query
+
+_QUERY_START = "metrics_query_start"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault(_QUERY_START, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    observe_query(time.perf_counter() - conn.info[_QUERY_START].pop())
+
+
+def _handle_error(context) -> None:
+    starts = context.connection.info.get(_QUERY_START) if context.connection else None
+    if starts:
+        observe_query(time.perf_counter() - starts.pop())
+
+
+def _time_checkout(pool: Pool) -> None:
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            observe_pool_checkout(time.perf_counter() - start)
+
+    pool.connect = timed_connect  # type: ignore[method-assign]
+
+
+def _on_dispose(engine: Engine) -> None:
+    _time_checkout(engine.pool)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Branche les métriques sur un engine synchrone (ou `sync_engine`)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(engine, "engine_disposed", _on_dispose)
+    _time_checkout(engine.pool)
+    return engine
@@ -0,0 +1,32 @@
+from typing import Any, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Compte les requêtes SQL émises par un engine dans un bloc `with`.
+
+    Exemple :
+        with QueryCounter(engine) as counter:
+            repository.get_all()
+        assert counter.count == 2
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
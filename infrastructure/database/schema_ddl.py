@@ -0,0 +1,39 @@
+"""
+DDL hors ORM (extensions, tables annexes, fonctions, triggers) émis avec le
+schéma.
+
+`after_create` sur MetaData est émis à chaque `create_all`, donc à chaque
+démarrage d'un worker (voir fiche_model). Sous PostgreSQL, rejouer ces DDL
+sur une base en service prendrait des verrous ACCESS EXCLUSIVE sur `fiche`
+et `work_planned` (DROP / CREATE TRIGGER) pour refaire le travail des
+migrations : ils ne sont joués que lorsque `create_all` crée la table
+d'ancrage, c'est-à-dire sur un schéma neuf (tests, benchmarks, nouvelle
+installation). Une base existante les reçoit par les migrations numérotées.
+"""
+
+from typing import Any, Iterable, List
+
+from sqlalchemy import DDL, MetaData, Table, event
+from sqlalchemy.engine import Connection
+
+
+def create_with_table(
+    metadata: MetaData, table: str, dialect: str, statements: List[str]
+) -> None:
+    """Exécute `statements` (sous `dialect`) après le `create_all` qui crée
+    la table `table`, et seulement celui-là."""
+
+    def create(
+        target: MetaData,
+        connection: Connection,
+        tables: Iterable[Table] = (),
+        **kw: Any,
+    ) -> None:
+        if connection.dialect.name != dialect:
+            return
+        if table not in {created.name for created in tables}:
+            return
+        for statement in statements:
+            connection.execute(DDL(statement))
+
+    event.listen(metadata, "after_create", create)
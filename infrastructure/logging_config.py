@@ -4,6 +4,20 @@ import sys
 
 from pythonjsonlogger import jsonlogger
 
+from infrastructure.metrics import current_request
+
+
+class RequestMetricsFilter(logging.Filter):
+    """Ajoute les temps de la requête HTTP courante (base, validation, rendu)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        metrics = current_request()
+        if metrics is not None:
+            for name, value in metrics.log_fields().items():
+                if not hasattr(record, name):
+                    setattr(record, name, value)
+        return True
+
 
 def setup_logging():
     """Configure le logging structuré pour l'application."""
@@ -35,6 +49,7 @@ def setup_logging():
         )
 
     handler.setFormatter(formatter)
+    handler.addFilter(RequestMetricsFilter())
     logger.addHandler(handler)
 
     # Désactiver les logs trop verbeux de certaines bibliothèques
@@ -0,0 +1,297 @@
+"""
+Métriques de performance, exposées au format texte Prometheus sur /metrics.
+
+Compteurs, jauges et histogrammes sont tenus en mémoire par processus
+(un worker uvicorn = une série) ; pas de dépendance à prometheus_client.
+
+Chaque requête HTTP porte aussi un `RequestMetrics` (ContextVar) que les
+hooks SQLAlchemy, la validation des schémas et le rendu JSON alimentent :
+ses valeurs sont ajoutées aux lignes de log de la requête, ce qui permet de
+voir si une requête lente l'est en base, en validation ou en sérialisation.
+"""
+
+import math
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bornes des histogrammes, en secondes sauf COUNT_BUCKETS
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Labels attendus pour {self.name}: {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, **extra: str) -> str:
+        pairs = [*zip(self.labelnames, key), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._labels(key)} {_number(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Par série : effectifs par intervalle (non cumulés), somme
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * len(self.buckets), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def sum(self, **labels: str) -> float:
+        series = self._series.get(self._key(labels))
+        return series[1][0] if series else 0.0
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted(
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._series.items()
+            )
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = self._labels(key, le=_number(bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._labels(key)} {_number(total)}"
+            yield f"{self.name}_count{self._labels(key)} {cumulative}"
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrique déjà enregistrée : {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Durée des requêtes HTTP, corps de réponse compris.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement."
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "db_queries_per_request",
+    "Requêtes SQL émises par requête HTTP.",
+    ("method", "route"),
+    buckets=COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = REGISTRY.histogram(
+    "db_time_per_request_seconds",
+    "Temps passé en requêtes SQL par requête HTTP.",
+    ("method", "route"),
+)
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds", "Durée des requêtes SQL.", buckets=QUERY_BUCKETS
+)
+DB_POOL_CHECKOUT = REGISTRY.histogram(
+    "db_pool_checkout_seconds",
+    "Attente d'une connexion du pool (ping compris).",
+    buckets=QUERY_BUCKETS,
+)
+SCHEMA_VALIDATION_DURATION = REGISTRY.histogram(
+    "schema_validation_duration_seconds",
+    "Validation JSON Schema des détails d'un travail.",
+    ("work",),
+    buckets=QUERY_BUCKETS,
+)
+RESPONSE_SERIALIZATION_DURATION = REGISTRY.histogram(
+    "response_serialization_seconds",
+    "Encodage JSON des réponses.",
+    buckets=QUERY_BUCKETS,
+)
+GROUP_COMMIT_BATCH_SIZE = REGISTRY.histogram(
+    "group_commit_batch_size",
+    "Fiches écrites par transaction du group commit.",
+    buckets=(*COUNT_BUCKETS, 200, 500),
+)
+GROUP_COMMIT_DURATION = REGISTRY.histogram(
+    "group_commit_duration_seconds",
+    "Écriture et COMMIT d'un lot du group commit.",
+    buckets=QUERY_BUCKETS,
+)
+
+
+@dataclass
+class RequestMetrics:
+    """Temps cumulés d'une requête HTTP, en secondes."""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    validation_time: float = 0.0
+    serialization_time: float = 0.0
+
+    def log_fields(self) -> Dict[str, float]:
+        """Champs des lignes de log (pas de nom réservé de LogRecord)."""
+        return {
+            "db_queries": self.db_queries,
+            "db_time_ms": _ms(self.db_time),
+            "db_pool_wait_ms": _ms(self.pool_wait),
+            "validation_ms": _ms(self.validation_time),
+            "serialization_ms": _ms(self.serialization_time),
+        }
+
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def start_request() -> RequestMetrics:
+    """Attache un nouveau RequestMetrics au contexte de la requête courante."""
+    metrics = RequestMetrics()
+    _request_metrics.set(metrics)
+    return metrics
+
+
+def current_request() -> Optional[RequestMetrics]:
+    return _request_metrics.get()
+
+
+def observe_query(seconds: float) -> None:
+    DB_QUERY_DURATION.observe(seconds)
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.db_queries += 1
+        metrics.db_time += seconds
+
+
+def observe_pool_checkout(seconds: float) -> None:
+    DB_POOL_CHECKOUT.observe(seconds)
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.pool_wait += seconds
+
+
+def observe_schema_validation(work: str, seconds: float) -> None:
+    SCHEMA_VALIDATION_DURATION.observe(seconds, work=work)
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.validation_time += seconds
+
+
+def observe_serialization(seconds: float) -> None:
+    RESPONSE_SERIALIZATION_DURATION.observe(seconds)
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.serialization_time += seconds
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
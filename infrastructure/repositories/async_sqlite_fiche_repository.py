@@ -0,0 +1,100 @@
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from contact_fiche.entities.fiche_entity import BulkItemResult, Fiche, FichePage
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import StatsDimension, Status
+from contact_fiche.fiche_filter import FicheFilter
+from contact_fiche.fiche_repository_protocol import FicheRepository
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+
+
+class AsyncSQLiteFicheRepository:
+    """Implémentation asynchrone de FicheRepository sur une AsyncSession.
+
+    Chaque appel exécute la méthode de SQLiteFicheRepository via
+    `AsyncSession.run_sync` : les requêtes passent par le pilote asynchrone
+    (asyncpg, aiosqlite) sans bloquer la boucle d'événements, et la logique
+    SQL reste écrite une seule fois. `decorate` permet d'empiler des
+    repositories synchrones (cache, ...) autour de SQLiteFicheRepository.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        decorate: Optional[Callable[[FicheRepository], FicheRepository]] = None,
+    ) -> None:
+        self.session = session
+        self.decorate = decorate
+
+    async def run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        def call(sync_session: Session) -> Any:
+            repository: FicheRepository = SQLiteFicheRepository(session=sync_session)
+            if self.decorate is not None:
+                repository = self.decorate(repository)
+            return getattr(repository, method)(*args, **kwargs)
+
+        return await self.session.run_sync(call)
+
+    async def get_by_id(self, id: str) -> Optional[Fiche]:
+        return await self.run("get_by_id", id)
+
+    async def get_for_update(self, id: str) -> Optional[Fiche]:
+        return await self.run("get_for_update", id)
+
+    async def save(self, fiche: Fiche) -> None:
+        await self.run("save", fiche)
+
+    async def update(self, id: str, fiche: Fiche) -> None:
+        await self.run("update", id, fiche)
+
+    async def delete(self, id: str) -> None:
+        await self.run("delete", id)
+
+    async def list_page(
+        self, limit: int, cursor: Optional[str] = None, status: Optional[Status] = None
+    ) -> FichePage:
+        return await self.run("list_page", limit, cursor=cursor, status=status)
+
+    async def find(
+        self, filters: FicheFilter, limit: int, cursor: Optional[str] = None
+    ) -> FichePage:
+        return await self.run("find", filters, limit=limit, cursor=cursor)
+
+    async def agenda(
+        self, date_from: date, date_to: date, limit: int, cursor: Optional[str] = None
+    ) -> FichePage:
+        return await self.run("agenda", date_from, date_to, limit=limit, cursor=cursor)
+
+    async def search(self, query: str, limit: int) -> List[Fiche]:
+        return await self.run("search", query, limit)
+
+    async def stats(
+        self, dimension: Optional[StatsDimension] = None
+    ) -> Dict[str, Dict[str, int]]:
+        return await self.run("stats", dimension)
+
+    async def save_many(
+        self, fiches: List[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> List[BulkItemResult]:
+        return await self.run("save_many", fiches, chunk_size=chunk_size, upsert=upsert)
+
+    async def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Optional[Sequence[Status]] = None,
+        expected_version: Optional[int] = None,
+        works_planned: Optional[List[WorksPlanned]] = None,
+    ) -> Fiche:
+        return await self.run(
+            "transition_status",
+            id,
+            status,
+            from_statuses=from_statuses,
+            expected_version=expected_version,
+            works_planned=works_planned,
+        )
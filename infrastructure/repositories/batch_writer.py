@@ -0,0 +1,295 @@
+"""
+Group commit des créations de fiches (rafales de POST /fiche en salon).
+
+Les créations concurrentes sont mises en file et écrites par un écrivain
+unique, par lots : un lot part dès qu'il atteint GROUP_COMMIT_MAX_BATCH
+fiches, ou GROUP_COMMIT_MAX_DELAY_MS après l'arrivée de sa première fiche.
+L'écrivain est une tâche de la boucle d'événements côté API
+(AsyncSessionBatchWriter), un thread dédié côté synchrone (BatchWriter).
+Chaque lot est une seule transaction (INSERT multi-lignes, un seul COMMIT,
+donc une seule synchronisation disque), au lieu d'une par fiche.
+
+L'appelant attend le COMMIT de son lot avant de répondre : la garantie de
+durabilité est celle d'un `save` classique. Si le lot échoue (id en
+double, ...), ses fiches sont réécrites une par une pour que seules les
+fiches fautives reçoivent une erreur.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.fiche_repository_protocol import (
+    AsyncFicheRepository,
+    FicheRepository,
+)
+from infrastructure.metrics import GROUP_COMMIT_BATCH_SIZE, GROUP_COMMIT_DURATION
+
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "false").lower() in (
+    "1",
+    "true",
+)
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "200"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", "2"))
+
+logger = logging.getLogger(__name__)
+
+Pending = Tuple[Fiche, Union["Future[None]", "asyncio.Future[None]"]]
+# Marqueur de fin de file, déposé par close()
+_STOP = object()
+
+
+def _write_batch(
+    repository_factory: Callable[[Session], FicheRepository], pending: List[Pending]
+) -> Callable[[Session], None]:
+    """Écriture d'un lot sur une session, qui résout les futures de ses fiches."""
+
+    def write(session: Session) -> None:
+        repository = repository_factory(session)
+        fiches = [fiche for fiche, _ in pending]
+        results = repository.save_many(fiches, chunk_size=len(fiches))
+        if all(result.status == "created" for result in results):
+            for _, future in pending:
+                _resolve(future)
+        else:
+            _save_one_by_one(repository, pending)
+
+    return write
+
+
+def _save_one_by_one(repository: FicheRepository, pending: List[Pending]) -> None:
+    for fiche, future in pending:
+        try:
+            repository.save(fiche)
+        except Exception as e:
+            _resolve(future, e)
+        else:
+            _resolve(future)
+
+
+def _resolve(
+    future: Union["Future[None]", "asyncio.Future[None]"],
+    error: Optional[BaseException] = None,
+) -> None:
+    # Une future asyncio peut être annulée pendant l'écriture (requête
+    # abandonnée) : la fiche est écrite, plus personne n'attend le résultat
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class BatchWriter:
+    """Écrit les fiches soumises par lots, depuis un thread dédié.
+
+    Pour les appelants synchrones ; côté asyncio, voir AsyncSessionBatchWriter.
+    `submit` retourne un Future résolu après le COMMIT du lot de la fiche.
+    `repository_factory` construit le repository (éventuellement décoré :
+    cache, ...) sur la session ouverte pour chaque lot par `session_factory`
+    (context manager de Session).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        repository_factory: Callable[[Session], FicheRepository],
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        max_delay: float = GROUP_COMMIT_MAX_DELAY_MS / 1000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, fiche: Fiche) -> "Future[None]":
+        future: "Future[None]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchWriter fermé")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="fiche-batch-writer", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((fiche, future))
+        return future
+
+    def save(self, fiche: Fiche) -> None:
+        """Version bloquante de `submit`, pour les use cases synchrones."""
+        self.submit(fiche).result()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Écrit les fiches déjà soumises puis arrête le thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[Pending] = [first]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+    def _flush(self, batch: List[Pending]) -> None:
+        # Un appelant parti (requête annulée) avant l'écriture est ignoré
+        pending = [
+            (fiche, future)
+            for fiche, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not pending:
+            return
+
+        start = time.perf_counter()
+        try:
+            with self.session_factory() as session:
+                _write_batch(self.repository_factory, pending)(session)
+        except Exception as e:
+            logger.exception("Group commit failed")
+            for _, future in pending:
+                _resolve(future, e)
+        finally:
+            GROUP_COMMIT_BATCH_SIZE.observe(len(pending))
+            GROUP_COMMIT_DURATION.observe(time.perf_counter() - start)
+
+
+class AsyncSessionBatchWriter:
+    """Écrit les fiches soumises par lots, depuis une tâche de la boucle
+    d'événements.
+
+    Une tâche unique vide une asyncio.Queue et écrit chaque lot par
+    `AsyncSession.run_sync` : les créations groupées utilisent l'engine
+    d'écriture asynchrone, comme les autres écritures de l'API, et un
+    processus n'a qu'une connexion en écriture sur une base SQLite.
+    À utiliser depuis une seule boucle, celle de l'application.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        repository_factory: Callable[[Session], FicheRepository],
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        max_delay: float = GROUP_COMMIT_MAX_DELAY_MS / 1000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._task: "Optional[asyncio.Task[None]]" = None
+        self._closed = False
+
+    def submit(self, fiche: Fiche) -> "asyncio.Future[None]":
+        if self._closed:
+            raise RuntimeError("BatchWriter fermé")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="fiche-batch-writer")
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((fiche, future))
+        return future
+
+    async def save(self, fiche: Fiche) -> None:
+        """Attend le COMMIT du lot de la fiche."""
+        await self.submit(fiche)
+
+    async def close(self) -> None:
+        """Écrit les fiches déjà soumises puis arrête la tâche."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._queue.put_nowait(_STOP)
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch: List[Pending] = [first]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = await asyncio.wait_for(
+                        self._queue.get(), max(deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Pending]) -> None:
+        # Un appelant parti (requête annulée) avant l'écriture est ignoré
+        pending = [(fiche, future) for fiche, future in batch if not future.done()]
+        if not pending:
+            return
+
+        start = time.perf_counter()
+        try:
+            async with self.session_factory() as session:
+                await session.run_sync(_write_batch(self.repository_factory, pending))
+        except Exception as e:
+            logger.exception("Group commit failed")
+            for _, future in pending:
+                _resolve(future, e)
+        finally:
+            GROUP_COMMIT_BATCH_SIZE.observe(len(pending))
+            GROUP_COMMIT_DURATION.observe(time.perf_counter() - start)
+
+
+class GroupCommitFicheRepository:
+    """AsyncFicheRepository dont les créations passent par un
+    AsyncSessionBatchWriter.
+
+    Les autres méthodes sont déléguées au repository décoré.
+    """
+
+    def __init__(
+        self, repository: AsyncFicheRepository, writer: AsyncSessionBatchWriter
+    ) -> None:
+        self.repository = repository
+        self.writer = writer
+
+    async def save(self, fiche: Fiche) -> None:
+        await self.writer.save(fiche)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.repository, name)
@@ -0,0 +1,91 @@
+from typing import Any, List, Optional, Sequence
+
+from contact_fiche.entities.fiche_entity import BulkItemResult, Fiche
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import Status
+from contact_fiche.fiche_repository_protocol import FicheRepository
+from infrastructure.cache.read_through_cache import ReadThroughCache
+
+
+class CachedFicheRepository:
+    """Repository qui met en cache `get_by_id` devant un autre repository.
+
+    Toute écriture invalide l'entrée de la fiche concernée : chaque nouvelle
+    méthode d'écriture du repository décoré doit être déclarée ici.
+    Les fiches sont copiées à l'entrée et à la sortie du cache, car les use
+    cases modifient les entités qu'ils lisent.
+    Le cache est local au processus : entre plusieurs workers, le TTL borne
+    la durée pendant laquelle une lecture peut être périmée. Une lecture qui
+    précède une écriture (`get_for_update`) va donc toujours au repository
+    décoré : une version périmée ferait échouer le contrôle de version de
+    `update` (409 sans `expected_version`), et des champs périmés écraseraient
+    l'écriture d'un autre worker.
+    """
+
+    def __init__(self, repository: FicheRepository, cache: ReadThroughCache) -> None:
+        self.repository = repository
+        self.cache = cache
+
+    def get_by_id(self, id: str) -> Optional[Fiche]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached.model_copy(deep=True)
+
+        generation = self.cache.generation()
+        fiche = self.repository.get_by_id(id)
+        if fiche is not None:
+            self.cache.put(id, fiche.model_copy(deep=True), generation)
+        return fiche
+
+    def get_for_update(self, id: str) -> Optional[Fiche]:
+        return self.repository.get_for_update(id)
+
+    def save(self, fiche: Fiche) -> None:
+        self.cache.invalidate(fiche.id)
+        self.repository.save(fiche)
+
+    def update(self, id: str, fiche: Fiche) -> None:
+        try:
+            self.repository.update(id, fiche)
+        finally:
+            self.cache.invalidate(id)
+
+    def delete(self, id: str) -> None:
+        try:
+            self.repository.delete(id)
+        finally:
+            self.cache.invalidate(id)
+
+    def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Optional[Sequence[Status]] = None,
+        expected_version: Optional[int] = None,
+        works_planned: Optional[List[WorksPlanned]] = None,
+    ) -> Fiche:
+        try:
+            return self.repository.transition_status(
+                id,
+                status,
+                from_statuses=from_statuses,
+                expected_version=expected_version,
+                works_planned=works_planned,
+            )
+        finally:
+            self.cache.invalidate(id)
+
+    def save_many(
+        self, fiches: List[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> List[BulkItemResult]:
+        results = self.repository.save_many(
+            fiches, chunk_size=chunk_size, upsert=upsert
+        )
+        for result in results:
+            if result.id is not None:
+                self.cache.invalidate(result.id)
+        return results
+
+    def __getattr__(self, name: str) -> Any:
+        # Lectures non mises en cache (listes, export, ...) : délégation directe
+        return getattr(self.repository, name)
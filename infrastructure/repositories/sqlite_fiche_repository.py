@@ -1,75 +1,324 @@
-from typing import List, Optional
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set
 
+from sqlalchemy import (
+    JSON,
+    ColumnElement,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
-from contact_fiche.entities.fiche_entity import Fiche
-from contact_fiche.enums import Status
+from contact_fiche.entities.fiche_entity import BulkItemResult, Fiche, FichePage
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import OriginContact, StatsDimension, Status
+from contact_fiche.exceptions import FicheConflictError
+from contact_fiche.fiche_filter import FicheFilter, name_key
+from contact_fiche.pagination import (
+    decode_agenda_cursor,
+    decode_cursor,
+    encode_agenda_cursor,
+    encode_cursor,
+)
+from contact_fiche.search_text import SEARCHABLE_FIELDS
 from infrastructure.database.fiche_converter import FicheConverter
-from infrastructure.database.fiche_model import FicheModel, WorkPlannedModel
+from infrastructure.database.fiche_model import (
+    FicheModel,
+    FicheStatsModel,
+    WorkPlannedModel,
+    utcnow,
+)
+from infrastructure.database.fiche_search import get_search_index
+from infrastructure.database.query_counter import QueryCounter
+
+LAST_READ_KEY = "fiche_repository.last_read"
+
+STATS_ENUMS = {
+    StatsDimension.STATUS.value: Status,
+    StatsDimension.ORIGIN_CONTACT.value: OriginContact,
+}
 
 
 class SQLiteFicheRepository:
     def __init__(self, session: Session) -> None:
         self.session = session
+        # Index plein texte tenu à jour dans la transaction de chaque écriture
+        self.dialect_name = session.get_bind().dialect.name
+        self.search_index = get_search_index(self.dialect_name)
+
+    def _query(self):
+        # Les travaux sont chargés en une seule requête IN (...) par lot de
+        # fiches, au lieu d'un SELECT paresseux par fiche (N+1).
+        return self.session.query(FicheModel).options(
+            selectinload(FicheModel.work_planned)
+        )
+
+    def count_statements(self) -> QueryCounter:
+        """Compteur des requêtes SQL émises via la session de ce repository."""
+        return QueryCounter(self.session.get_bind())
 
     def get_by_id(self, id: str) -> Optional[Fiche]:
-        fiche_model = self.session.query(FicheModel).filter(FicheModel.id == id).first()
+        fiche_model = self._query().filter(FicheModel.id == id).first()
+        # L'identity map ne garde que des références faibles : on retient la
+        # dernière fiche lue pour que l'update qui suit la retrouve sans SELECT.
+        self.session.info[LAST_READ_KEY] = fiche_model
         return FicheConverter.model_to_entity(fiche_model) if fiche_model else None
 
+    def get_for_update(self, id: str) -> Optional[Fiche]:
+        return self.get_by_id(id)
+
     def save(self, fiche: Fiche) -> None:
         try:
             fiche_model = FicheConverter.entity_to_model(fiche)
             self.session.add(fiche_model)
+            self.session.flush()
+            self.search_index.index(self.session, [fiche], new=True)
             self.session.commit()
         except SQLAlchemyError as e:
             self.session.rollback()
             raise RuntimeError(f"Erreur lors de la sauvegarde de la fiche: {str(e)}")
 
+    def save_many(
+        self, fiches: List[Fiche], chunk_size: int = 500, upsert: bool = False
+    ) -> List[BulkItemResult]:
+        """Insère (ou met à jour si `upsert`) les fiches par lots.
+
+        Chaque lot de `chunk_size` fiches est écrit dans sa propre transaction
+        avec des INSERT/UPDATE multi-lignes ; l'échec d'un lot n'annule pas
+        les lots déjà validés. En mode upsert, une fiche dont la clé métier
+        (Fiche.natural_key) existe déjà met à jour la fiche existante.
+        """
+        results: List[BulkItemResult] = []
+        for start in range(0, len(fiches), chunk_size):
+            chunk = fiches[start : start + chunk_size]
+            try:
+                results.extend(self._save_chunk(chunk, start, upsert))
+                self.session.commit()
+            except SQLAlchemyError as e:
+                self.session.rollback()
+                results.extend(
+                    BulkItemResult(index=start + offset, status="error", error=str(e))
+                    for offset in range(len(chunk))
+                )
+        return results
+
+    def _save_chunk(
+        self, chunk: List[Fiche], start: int, upsert: bool
+    ) -> List[BulkItemResult]:
+        existing_ids = self._ids_by_natural_key(chunk) if upsert else {}
+        # Une clé métier répétée dans le lot désigne la même fiche : une seule
+        # ligne par fiche, la dernière occurrence l'emporte (comme une suite
+        # d'upserts unitaires), y compris une seule ligne FTS5 par rowid
+        inserts: Dict[str, Dict[str, Any]] = {}
+        updates: Dict[str, Dict[str, Any]] = {}
+        works: Dict[str, List[WorksPlanned]] = {}
+        indexed: Dict[str, Fiche] = {}
+        results = []
+        for offset, fiche in enumerate(chunk):
+            row = FicheConverter.entity_to_row(fiche)
+            existing_id = existing_ids.get(fiche.natural_key())
+            if existing_id is None:
+                fiche_id = fiche.id
+                inserts[fiche_id] = row
+                if upsert:
+                    existing_ids[fiche.natural_key()] = fiche_id
+                status = "created"
+            else:
+                # La fiche existante garde son id et son statut
+                fiche_id = existing_id
+                if fiche_id in inserts:
+                    # Fiche créée plus haut dans le même lot
+                    created = inserts[fiche_id]
+                    inserts[fiche_id] = {
+                        **row,
+                        "id": fiche_id,
+                        "status": created["status"],
+                    }
+                else:
+                    del row["id"], row["status"]
+                    updates[fiche_id] = {**row, "existing_id": fiche_id}
+                status = "updated"
+            # Sans travaux, une occurrence garde ceux des précédentes
+            if fiche.works_planned:
+                works[fiche_id] = fiche.works_planned
+            indexed[fiche_id] = fiche.model_copy(update={"id": fiche_id})
+            results.append(
+                BulkItemResult(index=start + offset, status=status, id=fiche_id)
+            )
+        replaced_ids = [fiche_id for fiche_id in works if fiche_id in updates]
+        work_rows = [
+            {"fiche_id": fiche_id, "work": wp.work, "details": wp.details}
+            for fiche_id, planned in works.items()
+            for wp in planned
+        ]
+
+        if inserts:
+            self.session.execute(insert(FicheModel), list(inserts.values()))
+        if updates:
+            # UPDATE groupé au niveau table : la version est incrémentée en
+            # SQL, sans connaître la version courante de chaque ligne
+            table = FicheModel.__table__
+            self.session.execute(
+                update(table)
+                .where(table.c.id == bindparam("existing_id"))
+                .values(version=table.c.version + 1),
+                list(updates.values()),
+            )
+        if replaced_ids:
+            self.session.execute(
+                delete(WorkPlannedModel).where(
+                    WorkPlannedModel.fiche_id.in_(replaced_ids)
+                )
+            )
+        if work_rows:
+            self.session.execute(insert(WorkPlannedModel), work_rows)
+        self.search_index.index(self.session, list(indexed.values()), new=not upsert)
+        return results
+
+    def _ids_by_natural_key(self, chunk: List[Fiche]) -> Dict[tuple, str]:
+        keys = {fiche.natural_key() for fiche in chunk}
+        rows = self.session.execute(
+            select(
+                FicheModel.lastname,
+                FicheModel.firstname,
+                FicheModel.telephone,
+                FicheModel.id,
+            ).where(
+                tuple_(
+                    FicheModel.lastname, FicheModel.firstname, FicheModel.telephone
+                ).in_(keys)
+            )
+        )
+        return {(lastname, firstname, tel): id for lastname, firstname, tel, id in rows}
+
     def update(self, id: str, fiche: Fiche) -> None:
+        """Écrit uniquement ce qui diffère de la fiche en base.
+
+        La fiche est prise dans l'identity map de la session quand le use case
+        vient de la lire (pas de second SELECT). Les colonnes inchangées ne
+        figurent pas dans l'UPDATE, et les travaux sont comparés un à un :
+        seules les lignes ajoutées, modifiées ou retirées sont écrites, en
+        une instruction groupée par type d'écriture.
+        """
         try:
-            # Récupérer la fiche existante
-            fiche_model = (
-                self.session.query(FicheModel).filter(FicheModel.id == id).first()
+            fiche_model = self.session.get(
+                FicheModel, id, options=[selectinload(FicheModel.work_planned)]
             )
             if not fiche_model:
                 raise ValueError(f"Fiche avec l'id {id} non trouvée")
+            if fiche_model.version != fiche.version:
+                raise FicheConflictError(
+                    f"Fiche {id} modifiée entre-temps (version {fiche_model.version})"
+                )
 
-            # Mettre à jour les champs simples
-            fiche_model.lastname = fiche.lastname
-            fiche_model.firstname = fiche.firstname
-            fiche_model.date_rdv = fiche.date_rdv
-            fiche_model.heure_rdv = fiche.heure_rdv
-            fiche_model.telephone = fiche.telephone
-            fiche_model.email = fiche.email
-            fiche_model.address = fiche.address
-            fiche_model.code_postal = fiche.code_postal
-            fiche_model.city = fiche.city
-            fiche_model.type_logement = fiche.type_logement
-            fiche_model.statut_habitation = fiche.statut_habitation
-            fiche_model.origin_contact = fiche.origin_contact
-            fiche_model.status = fiche.status
-            fiche_model.commentary = fiche.commentary
-
-            # Supprimer les anciens works_planned et ajouter les nouveaux
-            if fiche.works_planned:
-                # Supprimer les anciens
-                self.session.query(WorkPlannedModel).filter(
-                    WorkPlannedModel.fiche_id == id
-                ).delete()
-
-                # Ajouter les nouveaux
-                for wp in fiche.works_planned:
-                    wp_model = WorkPlannedModel(
-                        fiche_id=id, work=wp.work, details=wp.details
-                    )
-                    self.session.add(wp_model)
+            changed = self._apply_columns(fiche_model, fiche)
+            # Une liste vide laisse les travaux existants intacts
+            if fiche.works_planned and self._apply_works(
+                id,
+                [
+                    {"id": m.id, "work": m.work, "details": m.details}
+                    for m in fiche_model.work_planned
+                ],
+                fiche.works_planned,
+            ):
+                if not changed:
+                    # Travaux seuls : la fiche change quand même de version et
+                    # de date, sinon son ETag / Last-Modified resterait périmé
+                    fiche_model.updated_at = utcnow()
 
+            self.session.flush()
+            # La version écrite (inchangée si rien n'a changé) revient à l'appelant
+            fiche.version = fiche_model.version
+            fiche.updated_at = fiche_model.updated_at
+            if changed & SEARCHABLE_FIELDS:
+                self.search_index.index(
+                    self.session, [fiche.model_copy(update={"id": id})]
+                )
             self.session.commit()
+        except StaleDataError:
+            # La ligne a changé de version entre la lecture et l'UPDATE
+            self.session.rollback()
+            raise FicheConflictError(f"Fiche {id} modifiée entre-temps")
         except SQLAlchemyError as e:
             self.session.rollback()
             raise RuntimeError(f"Erreur lors de la mise à jour de la fiche: {str(e)}")
 
+    @staticmethod
+    def _apply_columns(fiche_model: FicheModel, fiche: Fiche) -> Set[str]:
+        """Affecte les colonnes qui changent et retourne leurs noms."""
+        changed = set()
+        for column, value in FicheConverter.entity_to_row(fiche).items():
+            if column != "id" and getattr(fiche_model, column) != value:
+                setattr(fiche_model, column, value)
+                changed.add(column)
+        return changed
+
+    def _apply_works(
+        self,
+        fiche_id: str,
+        current: List[Dict[str, Any]],
+        works: List[WorksPlanned],
+    ) -> bool:
+        """Rapproche les travaux en base (`current` : {"id", "work",
+        "details"}) de `works` ; vrai si l'un a changé.
+
+        Un travail identique (même type, mêmes détails) est conservé tel quel ;
+        un travail restant du même type voit ses détails mis à jour ; le reste
+        est supprimé ou inséré. Chaque type d'écriture est une seule
+        instruction groupée ; une collection chargée est ensuite périmée, le
+        commit qui suit l'expire.
+        """
+        current = list(current)
+        added = []
+        for wp in works:
+            same = next(
+                (
+                    m
+                    for m in current
+                    if m["work"] == wp.work and m["details"] == wp.details
+                ),
+                None,
+            )
+            if same is not None:
+                current.remove(same)
+            else:
+                added.append(wp)
+
+        inserts, updates = [], []
+        for wp in added:
+            reused = next((m for m in current if m["work"] == wp.work), None)
+            if reused is not None:
+                current.remove(reused)
+                updates.append({"id": reused["id"], "details": wp.details})
+            else:
+                inserts.append(
+                    {"fiche_id": fiche_id, "work": wp.work, "details": wp.details}
+                )
+
+        if current:
+            self.session.execute(
+                delete(WorkPlannedModel).where(
+                    WorkPlannedModel.id.in_([m["id"] for m in current])
+                )
+            )
+        if updates:
+            self.session.execute(update(WorkPlannedModel), updates)
+        if inserts:
+            self.session.execute(insert(WorkPlannedModel), inserts)
+        return bool(current or updates or inserts)
+
     def delete(self, id: str) -> None:
         try:
             fiche_model = (
@@ -78,34 +327,340 @@ class SQLiteFicheRepository:
             if not fiche_model:
                 raise ValueError(f"Fiche avec l'id {id} non trouvée")
 
+            self.search_index.remove(self.session, [id])
             self.session.delete(fiche_model)
             self.session.commit()
         except SQLAlchemyError as e:
             self.session.rollback()
             raise RuntimeError(f"Erreur lors de la suppression de la fiche: {str(e)}")
 
+    def search(self, query: str, limit: int) -> List[Fiche]:
+        """Fiches correspondant à `query`, de la plus à la moins pertinente."""
+        ids = self.search_index.search(self.session, query, limit)
+        if not ids:
+            return []
+        fiche_models = self._query().filter(FicheModel.id.in_(ids)).all()
+        by_id = {model.id: model for model in fiche_models}
+        return [FicheConverter.model_to_entity(by_id[id]) for id in ids if id in by_id]
+
+    def stats(
+        self, dimension: Optional[StatsDimension] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """Nombre de fiches par valeur de chaque axe (ou du seul `dimension`).
+
+        Lu dans la table `fiche_stats`, tenue à jour par triggers : le coût
+        dépend du nombre de valeurs distinctes, pas du nombre de fiches.
+        """
+        query = select(
+            FicheStatsModel.dimension, FicheStatsModel.key, FicheStatsModel.count
+        ).order_by(FicheStatsModel.dimension, FicheStatsModel.key)
+        dimensions = list(StatsDimension) if dimension is None else [dimension]
+        if dimension is not None:
+            query = query.where(FicheStatsModel.dimension == dimension.value)
+
+        counts: Dict[str, Dict[str, int]] = {d.value: {} for d in dimensions}
+        for row in self.session.execute(query):
+            # Statut et origine sont stockés sous le nom de l'Enum
+            enum = STATS_ENUMS.get(row.dimension)
+            key = enum[row.key].value if enum is not None else row.key
+            counts[row.dimension][key] = row.count
+        return counts
+
+    def rebuild_search_index(self, batch_size: int = 1000) -> int:
+        """Réindexe toutes les fiches, par lots ; retourne leur nombre."""
+        count = 0
+        cursor = None
+        while True:
+            page = self.list_page(limit=batch_size, cursor=cursor)
+            self.search_index.index(self.session, page.items)
+            self.session.commit()
+            count += len(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                return count
+
     def get_all(self) -> List[Fiche]:
-        fiche_models = self.session.query(FicheModel).all()
+        fiche_models = self._query().all()
         return [FicheConverter.model_to_entity(model) for model in fiche_models]
 
+    def iter_all(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Parcourt toutes les fiches via un curseur serveur, lot par lot.
+
+        Les lignes sont projetées en dicts (cf. FicheConverter.model_to_dict)
+        sans construire d'entité Pydantic : la mémoire reste bornée par
+        `batch_size` quelle que soit la taille de la table.
+        """
+        statement = (
+            select(FicheModel)
+            .options(selectinload(FicheModel.work_planned))
+            .order_by(FicheModel.date_rdv, FicheModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for fiche_model in self.session.scalars(statement):
+            yield FicheConverter.model_to_dict(fiche_model)
+
     def get_en_cours(self) -> List[Fiche]:
         fiche_models = (
-            self.session.query(FicheModel)
-            .filter(FicheModel.status == Status.IN_PROGRESS)
-            .all()
+            self._query().filter(FicheModel.status == Status.IN_PROGRESS).all()
         )
         return [FicheConverter.model_to_entity(model) for model in fiche_models]
 
-    def valider_fiche(self, id: str) -> None:
-        try:
-            fiche_model = (
-                self.session.query(FicheModel).filter(FicheModel.id == id).first()
+    def list_page(
+        self, limit: int, cursor: Optional[str] = None, status: Optional[Status] = None
+    ) -> FichePage:
+        return self.find(FicheFilter(status=status), limit=limit, cursor=cursor)
+
+    def find(
+        self, filters: FicheFilter, limit: int, cursor: Optional[str] = None
+    ) -> FichePage:
+        """Page de fiches répondant à `filters`, en une seule requête indexée."""
+        query = self._query().filter(*_filter_clauses(filters, self.dialect_name))
+        if cursor is not None:
+            # Keyset : on reprend strictement après le dernier (date_rdv, id) vu
+            date_rdv, id = decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    FicheModel.date_rdv > date_rdv,
+                    and_(FicheModel.date_rdv == date_rdv, FicheModel.id > id),
+                )
             )
-            if not fiche_model:
-                raise ValueError(f"Fiche avec l'id {id} non trouvée")
+        # Une ligne de plus que demandé pour savoir s'il existe une page suivante
+        fiche_models = (
+            query.order_by(FicheModel.date_rdv, FicheModel.id).limit(limit + 1).all()
+        )
+
+        items = [
+            FicheConverter.model_to_entity(model) for model in fiche_models[:limit]
+        ]
+        next_cursor = None
+        if len(fiche_models) > limit:
+            next_cursor = encode_cursor(items[-1].date_rdv, items[-1].id)
+        return FichePage(items=items, next_cursor=next_cursor)
+
+    def agenda(
+        self, date_from: date, date_to: date, limit: int, cursor: Optional[str] = None
+    ) -> FichePage:
+        """Rendez-vous de l'intervalle inclusif, dans l'ordre chronologique.
 
-            fiche_model.status = Status.COMPLETED
+        Un seul parcours de l'index (date_rdv, heure_rdv, id), borné par
+        l'intervalle et repris après la position du curseur.
+        """
+        position = tuple_(FicheModel.date_rdv, FicheModel.heure_rdv, FicheModel.id)
+        query = self._query().filter(FicheModel.date_rdv.between(date_from, date_to))
+        if cursor is not None:
+            query = query.filter(position > tuple_(*decode_agenda_cursor(cursor)))
+        fiche_models = (
+            query.order_by(FicheModel.date_rdv, FicheModel.heure_rdv, FicheModel.id)
+            .limit(limit + 1)
+            .all()
+        )
+
+        items = [
+            FicheConverter.model_to_entity(model) for model in fiche_models[:limit]
+        ]
+        next_cursor = None
+        if len(fiche_models) > limit:
+            last = items[-1]
+            next_cursor = encode_agenda_cursor(last.date_rdv, last.heure_rdv, last.id)
+        return FichePage(items=items, next_cursor=next_cursor)
+
+    def transition_status(
+        self,
+        id: str,
+        status: Status,
+        from_statuses: Optional[Sequence[Status]] = None,
+        expected_version: Optional[int] = None,
+        works_planned: Optional[List[WorksPlanned]] = None,
+    ) -> Fiche:
+        """Change le statut par un seul UPDATE conditionnel ... RETURNING.
+
+        La ligne n'est modifiée que si son statut fait partie de
+        `from_statuses` et, si elle est fournie, si sa version vaut
+        `expected_version` : deux validations concurrentes ne peuvent pas
+        réussir toutes les deux. Sinon FicheConflictError (ValueError si la
+        fiche n'existe pas). `works_planned` remplace les travaux dans la
+        même transaction. Les travaux en base reviennent dans le RETURNING
+        (document JSON) : une validation sans travaux est un seul aller-retour.
+        """
+        conditions = [FicheModel.id == id]
+        if from_statuses is not None:
+            conditions.append(FicheModel.status.in_(from_statuses))
+        if expected_version is not None:
+            conditions.append(FicheModel.version == expected_version)
+        try:
+            row = self.session.execute(
+                update(FicheModel)
+                .where(*conditions)
+                .values(status=status, version=FicheModel.version + 1)
+                .returning(FicheModel, self._works_document(id))
+                .execution_options(populate_existing=True, synchronize_session=False)
+            ).one_or_none()
+            if row is None:
+                self.session.rollback()
+                raise self._transition_error(id, status)
+
+            fiche_model, current = row
+            if works_planned:
+                self._apply_works(id, current, works_planned)
+                works = [
+                    {"work": wp.work, "details": wp.details} for wp in works_planned
+                ]
+            else:
+                works = [{"work": m["work"], "details": m["details"]} for m in current]
+            fiche = FicheConverter.model_to_entity(fiche_model, works)
             self.session.commit()
+            return fiche
         except SQLAlchemyError as e:
             self.session.rollback()
-            raise RuntimeError(f"Erreur lors de la validation de la fiche: {str(e)}")
+            raise RuntimeError(f"Erreur lors du changement de statut: {str(e)}")
+
+    def _works_document(self, id: str) -> ColumnElement[Any]:
+        """Travaux de la fiche `id` en un document JSON ([{"id", "work",
+        "details"}] dans l'ordre des id), joint au RETURNING d'un UPDATE."""
+        if self.dialect_name == "postgresql":
+            document: Any = func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id",
+                            WorkPlannedModel.id,
+                            "work",
+                            WorkPlannedModel.work,
+                            "details",
+                            WorkPlannedModel.details,
+                        ),
+                        WorkPlannedModel.id,
+                    )
+                ),
+                literal_column("'[]'::json"),
+            )
+            query = select(document).where(WorkPlannedModel.fiche_id == id)
+        else:
+            # SQLite < 3.44 : pas d'ORDER BY dans un agrégat, l'ordre vient
+            # de la sous-requête
+            works = (
+                select(
+                    WorkPlannedModel.id, WorkPlannedModel.work, WorkPlannedModel.details
+                )
+                .where(WorkPlannedModel.fiche_id == id)
+                .order_by(WorkPlannedModel.id)
+                .subquery()
+            )
+            query = select(
+                func.json_group_array(
+                    func.json_object(
+                        "id",
+                        works.c.id,
+                        "work",
+                        works.c.work,
+                        "details",
+                        func.json(works.c.details),
+                    )
+                )
+            )
+        return type_coerce(query.scalar_subquery(), JSON)
+
+    def _transition_error(self, id: str, status: Status) -> Exception:
+        # Chemin d'échec uniquement : distinguer fiche absente et conflit
+        current = self.session.execute(
+            select(FicheModel.status, FicheModel.version).where(FicheModel.id == id)
+        ).first()
+        if current is None:
+            return ValueError(f"Fiche avec l'id {id} non trouvée")
+        return FicheConflictError(
+            f"Fiche {id} : passage de {current.status.value} à {status.value} "
+            f"refusé (version {current.version})"
+        )
+
+
+def _prefix_range(expression: Any, prefix: str) -> ColumnElement[bool]:
+    """`expression` commence par `prefix`, écrit comme un intervalle.
+
+    `prefix <= expression < successeur(prefix)` est équivalent à
+    `LIKE 'prefix%'` (sans échappement de `%` / `_`) et utilisable par un
+    index B-tree, à condition que la collation ordonne par point de code :
+    BINARY sous SQLite, "C" sous PostgreSQL (colonnes NameKey). Le code
+    postal, fait de chiffres, est ordonné de la même façon par toute
+    collation.
+    """
+    upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(expression >= prefix, expression < upper_bound)
+
+
+def _filter_clauses(
+    filters: FicheFilter, dialect_name: str
+) -> List[ColumnElement[bool]]:
+    """Traduit un FicheFilter en conditions SQL (combinées par AND)."""
+    clauses: List[ColumnElement[bool]] = []
+    if filters.status is not None:
+        clauses.append(FicheModel.status == filters.status)
+    if filters.origin_contact is not None:
+        clauses.append(FicheModel.origin_contact == filters.origin_contact)
+    if filters.city:
+        clauses.append(FicheModel.city == filters.city)
+    if filters.code_postal_prefix:
+        clauses.append(
+            _prefix_range(FicheModel.code_postal, filters.code_postal_prefix)
+        )
+    if filters.date_rdv_from:
+        clauses.append(FicheModel.date_rdv >= filters.date_rdv_from)
+    if filters.date_rdv_to:
+        clauses.append(FicheModel.date_rdv <= filters.date_rdv_to)
+    # Les noms sont comparés sous leur forme name_key, stockée et indexée
+    if filters.lastname_prefix:
+        clauses.append(
+            _prefix_range(FicheModel.lastname_key, name_key(filters.lastname_prefix))
+        )
+    if filters.firstname_prefix:
+        clauses.append(
+            _prefix_range(FicheModel.firstname_key, name_key(filters.firstname_prefix))
+        )
+    if filters.filters_works:
+        # Sous-requête évaluée une fois, via les index de work_planned
+        clauses.append(
+            FicheModel.id.in_(
+                select(WorkPlannedModel.fiche_id).where(
+                    *_work_clauses(filters, dialect_name)
+                )
+            )
+        )
+    return clauses
+
+
+def _work_clauses(filters: FicheFilter, dialect_name: str) -> List[ColumnElement[bool]]:
+    """Conditions portant sur une même ligne de work_planned."""
+    clauses: List[ColumnElement[bool]] = []
+    if filters.work:
+        clauses.append(WorkPlannedModel.work == filters.work)
+    if filters.materiau:
+        clauses.append(WorkPlannedModel.materiau == filters.materiau)
+    if filters.color:
+        clauses.append(WorkPlannedModel.color == filters.color)
+    for path, value in filters.details.items():
+        keys = path.split(".")
+        if dialect_name == "postgresql":
+            # details @> {"a": {"b": valeur}} : servi par l'index GIN
+            document: Any = value
+            for key in reversed(keys):
+                document = {key: document}
+            clauses.append(
+                type_coerce(WorkPlannedModel.details, JSONB).contains(document)
+            )
+        else:
+            clauses.append(_json_equals(WorkPlannedModel.details, keys, value))
+    return clauses
+
+
+def _json_equals(document: Any, keys: List[str], value: Any) -> ColumnElement[bool]:
+    """`document` vaut `value` au chemin `keys`, types JSON compris (SQLite).
+
+    json_extract rend true / false comme 1 / 0 : les booléens sont comparés
+    par json_type pour ne pas confondre true et 1.
+    """
+    json_path = "$" + "".join(f'."{key}"' for key in keys)
+    if isinstance(value, bool):
+        return func.json_type(document, json_path) == ("true" if value else "false")
+    return and_(
+        func.json_type(document, json_path).not_in(("true", "false")),
+        func.json_extract(document, json_path) == value,
+    )
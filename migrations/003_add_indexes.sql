@@ -0,0 +1,18 @@
+-- Migration: Index secondaires pour les filtres et tris fréquents
+-- Date: 2026-10-18
+-- Description: Index alignés sur les requêtes chaudes de l'API
+--              - pagination keyset triée par (date_rdv, id) : /fiches
+--              - filtre statut + tri : /fiches/en-cours
+--              - SELECT DISTINCT city : /fiches/villes
+--              - jointure / suppression des travaux par fiche_id
+
+CREATE INDEX IF NOT EXISTS ix_fiche_date_rdv_id ON fiche (date_rdv, id);
+CREATE INDEX IF NOT EXISTS ix_fiche_status_date_rdv_id ON fiche (status, date_rdv, id);
+CREATE INDEX IF NOT EXISTS ix_fiche_city ON fiche (city);
+CREATE INDEX IF NOT EXISTS ix_work_planned_fiche_id ON work_planned (fiche_id);
+
+-- Mettre à jour les statistiques utilisées par le planificateur
+ANALYZE;
+
+-- Vérification: le plan doit mentionner ix_fiche_status_date_rdv_id
+-- EXPLAIN QUERY PLAN SELECT * FROM fiche WHERE status = 'IN_PROGRESS' ORDER BY date_rdv, id;
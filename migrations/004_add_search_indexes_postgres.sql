@@ -0,0 +1,17 @@
+-- Migration: Index pour la recherche côté serveur de GET /fiches
+-- Date: 2026-10-18
+-- Description: Les préfixes de nom / prénom sont comparés sur lower(...)
+--              (insensible à la casse) et le préfixe de code postal sur la
+--              colonne brute ; les deux sont compilés en intervalles
+--              (>= préfixe AND < successeur) utilisables par ces index.
+-- Database: PostgreSQL
+
+-- À exécuter hors transaction (CONCURRENTLY)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fiche_code_postal ON fiche (code_postal);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fiche_lower_lastname ON fiche (lower(lastname));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fiche_lower_firstname ON fiche (lower(firstname));
+
+ANALYZE fiche;
+
+-- Vérification: le plan doit mentionner ix_fiche_lower_lastname
+-- EXPLAIN SELECT * FROM fiche WHERE lower(lastname) >= 'mar' AND lower(lastname) < 'mas';
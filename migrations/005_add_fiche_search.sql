@@ -0,0 +1,22 @@
+-- Migration: Index de recherche plein texte (GET /fiches/search)
+-- Date: 2026-10-18
+-- Description: Table virtuelle FTS5 tenue à jour par SQLiteFicheRepository.
+--              Le texte est indexé normalisé (minuscules, sans accents,
+--              téléphone sans séparateurs).
+
+CREATE VIRTUAL TABLE IF NOT EXISTS fiche_search USING fts5(
+    fiche_id UNINDEXED,
+    names,
+    contact,
+    address,
+    commentary,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Backfill des fiches existantes : `python -m infrastructure.database.fiche_search`
+-- (chaque ligne a pour rowid une empreinte de fiche_id, calculée en Python,
+-- voir infrastructure/database/fiche_search.py:search_rowid)
+
+-- Vérification
+-- SELECT fiche_id FROM fiche_search WHERE fiche_search MATCH '"helene"*' ORDER BY rank LIMIT 5;
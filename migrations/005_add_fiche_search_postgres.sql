@@ -0,0 +1,25 @@
+-- Migration: Index de recherche plein texte (GET /fiches/search)
+-- Date: 2026-10-18
+-- Description: Table annexe tenue à jour par SQLiteFicheRepository :
+--              tsvector pondéré (nom > contact > adresse > commentaire)
+--              indexé en GIN, et texte brut indexé en trigrammes (pg_trgm)
+--              pour tolérer les fautes de frappe.
+-- Database: PostgreSQL
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS fiche_search (
+    fiche_id VARCHAR PRIMARY KEY REFERENCES fiche (id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    document TSVECTOR NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_fiche_search_document ON fiche_search USING GIN (document);
+CREATE INDEX IF NOT EXISTS ix_fiche_search_content_trgm ON fiche_search USING GIN (content gin_trgm_ops);
+
+-- Backfill : le texte est normalisé (accents, casse) côté Python, lancer
+-- depuis le conteneur de l'API :
+--   python -m infrastructure.database.fiche_search
+
+-- Vérification
+-- SELECT count(*) FROM fiche_search;
@@ -0,0 +1,11 @@
+-- Migration: Colonne version (verrou optimiste) sur fiche
+-- Date: 2026-10-18
+-- Description: Incrémentée à chaque UPDATE de la fiche. Les transitions de
+--              statut (valider, compléter) et les mises à jour sont
+--              conditionnées à la version lue : une écriture concurrente
+--              répond 409 au lieu d'écraser l'autre.
+
+ALTER TABLE fiche ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+
+-- Vérification
+-- SELECT id, status, version FROM fiche LIMIT 5;
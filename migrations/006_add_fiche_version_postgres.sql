@@ -0,0 +1,15 @@
+-- Migration: Colonne version (verrou optimiste) sur fiche
+-- Date: 2026-10-18
+-- Description: Incrémentée à chaque UPDATE de la fiche. Les transitions de
+--              statut (valider, compléter) et les mises à jour sont
+--              conditionnées à la version lue : une écriture concurrente
+--              répond 409 au lieu d'écraser l'autre.
+-- Database: PostgreSQL
+
+-- Avec une valeur par défaut constante, PostgreSQL n'a pas à réécrire la table
+ALTER TABLE fiche ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+COMMENT ON COLUMN fiche.version IS 'Version de la ligne, incrémentée à chaque mise à jour (verrou optimiste)';
+
+-- Vérification
+-- SELECT id, status, version FROM fiche LIMIT 5;
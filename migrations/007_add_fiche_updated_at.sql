@@ -0,0 +1,14 @@
+-- Migration: Colonne updated_at (date de dernière écriture) sur fiche
+-- Date: 2026-10-18
+-- Description: Mise à jour à chaque écriture de la fiche (UTC). Sert
+--              d'en-tête Last-Modified à GET /fiche/{id} pour les requêtes
+--              conditionnelles (304 Not Modified).
+
+-- SQLite n'accepte qu'une valeur par défaut constante dans ADD COLUMN :
+-- les lignes existantes sont datées de la migration juste après
+ALTER TABLE fiche ADD COLUMN updated_at DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00';
+
+UPDATE fiche SET updated_at = CURRENT_TIMESTAMP;
+
+-- Vérification
+-- SELECT id, version, updated_at FROM fiche LIMIT 5;
@@ -0,0 +1,15 @@
+-- Migration: Colonne updated_at (date de dernière écriture) sur fiche
+-- Date: 2026-10-18
+-- Description: Mise à jour à chaque écriture de la fiche (UTC). Sert
+--              d'en-tête Last-Modified à GET /fiche/{id} pour les requêtes
+--              conditionnelles (304 Not Modified).
+-- Database: PostgreSQL
+
+-- now() est évalué une fois pour l'instruction : pas de réécriture de la table
+ALTER TABLE fiche ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL
+    DEFAULT (now() AT TIME ZONE 'utc');
+
+COMMENT ON COLUMN fiche.updated_at IS 'Date UTC de la dernière écriture (Last-Modified)';
+
+-- Vérification
+-- SELECT id, version, updated_at FROM fiche LIMIT 5;
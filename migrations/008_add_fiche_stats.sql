@@ -0,0 +1,119 @@
+-- Migration: Compteurs de fiches par statut, origine, ville et travaux
+-- Date: 2026-10-18
+-- Description: Table fiche_stats (dimension, key, count) tenue à jour par
+--              triggers sur fiche et work_planned. Sert /fiches/villes et
+--              /stats sans parcourir la table fiche. Les triggers sont ceux
+--              de infrastructure/database/fiche_stats.py.
+
+CREATE TABLE IF NOT EXISTS fiche_stats (
+    dimension VARCHAR NOT NULL,
+    key VARCHAR NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+
+CREATE TRIGGER IF NOT EXISTS fiche_stats_fiche_insert
+AFTER INSERT ON fiche
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT dimension, key, 1 FROM (
+        SELECT 'status' AS dimension, CAST(NEW.status AS VARCHAR) AS key
+        UNION ALL SELECT 'origin_contact', CAST(NEW.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(NEW.city AS VARCHAR)
+    ) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fiche_stats_fiche_delete
+AFTER DELETE ON fiche
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT dimension, key, -1 FROM (
+        SELECT 'status' AS dimension, CAST(OLD.status AS VARCHAR) AS key
+        UNION ALL SELECT 'origin_contact', CAST(OLD.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(OLD.city AS VARCHAR)
+    ) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM fiche_stats
+    WHERE count <= 0 AND (dimension, key) IN (
+        SELECT 'status', CAST(OLD.status AS VARCHAR)
+        UNION ALL SELECT 'origin_contact', CAST(OLD.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(OLD.city AS VARCHAR)
+    );
+END;
+
+-- Nouvelles valeurs d'abord : une valeur inchangée ne passe pas par zéro
+CREATE TRIGGER IF NOT EXISTS fiche_stats_fiche_update
+AFTER UPDATE OF status, origin_contact, city ON fiche
+WHEN OLD.status IS NOT NEW.status
+    OR OLD.origin_contact IS NOT NEW.origin_contact
+    OR OLD.city IS NOT NEW.city
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT dimension, key, 1 FROM (
+        SELECT 'status' AS dimension, CAST(NEW.status AS VARCHAR) AS key
+        UNION ALL SELECT 'origin_contact', CAST(NEW.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(NEW.city AS VARCHAR)
+    ) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT dimension, key, -1 FROM (
+        SELECT 'status' AS dimension, CAST(OLD.status AS VARCHAR) AS key
+        UNION ALL SELECT 'origin_contact', CAST(OLD.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(OLD.city AS VARCHAR)
+    ) WHERE key IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM fiche_stats
+    WHERE count <= 0 AND (dimension, key) IN (
+        SELECT 'status', CAST(OLD.status AS VARCHAR)
+        UNION ALL SELECT 'origin_contact', CAST(OLD.origin_contact AS VARCHAR)
+        UNION ALL SELECT 'city', CAST(OLD.city AS VARCHAR)
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS fiche_stats_work_planned_insert
+AFTER INSERT ON work_planned
+WHEN NEW.work IS NOT NULL
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count) VALUES ('work', NEW.work, 1)
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fiche_stats_work_planned_delete
+AFTER DELETE ON work_planned
+WHEN OLD.work IS NOT NULL
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count) VALUES ('work', OLD.work, -1)
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM fiche_stats
+    WHERE dimension = 'work' AND key = OLD.work AND count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS fiche_stats_work_planned_update
+AFTER UPDATE OF work ON work_planned
+WHEN OLD.work IS NOT NEW.work
+BEGIN
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT 'work', NEW.work, 1 WHERE NEW.work IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO fiche_stats (dimension, key, count)
+    SELECT 'work', OLD.work, -1 WHERE OLD.work IS NOT NULL
+    ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM fiche_stats
+    WHERE dimension = 'work' AND key = OLD.work AND count <= 0;
+END;
+
+-- Compteurs initiaux (même requête que `python -m infrastructure.database.fiche_stats`)
+DELETE FROM fiche_stats;
+INSERT INTO fiche_stats (dimension, key, count)
+SELECT dimension, key, COUNT(*) FROM (
+    SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key FROM fiche
+    UNION ALL SELECT 'origin_contact', CAST(origin_contact AS VARCHAR) FROM fiche
+    UNION ALL SELECT 'city', CAST(city AS VARCHAR) FROM fiche
+    UNION ALL SELECT 'work', CAST(work AS VARCHAR) FROM work_planned
+) AS keys
+WHERE key IS NOT NULL
+GROUP BY dimension, key;
+
+-- Vérification
+-- SELECT * FROM fiche_stats ORDER BY dimension, count DESC;
@@ -0,0 +1,97 @@
+-- Migration: Compteurs de fiches par statut, origine, ville et travaux
+-- Date: 2026-10-18
+-- Description: Table fiche_stats (dimension, key, count) tenue à jour par
+--              triggers sur fiche et work_planned. Sert /fiches/villes et
+--              /stats sans parcourir la table fiche. Les triggers sont ceux
+--              de infrastructure/database/fiche_stats.py.
+-- Database: PostgreSQL
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS fiche_stats (
+    dimension VARCHAR NOT NULL,
+    key VARCHAR NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+);
+
+CREATE OR REPLACE FUNCTION fiche_stats_add(dim VARCHAR, k VARCHAR, delta INTEGER)
+RETURNS void AS $$
+BEGIN
+    IF k IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO fiche_stats (dimension, key, count) VALUES (dim, k, delta)
+    ON CONFLICT (dimension, key)
+    DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+    IF delta < 0 THEN
+        DELETE FROM fiche_stats WHERE dimension = dim AND key = k AND count <= 0;
+    END IF;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fiche_stats_fiche() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND OLD.status IS NOT DISTINCT FROM NEW.status
+        AND OLD.origin_contact IS NOT DISTINCT FROM NEW.origin_contact
+        AND OLD.city IS NOT DISTINCT FROM NEW.city THEN
+        RETURN NULL;
+    END IF;
+    -- Nouvelles valeurs d'abord : une valeur inchangée ne passe pas par zéro
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fiche_stats_add('status', CAST(NEW.status AS VARCHAR), 1);
+        PERFORM fiche_stats_add('origin_contact', CAST(NEW.origin_contact AS VARCHAR), 1);
+        PERFORM fiche_stats_add('city', CAST(NEW.city AS VARCHAR), 1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fiche_stats_add('status', CAST(OLD.status AS VARCHAR), -1);
+        PERFORM fiche_stats_add('origin_contact', CAST(OLD.origin_contact AS VARCHAR), -1);
+        PERFORM fiche_stats_add('city', CAST(OLD.city AS VARCHAR), -1);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS fiche_stats_fiche ON fiche;
+CREATE TRIGGER fiche_stats_fiche
+AFTER INSERT OR DELETE OR UPDATE OF status, origin_contact, city ON fiche
+FOR EACH ROW EXECUTE FUNCTION fiche_stats_fiche();
+
+CREATE OR REPLACE FUNCTION fiche_stats_work_planned() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.work IS NOT DISTINCT FROM NEW.work THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM fiche_stats_add('work', CAST(NEW.work AS VARCHAR), 1);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM fiche_stats_add('work', CAST(OLD.work AS VARCHAR), -1);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS fiche_stats_work_planned ON work_planned;
+CREATE TRIGGER fiche_stats_work_planned
+AFTER INSERT OR DELETE OR UPDATE OF work ON work_planned
+FOR EACH ROW EXECUTE FUNCTION fiche_stats_work_planned();
+
+-- Compteurs initiaux, dans la même transaction que les triggers
+LOCK TABLE fiche, work_planned IN SHARE MODE;
+DELETE FROM fiche_stats;
+INSERT INTO fiche_stats (dimension, key, count)
+SELECT dimension, key, COUNT(*) FROM (
+    SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key FROM fiche
+    UNION ALL SELECT 'origin_contact', CAST(origin_contact AS VARCHAR) FROM fiche
+    UNION ALL SELECT 'city', CAST(city AS VARCHAR) FROM fiche
+    UNION ALL SELECT 'work', CAST(work AS VARCHAR) FROM work_planned
+) AS keys
+WHERE key IS NOT NULL
+GROUP BY dimension, key;
+
+COMMIT;
+
+-- Vérification
+-- SELECT * FROM fiche_stats ORDER BY dimension, count DESC;
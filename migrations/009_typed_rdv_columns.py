@@ -0,0 +1,283 @@
+"""
+Migration: date_rdv / heure_rdv en colonnes DATE / TIME typées
+Date: 2026-10-18
+Description: Les rendez-vous étaient saisis en texte libre ("15/01/2025",
+             "14h30"). Chaque ligne est convertie en date et heure (à la
+             minute), par lots de `batch_size` lignes, chaque lot dans sa
+             propre transaction : les écritures de l'API ne sont jamais
+             bloquées plus d'un lot.
+
+Usage : python migrations/009_typed_rdv_columns.py [batch_size]
+        (DATABASE_URL lu dans l'environnement ou le fichier .env)
+
+SQLite : les colonnes n'ont pas de type strict ; les valeurs sont réécrites
+sur place au format stocké par SQLAlchemy (AAAA-MM-JJ, HH:MM), puis l'index
+(date_rdv, heure_rdv, id) de l'agenda est créé.
+
+PostgreSQL :
+1. ajout des colonnes date_rdv_typed (DATE) et heure_rdv_typed (TIME) ;
+2. remplissage par lots, puis index construits en CONCURRENTLY ;
+3. bascule dans une seule transaction courte, écritures bloquées : rattrapage
+   des lignes écrites depuis le début (updated_at), suppression des anciennes
+   colonnes, renommage des nouvelles et de leurs index, NOT NULL.
+   Déployer la version de l'API qui lit les colonnes typées juste après.
+
+Une valeur illisible est listée et fait échouer la migration (code 1) avant
+toute bascule : la corriger à la main puis relancer (la migration reprend
+sans risque, les lignes déjà converties sont réécrites à l'identique).
+Les fiches dont la représentation change (format corrigé) voient leur
+version incrémentée : les ETag déjà distribués ne restent pas valides.
+"""
+
+import os
+import re
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d", "%d/%m/%y")
+# 14:30, 14h30, 14H, 14.30, 14:30:00
+TIME_PATTERN = re.compile(r"^(\d{1,2})\s*(?:[:hH.]\s*(\d{2})?)?(?::\d{2}(?:\.\d+)?)?$")
+# Décalage toléré entre l'horloge des serveurs d'API et celle de la migration
+CLOCK_MARGIN = timedelta(minutes=5)
+
+Failure = Tuple[str, Any, Any]
+
+
+class UnreadableRdv(Exception):
+    def __init__(self, failures: List[Failure]) -> None:
+        super().__init__(f"{len(failures)} rendez-vous illisibles")
+        self.failures = failures
+
+
+def parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        return None
+    # Une date-heure ISO ("2025-01-15T14:00") ne garde que sa date
+    candidate = re.split(r"[T ]", value.strip(), maxsplit=1)[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(candidate, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_time(value: Any) -> Optional[time]:
+    if isinstance(value, time):
+        return value.replace(second=0, microsecond=0)
+    if not isinstance(value, str):
+        return None
+    match = TIME_PATTERN.match(value.strip())
+    if match is None:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+def convert_batch(
+    rows: Sequence[Any],
+) -> Tuple[List[Tuple[str, date, time, bool]], List[Failure]]:
+    """(id, date, heure, représentation modifiée) par ligne lisible."""
+    converted, failures = [], []
+    for id, date_rdv, heure_rdv in rows:
+        day, hour = parse_date(date_rdv), parse_time(heure_rdv)
+        if day is None or hour is None:
+            failures.append((id, date_rdv, heure_rdv))
+            continue
+        changed = (day.isoformat(), hour.strftime("%H:%M")) != (date_rdv, heure_rdv)
+        converted.append((id, day, hour, changed))
+    return converted, failures
+
+
+def read_batches(engine: Engine, batch_size: int):
+    """Parcourt `fiche` par id croissant ; un lot = une transaction."""
+    last_id = ""
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, date_rdv, heure_rdv FROM fiche WHERE id > :last "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                return
+            yield conn, rows
+        last_id = rows[-1][0]
+
+
+def migrate_sqlite(engine: Engine, batch_size: int) -> List[Failure]:
+    failures: List[Failure] = []
+    for conn, rows in read_batches(engine, batch_size):
+        converted, batch_failures = convert_batch(rows)
+        failures.extend(batch_failures)
+        updates = [
+            {"id": id, "date_rdv": day.isoformat(), "heure_rdv": hour.strftime("%H:%M")}
+            for id, day, hour, changed in converted
+            if changed
+        ]
+        if updates:
+            conn.execute(
+                text(
+                    "UPDATE fiche SET date_rdv = :date_rdv, heure_rdv = :heure_rdv, "
+                    "version = version + 1, updated_at = CURRENT_TIMESTAMP "
+                    "WHERE id = :id"
+                ),
+                updates,
+            )
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_fiche_date_rdv_heure_rdv_id "
+                "ON fiche (date_rdv, heure_rdv, id)"
+            )
+        )
+    return failures
+
+
+def _fill_typed_columns(conn: Connection, rows: Sequence[Any]) -> List[Failure]:
+    converted, failures = convert_batch(rows)
+    if converted:
+        conn.execute(
+            text(
+                "UPDATE fiche SET date_rdv_typed = :day, heure_rdv_typed = :hour "
+                "WHERE id = :id"
+            ),
+            [{"id": id, "day": day, "hour": hour} for id, day, hour, _ in converted],
+        )
+    return failures
+
+
+POSTGRES_INDEXES = {
+    # index temporaire sur les colonnes typées -> nom définitif après bascule
+    "ix_fiche_date_rdv_id_typed": ("ix_fiche_date_rdv_id", "date_rdv_typed, id"),
+    "ix_fiche_status_date_rdv_id_typed": (
+        "ix_fiche_status_date_rdv_id",
+        "status, date_rdv_typed, id",
+    ),
+    "ix_fiche_date_rdv_heure_rdv_id_typed": (
+        "ix_fiche_date_rdv_heure_rdv_id",
+        "date_rdv_typed, heure_rdv_typed, id",
+    ),
+}
+
+
+def migrate_postgres(engine: Engine, batch_size: int) -> List[Failure]:
+    started = datetime.now(timezone.utc).replace(tzinfo=None) - CLOCK_MARGIN
+    with engine.begin() as conn:
+        data_type = conn.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'fiche' AND column_name = 'date_rdv'"
+            )
+        ).scalar()
+        if data_type == "date":
+            # Bascule déjà faite
+            return []
+        conn.execute(
+            text(
+                "ALTER TABLE fiche "
+                "ADD COLUMN IF NOT EXISTS date_rdv_typed DATE, "
+                "ADD COLUMN IF NOT EXISTS heure_rdv_typed TIME"
+            )
+        )
+
+    failures: List[Failure] = []
+    for conn, rows in read_batches(engine, batch_size):
+        failures.extend(_fill_typed_columns(conn, rows))
+    if failures:
+        return failures
+
+    # CONCURRENTLY : hors transaction, sans bloquer les écritures
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, (_, columns) in POSTGRES_INDEXES.items():
+            conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON fiche ({columns})"
+                )
+            )
+
+    try:
+        _swap_postgres_columns(engine, started)
+    except UnreadableRdv as e:
+        return e.failures
+    return []
+
+
+def _swap_postgres_columns(engine: Engine, started: datetime) -> None:
+    with engine.begin() as conn:
+        # Lectures permises, écritures en attente jusqu'à la fin de la bascule
+        conn.execute(text("LOCK TABLE fiche IN SHARE ROW EXCLUSIVE MODE"))
+        # Rattrapage : lignes créées ou modifiées pendant le remplissage
+        rows = conn.execute(
+            text(
+                "SELECT id, date_rdv, heure_rdv FROM fiche "
+                "WHERE updated_at >= :started OR date_rdv_typed IS NULL "
+                "OR heure_rdv_typed IS NULL"
+            ),
+            {"started": started},
+        ).all()
+        failures = _fill_typed_columns(conn, rows)
+        if failures:
+            # Annule la transaction : l'API retrouve les colonnes texte
+            raise UnreadableRdv(failures)
+        conn.execute(
+            text(
+                "UPDATE fiche SET version = version + 1, "
+                "updated_at = now() AT TIME ZONE 'utc' "
+                "WHERE to_char(date_rdv_typed, 'YYYY-MM-DD') <> date_rdv "
+                "OR to_char(heure_rdv_typed, 'HH24:MI') <> heure_rdv"
+            )
+        )
+        # Les anciens index disparaissent avec leurs colonnes
+        conn.execute(
+            text("ALTER TABLE fiche DROP COLUMN date_rdv, DROP COLUMN heure_rdv")
+        )
+        conn.execute(text("ALTER TABLE fiche RENAME COLUMN date_rdv_typed TO date_rdv"))
+        conn.execute(
+            text("ALTER TABLE fiche RENAME COLUMN heure_rdv_typed TO heure_rdv")
+        )
+        conn.execute(
+            text(
+                "ALTER TABLE fiche ALTER COLUMN date_rdv SET NOT NULL, "
+                "ALTER COLUMN heure_rdv SET NOT NULL"
+            )
+        )
+        for name, (final_name, _) in POSTGRES_INDEXES.items():
+            conn.execute(text(f"ALTER INDEX {name} RENAME TO {final_name}"))
+
+
+MIGRATIONS = {"sqlite": migrate_sqlite, "postgresql": migrate_postgres}
+
+
+def migrate(engine: Engine, batch_size: int = 1000) -> List[Failure]:
+    """Convertit toutes les fiches ; retourne les valeurs illisibles."""
+    return MIGRATIONS[engine.dialect.name](engine, batch_size)
+
+
+def main(argv: List[str]) -> int:
+    load_dotenv()
+    batch_size = int(argv[1]) if len(argv) > 1 else 1000
+    engine = create_engine(os.environ["DATABASE_URL"])
+    failures = migrate(engine, batch_size)
+    for id, date_rdv, heure_rdv in failures:
+        print(f"Fiche {id} : rendez-vous illisible {date_rdv!r} {heure_rdv!r}")
+    if failures:
+        print(f"{len(failures)} fiche(s) à corriger avant de relancer", file=sys.stderr)
+        return 1
+    print("Rendez-vous convertis", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,30 @@
+-- Migration: Colonnes matériau / couleur promues depuis work_planned.details
+-- Date: 2026-10-18
+-- Description: Les chemins material_color.materiau et material_color.color
+--              (ou color à la racine, pour les stores) des détails validés
+--              deviennent des colonnes générées, indexées avec le type de
+--              travaux : GET /fiches?work=fenetre&materiau=PVC&color=BLANC
+--              n'a plus à relire tous les détails.
+-- Database: SQLite (>= 3.31)
+
+-- ALTER TABLE ne sait ajouter que des colonnes VIRTUAL : la valeur est
+-- calculée à la lecture, mais conservée dans l'index (les bases créées par
+-- create_all ont des colonnes STORED, équivalentes pour les requêtes).
+ALTER TABLE work_planned ADD COLUMN materiau VARCHAR GENERATED ALWAYS AS (
+    CAST(JSON_EXTRACT(details, '$."material_color"."materiau"') AS VARCHAR)
+) VIRTUAL;
+ALTER TABLE work_planned ADD COLUMN color VARCHAR GENERATED ALWAYS AS (
+    coalesce(
+        CAST(JSON_EXTRACT(details, '$."material_color"."color"') AS VARCHAR),
+        CAST(JSON_EXTRACT(details, '$."color"') AS VARCHAR)
+    )
+) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS ix_work_planned_work_materiau_color
+    ON work_planned (work, materiau, color);
+
+ANALYZE work_planned;
+
+-- Vérification: le plan doit mentionner ix_work_planned_work_materiau_color
+-- EXPLAIN QUERY PLAN SELECT fiche_id FROM work_planned
+--     WHERE work = 'fenetre' AND materiau = 'PVC' AND color = 'BLANC';
@@ -0,0 +1,37 @@
+-- Migration: details en JSONB, colonnes matériau / couleur promues
+-- Date: 2026-10-18
+-- Description: work_planned.details passe en JSONB et reçoit un index GIN
+--              (jsonb_path_ops) pour les critères details @> {...} de
+--              GET /fiches ; les chemins material_color.materiau et
+--              material_color.color (ou color à la racine, pour les stores)
+--              deviennent des colonnes générées indexées avec le type de
+--              travaux.
+-- Database: PostgreSQL (>= 12)
+
+-- Réécrit la table une seule fois, sous verrou exclusif : à lancer en
+-- période creuse (work_planned ne contient que les travaux validés).
+-- STORED : PostgreSQL n'indexe pas les colonnes générées virtuelles.
+ALTER TABLE work_planned
+    ALTER COLUMN details TYPE JSONB USING details::jsonb,
+    ADD COLUMN IF NOT EXISTS materiau VARCHAR GENERATED ALWAYS AS (
+        CAST(details #>> '{material_color,materiau}' AS VARCHAR)
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS color VARCHAR GENERATED ALWAYS AS (
+        coalesce(
+            CAST(details #>> '{material_color,color}' AS VARCHAR),
+            CAST(details #>> '{color}' AS VARCHAR)
+        )
+    ) STORED;
+
+-- CONCURRENTLY évite de bloquer les écritures pendant la construction ;
+-- ces instructions ne doivent pas être exécutées dans une transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_work_planned_work_materiau_color
+    ON work_planned (work, materiau, color);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_work_planned_details
+    ON work_planned USING gin (details jsonb_path_ops);
+
+ANALYZE work_planned;
+
+-- Vérification: le plan doit mentionner ix_work_planned_details
+-- EXPLAIN SELECT fiche_id FROM work_planned
+--     WHERE details @> '{"type_pose": "Renovation"}';
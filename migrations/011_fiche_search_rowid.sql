@@ -0,0 +1,17 @@
+-- Migration: rowid des lignes de fiche_search dérivé de fiche_id
+-- Date: 2026-10-18
+-- Description: fiche_id est une colonne UNINDEXED de la table FTS5 : un
+--              DELETE ... WHERE fiche_id parcourait toute la table à chaque
+--              suppression ou mise à jour de fiche (environ 40 ms à 100 000
+--              fiches). Les lignes ont désormais pour rowid une empreinte de
+--              fiche_id (search_rowid) et sont supprimées par rowid.
+-- Database: SQLite uniquement (PostgreSQL : fiche_search.fiche_id est déjà
+--           la clé primaire)
+
+-- Les lignes existantes ont des rowid quelconques : vider l'index, puis le
+-- reconstruire avec `python -m infrastructure.database.fiche_search`
+-- (GET /fiches/search ne trouve rien entre les deux).
+DELETE FROM fiche_search;
+
+-- Vérification (après reconstruction) : autant de lignes que de fiches
+-- SELECT (SELECT count(*) FROM fiche_search) = (SELECT count(*) FROM fiche);
@@ -0,0 +1,122 @@
+"""
+Migration: colonnes lastname_key / firstname_key pour les préfixes de nom
+Date: 2026-10-18
+Description: Les filtres lastname_prefix / firstname_prefix de GET /fiches
+             comparaient lower(nom) : sous SQLite, lower() ne replie que
+             l'ASCII ("Émile" n'était pas trouvé par "é"). Les noms sont
+             désormais stockés sous leur forme de comparaison (name_key :
+             casse repliée, NFC), calculée en Python, dans deux colonnes
+             indexées. Les index ix_fiche_lower_* sont supprimés.
+
+Usage : python migrations/012_name_key_columns.py [batch_size]
+        (DATABASE_URL lu dans l'environnement ou le fichier .env)
+
+Ordre de déploiement : lancer la migration (ajout des colonnes et
+remplissage par lots, une transaction par lot), déployer l'API, puis la
+relancer : elle réécrit les clés des fiches créées ou renommées entre-temps
+par l'ancienne version. Relancer la migration est toujours sans risque.
+
+PostgreSQL : colonnes en collation "C" (ordre des points de code, requis par
+les intervalles de préfixe), index créés et supprimés en CONCURRENTLY.
+"""
+
+import os
+import sys
+import unicodedata
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+
+COLUMNS = {"lastname_key": "lastname", "firstname_key": "firstname"}
+OLD_INDEXES = ("ix_fiche_lower_lastname", "ix_fiche_lower_firstname")
+
+
+def name_key(value: str) -> str:
+    """Identique à contact_fiche.fiche_filter.name_key."""
+    return unicodedata.normalize("NFC", value.casefold())
+
+
+def add_columns(engine: Engine) -> None:
+    existing = {column["name"] for column in inspect(engine).get_columns("fiche")}
+    collation = ' COLLATE "C"' if engine.dialect.name == "postgresql" else ""
+    with engine.begin() as conn:
+        for column in COLUMNS:
+            if column not in existing:
+                conn.execute(
+                    text(f"ALTER TABLE fiche ADD COLUMN {column} VARCHAR{collation}")
+                )
+
+
+def fill_keys(engine: Engine, batch_size: int) -> int:
+    """Réécrit les clés absentes ou périmées ; retourne le nombre de fiches."""
+    updated = 0
+    last_id = ""
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, lastname, firstname, lastname_key, firstname_key "
+                    "FROM fiche WHERE id > :last ORDER BY id LIMIT :limit"
+                ),
+                {"last": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                return updated
+            stale: List[Dict[str, Any]] = [
+                {
+                    "id": id,
+                    "lastname_key": name_key(lastname),
+                    "firstname_key": name_key(firstname),
+                }
+                for id, lastname, firstname, lastname_key, firstname_key in rows
+                if (lastname_key, firstname_key)
+                != (name_key(lastname), name_key(firstname))
+            ]
+            if stale:
+                conn.execute(
+                    text(
+                        "UPDATE fiche SET lastname_key = :lastname_key, "
+                        "firstname_key = :firstname_key WHERE id = :id"
+                    ),
+                    stale,
+                )
+            updated += len(stale)
+        last_id = rows[-1][0]
+
+
+def replace_indexes(engine: Engine) -> None:
+    postgres = engine.dialect.name == "postgresql"
+    concurrently = " CONCURRENTLY" if postgres else ""
+    # CONCURRENTLY : hors transaction, sans bloquer les écritures
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for column in COLUMNS:
+            conn.execute(
+                text(
+                    f"CREATE INDEX{concurrently} IF NOT EXISTS ix_fiche_{column} "
+                    f"ON fiche ({column})"
+                )
+            )
+        for name in OLD_INDEXES:
+            conn.execute(text(f"DROP INDEX{concurrently} IF EXISTS {name}"))
+
+
+def migrate(engine: Engine, batch_size: int = 1000) -> int:
+    add_columns(engine)
+    updated = fill_keys(engine, batch_size)
+    replace_indexes(engine)
+    return updated
+
+
+def main(argv: List[str]) -> int:
+    load_dotenv()
+    batch_size = int(argv[1]) if len(argv) > 1 else 1000
+    engine = create_engine(os.environ["DATABASE_URL"])
+    updated = migrate(engine, batch_size)
+    print(f"{updated} fiche(s) mises à jour", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
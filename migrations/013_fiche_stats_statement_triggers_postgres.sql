@@ -0,0 +1,168 @@
+-- Migration: Triggers par instruction pour les compteurs fiche_stats
+-- Date: 2026-10-18
+-- Description: Les triggers par ligne de la migration 008 faisaient un
+--              INSERT ... ON CONFLICT DO UPDATE par ligne écrite et par
+--              compteur : un INSERT / UPDATE / DELETE groupé réécrivait le
+--              même compteur (même statut, même ville) des milliers de fois
+--              en gardant son verrou. Les triggers par instruction lisent
+--              les tables de transition, agrègent les deltas par compteur
+--              et n'écrivent qu'une fois chaque compteur touché, dans un
+--              ordre fixe (pas d'interblocage entre instructions).
+--              Identiques à ceux de infrastructure/database/fiche_stats.py.
+-- Database: PostgreSQL
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION fiche_stats_fiche() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, 1 AS delta FROM new_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, -1 AS delta FROM old_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+        DELETE FROM fiche_stats
+        WHERE count <= 0 AND (dimension, key) IN (
+            SELECT dimension, key FROM (
+                SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, -1 AS delta FROM old_rows
+                UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, -1 AS delta FROM old_rows
+                UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            ) AS removed
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Une valeur inchangée compte +1 et -1 : son delta net est nul
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, -1 AS delta FROM old_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+        DELETE FROM fiche_stats
+        WHERE count <= 0 AND (dimension, key) IN (
+            SELECT dimension, key FROM (
+                SELECT 'status' AS dimension, CAST(status AS VARCHAR) AS key, -1 AS delta FROM old_rows
+                UNION ALL SELECT 'origin_contact' AS dimension, CAST(origin_contact AS VARCHAR) AS key, -1 AS delta FROM old_rows
+                UNION ALL SELECT 'city' AS dimension, CAST(city AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            ) AS removed
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fiche_stats_work_planned() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, 1 AS delta FROM new_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, -1 AS delta FROM old_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+        DELETE FROM fiche_stats
+        WHERE count <= 0 AND (dimension, key) IN (
+            SELECT dimension, key FROM (
+                SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            ) AS removed
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Une valeur inchangée compte +1 et -1 : son delta net est nul
+        INSERT INTO fiche_stats (dimension, key, count)
+        SELECT dimension, key, SUM(delta) FROM (
+            SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, 1 AS delta FROM new_rows
+            UNION ALL SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, -1 AS delta FROM old_rows
+        ) AS changes
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING SUM(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT (dimension, key)
+        DO UPDATE SET count = fiche_stats.count + EXCLUDED.count;
+        DELETE FROM fiche_stats
+        WHERE count <= 0 AND (dimension, key) IN (
+            SELECT dimension, key FROM (
+                SELECT 'work' AS dimension, CAST(work AS VARCHAR) AS key, -1 AS delta FROM old_rows
+            ) AS removed
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Une table de transition n'est permise que sur un trigger à un seul
+-- événement, sans liste de colonnes : trois triggers par table
+DROP TRIGGER IF EXISTS fiche_stats_fiche ON fiche;
+DROP TRIGGER IF EXISTS fiche_stats_fiche_insert ON fiche;
+CREATE TRIGGER fiche_stats_fiche_insert AFTER INSERT ON fiche
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_fiche();
+DROP TRIGGER IF EXISTS fiche_stats_fiche_delete ON fiche;
+CREATE TRIGGER fiche_stats_fiche_delete AFTER DELETE ON fiche
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_fiche();
+DROP TRIGGER IF EXISTS fiche_stats_fiche_update ON fiche;
+CREATE TRIGGER fiche_stats_fiche_update AFTER UPDATE ON fiche
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_fiche();
+
+DROP TRIGGER IF EXISTS fiche_stats_work_planned ON work_planned;
+DROP TRIGGER IF EXISTS fiche_stats_work_planned_insert ON work_planned;
+CREATE TRIGGER fiche_stats_work_planned_insert AFTER INSERT ON work_planned
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_work_planned();
+DROP TRIGGER IF EXISTS fiche_stats_work_planned_delete ON work_planned;
+CREATE TRIGGER fiche_stats_work_planned_delete AFTER DELETE ON work_planned
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_work_planned();
+DROP TRIGGER IF EXISTS fiche_stats_work_planned_update ON work_planned;
+CREATE TRIGGER fiche_stats_work_planned_update AFTER UPDATE ON work_planned
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION fiche_stats_work_planned();
+
+DROP FUNCTION IF EXISTS fiche_stats_add(VARCHAR, VARCHAR, INTEGER);
+
+COMMIT;
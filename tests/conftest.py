@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Les modules d'infrastructure lisent DATABASE_URL à l'import :
+# on pointe vers une base SQLite jetable avant toute collecte des tests.
+_db_dir = tempfile.mkdtemp(prefix="fiche-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_dir}/fiche_test.db")
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config.works_schemas_config import WorkSchemaConfigService
+from contact_fiche.contact_fiche_usecases import (
+    AsyncBulkCreateFicheUsecase,
+    AsyncCompletionFicheUsecase,
+    AsyncCreateFicheUsecase,
+    AsyncDeleteFicheUsecase,
+    AsyncUpdateFicheUsecase,
+    AsyncValidateFicheUsecase,
+)
+from contact_fiche.enums import OriginContact, Status
+from contact_fiche.exceptions import FicheConflictError
+from infrastructure.cache.read_through_cache import LRUTTLCache, ReadThroughCache
+from infrastructure.database.async_connexion import to_async_url
+from infrastructure.database.fiche_model import Base
+from infrastructure.repositories.async_sqlite_fiche_repository import (
+    AsyncSQLiteFicheRepository,
+)
+from infrastructure.repositories.cached_fiche_repository import CachedFicheRepository
+
+FIELDS = dict(
+    lastname="Doe",
+    firstname="John",
+    date_rdv="2025-01-15",
+    heure_rdv="14:00",
+    telephone="0123456789",
+    email="johndoe@gmail.com",
+    address="1 rue de Paris",
+    city="Paris",
+    code_postal="75000",
+    type_logement="Maison",
+    statut_habitation="Propriétaire",
+    origin_contact=OriginContact.AFFICHAGE,
+    commentary="",
+)
+
+
+@pytest.fixture
+def run(tmp_path):
+    """Exécute une coroutine avec un repository asynchrone sur aiosqlite."""
+
+    async def with_repository(scenario, decorate=None):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/async.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with AsyncSession(engine) as session:
+                repository = AsyncSQLiteFicheRepository(session, decorate=decorate)
+                return await scenario(repository)
+        finally:
+            await engine.dispose()
+
+    return lambda scenario, decorate=None: asyncio.run(
+        with_repository(scenario, decorate)
+    )
+
+
+def test_to_async_url_picks_async_driver():
+    assert to_async_url("sqlite:///db.sqlite") == "sqlite+aiosqlite:///db.sqlite"
+    assert (
+        to_async_url("postgresql://user:pwd@db:5432/fichecontact")
+        == "postgresql+asyncpg://user:pwd@db:5432/fichecontact"
+    )
+
+
+def test_async_usecases_round_trip(run):
+    config_service = WorkSchemaConfigService(config_path="./config/config_works.json")
+
+    async def scenario(repository):
+        fiche = await AsyncCreateFicheUsecase(repository)(**FIELDS)
+        await AsyncUpdateFicheUsecase(repository)(fiche.id, new_lastname="Martin")
+        await AsyncCompletionFicheUsecase(repository, config_service)(
+            fiche.id, works_data=[{"work": "porte_entree", "details": {}}]
+        )
+        completed = await repository.get_by_id(fiche.id)
+
+        await AsyncDeleteFicheUsecase(repository)(fiche.id)
+        return completed, await repository.get_by_id(fiche.id)
+
+    completed, deleted = run(scenario)
+
+    assert completed.lastname == "Martin"
+    assert completed.status == Status.COMPLETED
+    assert [wp.work for wp in completed.works_planned] == ["porte_entree"]
+    assert deleted is None
+
+
+def test_async_update_refuses_the_client_stale_version(run):
+    async def scenario(repository):
+        fiche = await AsyncCreateFicheUsecase(repository)(**FIELDS)
+        update = AsyncUpdateFicheUsecase(repository)
+        await update(fiche.id, new_lastname="Martin", expected_version=fiche.version)
+        with pytest.raises(FicheConflictError):
+            await update(fiche.id, new_lastname="Durand", expected_version=1)
+        return await repository.get_by_id(fiche.id)
+
+    fiche = run(scenario)
+
+    assert (fiche.lastname, fiche.version) == ("Martin", 2)
+
+
+def test_patch_route_compares_the_sent_version():
+    from benchmarks.suite.driver import new_fiche, open_client
+    from benchmarks.suite.seeding import reset_schema
+
+    reset_schema()
+
+    async def scenario():
+        async with open_client() as client:
+            fiche = (await client.post("/fiche", json=new_fiche(1))).json()
+            url = f"/fiche/{fiche['id']}"
+            first = await client.patch(url, json={**fiche, "lastname": "Martin"})
+            stale = await client.patch(url, json={**fiche, "lastname": "Durand"})
+            without_version = {**fiche, "lastname": "Durand"}
+            del without_version["version"]
+            blind = await client.patch(url, json=without_version)
+        return first, stale, blind
+
+    first, stale, blind = asyncio.run(scenario())
+
+    assert first.status_code == 200 and first.json()["version"] == 2
+    assert stale.status_code == 409
+    assert blind.status_code == 200 and blind.json()["lastname"] == "Durand"
+
+
+def test_fiches_route_parses_date_filters_at_the_edge():
+    from benchmarks.suite.driver import new_fiche, open_client
+    from benchmarks.suite.seeding import reset_schema
+
+    reset_schema()
+
+    async def scenario():
+        async with open_client() as client:
+            await client.post("/fiche", json={**new_fiche(1), "date_rdv": "2025-02-10"})
+            return [
+                await client.get("/fiches", params=params)
+                for params in (
+                    {"date_rdv_from": "2025-02-01", "date_rdv_to": ""},
+                    {"date_rdv_from": "2025-03-01"},
+                    {"date_rdv_from": "01/02/2025"},
+                )
+            ]
+
+    matching, after, unreadable = asyncio.run(scenario())
+
+    assert [f["date_rdv"] for f in matching.json()] == ["2025-02-10"]
+    assert after.json() == []
+    assert unreadable.status_code == 422
+
+
+def test_async_validate_and_list_page(run):
+    async def scenario(repository):
+        fiche = await AsyncCreateFicheUsecase(repository)(**FIELDS)
+        await AsyncValidateFicheUsecase(repository)(fiche.id)
+        return await repository.list_page(limit=10)
+
+    page = run(scenario)
+
+    assert [f.status for f in page.items] == [Status.COMPLETED]
+
+
+def test_async_bulk_create(run):
+    item = {**FIELDS, "origin_contact": OriginContact.SALON.value}
+
+    async def scenario(repository):
+        return await AsyncBulkCreateFicheUsecase(repository)([item, {}, item])
+
+    results = run(scenario)
+
+    assert [r.status for r in results] == ["created", "error", "created"]
+
+
+def test_async_repository_goes_through_decorators(run):
+    cache = ReadThroughCache(LRUTTLCache(maxsize=10, ttl=60))
+
+    async def scenario(repository):
+        fiche = await AsyncCreateFicheUsecase(repository)(**FIELDS)
+        await repository.get_by_id(fiche.id)
+        await repository.get_by_id(fiche.id)
+
+    run(scenario, decorate=lambda repository: CachedFicheRepository(repository, cache))
+
+    assert cache.stats()["hits"] == 1
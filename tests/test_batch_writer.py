@@ -0,0 +1,188 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from contact_fiche.contact_fiche_usecases import AsyncCreateFicheUsecase
+from infrastructure.database.fiche_model import Base, FicheModel
+from infrastructure.repositories.batch_writer import (
+    AsyncSessionBatchWriter,
+    BatchWriter,
+    GroupCommitFicheRepository,
+)
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+from tests.test_async_sqlite_fiche_repository import FIELDS
+from tests.test_sqlite_fiche_repository import make_fiche
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/group_commit.db")
+    Base.metadata.create_all(engine)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    engine.commits = commits
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def writer(engine):
+    @contextmanager
+    def session_scope():
+        with Session(engine) as session:
+            yield session
+
+    writer = BatchWriter(
+        session_scope,
+        lambda session: SQLiteFicheRepository(session=session),
+        max_batch=50,
+        max_delay=0.05,
+    )
+    yield writer
+    writer.close()
+
+
+def count_fiches(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(FicheModel)).scalar()
+
+
+def test_concurrent_saves_share_one_commit(engine, writer):
+    barrier = threading.Barrier(20)
+
+    def create():
+        barrier.wait()
+        writer.save(make_fiche())
+
+    threads = [threading.Thread(target=create) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert count_fiches(engine) == 20
+    assert len(engine.commits) < 5
+
+
+def test_failed_batch_only_fails_the_faulty_fiche(engine, writer):
+    existing = make_fiche()
+    writer.save(existing)
+
+    futures = [writer.submit(make_fiche()) for _ in range(3)]
+    futures.append(writer.submit(existing))
+
+    assert [f.exception() is None for f in futures] == [True, True, True, False]
+    assert isinstance(futures[-1].exception(), RuntimeError)
+    assert count_fiches(engine) == 4
+
+
+def test_close_writes_pending_fiches_then_refuses_new_ones(engine, writer):
+    futures = [writer.submit(make_fiche()) for _ in range(5)]
+
+    writer.close()
+
+    assert all(future.done() for future in futures)
+    assert count_fiches(engine) == 5
+    with pytest.raises(RuntimeError):
+        writer.submit(make_fiche())
+
+
+def test_async_session_writer_uses_the_async_writer_engine(engine, tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path}/group_commit.db"
+    # Un seul écrivain : pool d'une connexion, comme l'engine d'écriture de l'API
+    async_engine = create_async_engine(url, pool_size=1, max_overflow=0)
+    async_commits = []
+    event.listen(async_engine.sync_engine, "commit", async_commits.append)
+
+    async def burst():
+        writer = AsyncSessionBatchWriter(
+            async_sessionmaker(bind=async_engine),
+            lambda session: SQLiteFicheRepository(session=session),
+            max_delay=0.05,
+        )
+        usecase = AsyncCreateFicheUsecase(
+            repository=GroupCommitFicheRepository(repository=None, writer=writer)
+        )
+        fiches = await asyncio.gather(*(usecase(**FIELDS) for _ in range(30)))
+        pending = writer.submit(make_fiche())
+        await writer.close()
+        await async_engine.dispose()
+        return fiches, pending
+
+    fiches, pending = asyncio.run(burst())
+
+    assert len(fiches) == 30 and pending.exception() is None
+    assert count_fiches(engine) == 31
+    assert engine.commits == [] and 0 < len(async_commits) < 5
+
+
+def test_async_writer_fails_only_the_faulty_fiche(engine, tmp_path):
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/group_commit.db"
+    )
+    existing = make_fiche()
+
+    async def burst():
+        writer = AsyncSessionBatchWriter(
+            async_sessionmaker(bind=async_engine),
+            lambda session: SQLiteFicheRepository(session=session),
+            max_delay=0.05,
+        )
+        await writer.save(existing)
+        futures = [writer.submit(make_fiche()) for _ in range(3)]
+        futures.append(writer.submit(existing))
+        # Requête abandonnée avant l'écriture de son lot : fiche non écrite
+        writer.submit(make_fiche()).cancel()
+        await asyncio.wait(futures)
+        await writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit(make_fiche())
+        await async_engine.dispose()
+        return futures
+
+    futures = asyncio.run(burst())
+
+    assert [f.exception() is None for f in futures] == [True, True, True, False]
+    assert isinstance(futures[-1].exception(), RuntimeError)
+    assert count_fiches(engine) == 4
+
+
+def test_api_group_commit_has_a_single_writer_engine(monkeypatch):
+    from benchmarks.suite.driver import new_fiche, open_client
+    from benchmarks.suite.seeding import reset_schema
+    from infrastructure.api import main
+    from infrastructure.database.async_connexion import get_async_engine
+    from infrastructure.database.connexion import get_engine
+
+    reset_schema()
+    monkeypatch.setattr(main, "GROUP_COMMIT_ENABLED", True)
+    commits = {"sync": [], "async": []}
+    engines = {"sync": get_engine(), "async": get_async_engine().sync_engine}
+    listeners = {
+        kind: lambda conn, kind=kind: commits[kind].append(conn) for kind in engines
+    }
+    for kind, engine in engines.items():
+        event.listen(engine, "commit", listeners[kind])
+
+    async def burst():
+        async with open_client() as client:
+            responses = await asyncio.gather(
+                *(client.post("/fiche", json=new_fiche(n)) for n in range(20))
+            )
+            deleted = await client.delete(f"/fiche/{responses[0].json()['id']}")
+        return [r.status_code for r in responses], deleted.status_code
+
+    try:
+        statuses, deleted = asyncio.run(burst())
+    finally:
+        for kind, engine in engines.items():
+            event.remove(engine, "commit", listeners[kind])
+
+    assert set(statuses) == {200} and deleted == 200
+    assert commits["sync"] == [] and 0 < len(commits["async"]) < 20
+    assert main.get_batch_writer.cache_info().currsize == 0
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from benchmarks.suite.data import fiche_fields, reserved_ids
+from benchmarks.suite.driver import (
+    SCENARIOS,
+    Scenarios,
+    load,
+    measure_scenarios,
+    open_client,
+)
+from benchmarks.suite.results import benchmark_entry, compare, scaling, summarize
+from benchmarks.suite.seeding import seed
+from config.works_schemas_config import get_work_schema_config_service
+from contact_fiche.contact_fiche_usecases import validate_works
+from contact_fiche.entities.fiche_entity import Fiche
+
+
+def test_synthetic_fiches_are_deterministic_and_valid():
+    assert fiche_fields(42) == fiche_fields(42)
+    fiches = [fiche_fields(n) for n in range(200)]
+    assert {fields["status"] for fields in fiches} == {
+        "Default",
+        "In Progress",
+        "Completed",
+    }
+    config_service = get_work_schema_config_service()
+    for fields in fiches:
+        Fiche(**fields)
+        if fields["works_planned"]:
+            validate_works(config_service, fields["works_planned"])
+
+
+def test_reserved_ids_are_disjoint_and_completable():
+    reserved = reserved_ids(100, 10)
+
+    assert len(set(reserved["completion"]) | set(reserved["delete"])) == 20
+    assert all(
+        fiche_fields(int(id[len("bench") :]))["status"] == "In Progress"
+        for id in reserved["completion"]
+    )
+    with pytest.raises(ValueError):
+        reserved_ids(15, 10)
+
+
+def test_summarize_uses_pytest_benchmark_names():
+    stats = summarize([0.004, 0.001, 0.002, 0.003])
+
+    assert stats["rounds"] == 4
+    assert (stats["min"], stats["max"]) == (0.001, 0.004)
+    assert stats["median"] == pytest.approx(0.0025)
+    assert stats["ops"] == pytest.approx(400)
+    assert summarize([]) == {"rounds": 0}
+
+
+def test_compare_flags_slower_medians_and_new_errors():
+    old = {
+        "benchmarks": [
+            benchmark_entry("get", 1000, [0.010] * 5),
+            benchmark_entry("list", 1000, [0.010] * 5),
+            benchmark_entry("delete", 1000, [0.010] * 5),
+        ]
+    }
+    new = {
+        "benchmarks": [
+            benchmark_entry("get", 1000, [0.0105] * 5),
+            benchmark_entry("list", 1000, [0.020] * 5),
+            benchmark_entry("delete", 1000, [0.010] * 4, errors=1),
+            benchmark_entry("get", 10000, [0.010] * 5),
+        ]
+    }
+
+    rows = compare(old, new, threshold=0.10)
+
+    assert [(name, regression) for name, *_, regression in rows] == [
+        ("get[1000]", False),
+        ("list[1000]", True),
+        ("delete[1000]", True),
+    ]
+
+
+def test_scaling_flags_scenarios_that_slow_down_with_size():
+    report = {
+        "benchmarks": [
+            benchmark_entry("get", 1000, [0.004] * 5),
+            benchmark_entry("get", 100000, [0.005] * 5),
+            benchmark_entry("delete", 1000, [0.009] * 5),
+            benchmark_entry("delete", 10000, [0.020] * 5),
+            benchmark_entry("delete", 100000, [0.080] * 5),
+            benchmark_entry("villes", 1000, [0.003] * 5),
+        ]
+    }
+
+    rows = scaling(report, limit=3.0)
+
+    assert [(name, small, large, flag) for name, small, _, large, _, flag in rows] == [
+        ("get", 1000, 100000, False),
+        ("delete", 1000, 100000, True),
+    ]
+
+
+def test_every_scenario_succeeds_against_the_api():
+    seed(300)
+    scenarios = Scenarios(300, reserved=3)
+
+    async def session():
+        async with open_client() as client:
+            entries = await measure_scenarios(client, scenarios, rounds=2, warmup=1)
+            charge = await load(client, scenarios, concurrency=3, duration=0.2)
+        return entries, charge
+
+    entries, charge = asyncio.run(session())
+
+    assert [entry["group"] for entry in entries] == SCENARIOS
+    assert all(entry["errors"] == 0 for entry in entries)
+    assert charge["requests"] > 0 and charge["errors"] == 0
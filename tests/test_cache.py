@@ -0,0 +1,184 @@
+import pytest
+
+from config.works_schemas_config import WorkSchemaConfigService
+from contact_fiche.contact_fiche_usecases import (
+    BulkCreateFicheUsecase,
+    CompletionFicheUsecase,
+    DeleteFicheUsecase,
+    UpdateFicheUsecase,
+    ValidateFicheUsecase,
+)
+from contact_fiche.enums import Status
+from contact_fiche.in_memory_fiche_repository import InMemoryFicheRepository
+from infrastructure.cache.read_through_cache import LRUTTLCache, ReadThroughCache
+from infrastructure.repositories.cached_fiche_repository import CachedFicheRepository
+from tests.test_sqlite_fiche_repository import make_fiche
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DictBackend:
+    """Stand-in minimal d'un backend distant (type Redis)."""
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": 0}
+
+
+@pytest.fixture(params=["lru", "stand-in"])
+def cache(request):
+    backend = LRUTTLCache(maxsize=100, ttl=60) if request.param == "lru" else None
+    return ReadThroughCache(backend or DictBackend())
+
+
+@pytest.fixture
+def store():
+    return InMemoryFicheRepository()
+
+
+@pytest.fixture
+def repository(store, cache):
+    return CachedFicheRepository(store, cache)
+
+
+@pytest.fixture
+def fiche(store):
+    fiche = make_fiche(status=Status.IN_PROGRESS)
+    store.save(fiche)
+    return fiche
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUTTLCache(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.stats() == {"hits": 2, "misses": 1, "evictions": 1, "size": 2}
+
+
+def test_lru_expires_entries_after_ttl():
+    clock = FakeClock()
+    lru = LRUTTLCache(maxsize=2, ttl=10, clock=clock)
+    lru.set("a", 1)
+
+    clock.now = 9.9
+    assert lru.get("a") == 1
+    clock.now = 10
+    assert lru.get("a") is None
+    assert lru.stats()["evictions"] == 1
+
+
+def test_get_by_id_is_served_from_cache(repository, store, fiche, cache):
+    repository.get_by_id(fiche.id)
+    del store.fiches[fiche.id]  # la source ne doit plus être sollicitée
+
+    assert repository.get_by_id(fiche.id).id == fiche.id
+    assert cache.stats()["hits"] == 1
+
+
+def test_cached_fiche_is_isolated_from_caller_mutations(repository, fiche):
+    repository.get_by_id(fiche.id)
+    repository.get_by_id(fiche.id).lastname = "Modifié sans update"
+
+    assert repository.get_by_id(fiche.id).lastname == fiche.lastname
+
+
+def test_no_stale_read_after_update(repository, fiche):
+    repository.get_by_id(fiche.id)
+
+    UpdateFicheUsecase(repository)(fiche.id, new_lastname="Martin")
+
+    assert repository.get_by_id(fiche.id).lastname == "Martin"
+
+
+def test_update_reads_past_a_stale_cache(repository, store, fiche):
+    repository.get_by_id(fiche.id)
+    # Écriture par un autre worker : le cache de ce processus est périmé
+    other = store.get_by_id(fiche.id).model_copy(deep=True)
+    other.city = "Lyon"
+    store.update(fiche.id, other)
+    version = store.get_by_id(fiche.id).version
+
+    updated = UpdateFicheUsecase(repository)(fiche.id, new_lastname="Martin")
+
+    assert updated.version == version + 1
+    assert (updated.lastname, updated.city) == ("Martin", "Lyon")
+
+
+def test_no_stale_read_after_delete(repository, fiche):
+    repository.get_by_id(fiche.id)
+
+    DeleteFicheUsecase(repository)(fiche.id)
+
+    assert repository.get_by_id(fiche.id) is None
+
+
+def test_no_stale_read_after_validate(repository, fiche):
+    repository.get_by_id(fiche.id)
+
+    ValidateFicheUsecase(repository)(fiche.id)
+
+    assert repository.get_by_id(fiche.id).status == Status.COMPLETED
+
+
+def test_no_stale_read_after_completion(repository, fiche):
+    config_service = WorkSchemaConfigService(config_path="./config/config_works.json")
+    repository.get_by_id(fiche.id)
+
+    CompletionFicheUsecase(repository, config_service)(
+        fiche.id, works_data=[{"work": "porte_entree", "details": {}}]
+    )
+
+    cached = repository.get_by_id(fiche.id)
+    assert cached.status == Status.COMPLETED
+    assert [wp.work for wp in cached.works_planned] == ["porte_entree"]
+
+
+def test_no_stale_read_after_bulk_upsert(repository, fiche):
+    repository.get_by_id(fiche.id)
+    item = fiche.model_dump(mode="json", exclude={"id", "status"})
+
+    BulkCreateFicheUsecase(repository)([{**item, "city": "Lyon"}], upsert=True)
+
+    assert repository.get_by_id(fiche.id).city == "Lyon"
+
+
+def test_read_started_before_invalidation_is_not_cached(store, fiche):
+    cache = ReadThroughCache(LRUTTLCache(maxsize=10, ttl=60))
+    generation = cache.generation()
+    stale = store.get_by_id(fiche.id)
+
+    cache.invalidate(fiche.id)  # écriture concurrente
+    cache.put(fiche.id, stale, generation)
+
+    assert cache.get(fiche.id) is None
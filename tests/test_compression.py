@@ -0,0 +1,153 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from infrastructure.api.compression import (
+    THREAD_MINIMUM_SIZE,
+    CompressionMiddleware,
+    negotiate,
+)
+
+ROWS = [
+    {"city": "Paris", "status": "In Progress", "details": {"n": n}} for n in range(200)
+]
+BODY = json.dumps(ROWS).encode()
+STREAM = b"".join(json.dumps(row).encode() + b"\n" for row in ROWS)
+EXPECTED = {"/big": BODY, "/stream": STREAM}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=500,
+        route_levels={"/raw": 0, "/stream": 1},
+    )
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/big")
+    def big():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/raw")
+    def raw():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/huge")
+    def huge():
+        return Response(BODY * 40, media_type="application/json")
+
+    @app.get("/stream")
+    def stream():
+        lines = (json.dumps(row).encode() + b"\n" for row in ROWS)
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def raw_get(client, path, encoding="gzip"):
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as r:
+        return r, b"".join(r.iter_raw())
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_prefers_highest_quality(accept_encoding, expected):
+    assert negotiate(accept_encoding) == expected
+
+
+def test_negotiate_ignores_unavailable_brotli():
+    assert negotiate("br, gzip;q=0.5", available=("gzip",)) == "gzip"
+
+
+def test_small_responses_are_not_compressed(client):
+    response, body = raw_get(client, "/small")
+
+    assert "content-encoding" not in response.headers
+    assert body == b'{"ok":true}'
+
+
+def test_large_responses_are_gzipped_with_weak_etag(client):
+    response, body = raw_get(client, "/big")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert gzip.decompress(body) == BODY
+    assert len(body) < len(BODY) / 5
+
+
+def test_identity_is_served_when_not_accepted(client):
+    response, body = raw_get(client, "/big", encoding="identity")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+    assert body == BODY
+
+
+def test_route_level_zero_disables_compression(client):
+    response, body = raw_get(client, "/raw")
+
+    assert "content-encoding" not in response.headers
+    assert body == BODY
+
+
+def test_streaming_responses_are_compressed_chunk_by_chunk(client):
+    response, body = raw_get(client, "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(body).splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+
+def test_identity_response_still_varies_on_accept_encoding(client):
+    response, _ = raw_get(client, "/big", encoding="identity")
+
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_already_compressed_content_types_are_left_alone(client):
+    response, body = raw_get(client, "/image")
+
+    assert "content-encoding" not in response.headers
+    assert body == BODY
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(client):
+    response, body = raw_get(client, "/huge")
+
+    assert len(BODY) * 40 >= THREAD_MINIMUM_SIZE
+    assert gzip.decompress(body) == BODY * 40
+    assert response.headers["content-length"] == str(len(body))
+
+
+@pytest.mark.parametrize("path", ["/big", "/stream"])
+def test_brotli_is_preferred_when_installed(client, path):
+    brotli = pytest.importorskip("brotli")
+
+    response, body = raw_get(client, path, encoding="gzip, br")
+
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == EXPECTED[path]
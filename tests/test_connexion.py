@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from infrastructure.database.connexion import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    configure_engine,
+    engine_options,
+    get_engine,
+    get_session,
+    session_scope,
+)
+
+
+def test_get_engine_is_process_wide():
+    assert get_engine() is get_engine()
+
+
+def test_get_session_closes_session():
+    dependency = get_session()
+    session = next(dependency)
+    session.execute(text("SELECT 1"))
+    assert session.in_transaction()
+
+    dependency.close()
+
+    assert not session.in_transaction()
+    assert get_engine().pool.checkedout() == 0
+
+
+def test_session_scope_rolls_back_on_error():
+    try:
+        with session_scope() as session:
+            session.execute(text("SELECT 1"))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert not session.in_transaction()
+    assert get_engine().pool.checkedout() == 0
+
+
+def test_connection_count_stays_flat_under_load():
+    engine = get_engine()
+    opened = []
+    listener = lambda *args: opened.append(1)  # noqa: E731
+    event.listen(engine, "connect", listener)
+
+    def handle_request(_: int) -> None:
+        # Reproduit le cycle de vie d'une dépendance FastAPI
+        dependency = get_session()
+        session = next(dependency)
+        session.execute(text("SELECT 1")).scalar()
+        try:
+            next(dependency)
+        except StopIteration:
+            pass
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(handle_request, range(10_000)))
+    finally:
+        event.remove(engine, "connect", listener)
+
+    assert len(opened) <= DB_POOL_SIZE + DB_MAX_OVERFLOW
+    assert engine.pool.checkedout() == 0
+
+
+@pytest.fixture
+def sqlite_engines(tmp_path):
+    url = f"sqlite:///{tmp_path}/profile.db"
+    writer = configure_engine(create_engine(url, **engine_options(url)))
+    reader = configure_engine(
+        create_engine(url, **engine_options(url, read_only=True)), read_only=True
+    )
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO item VALUES (1)"))
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+def test_sqlite_engines_split_one_writer_and_a_reader_pool(tmp_path):
+    url = f"sqlite:///{tmp_path}/profile.db"
+
+    assert engine_options(url)["pool_size"] == 1
+    assert engine_options(url)["max_overflow"] == 0
+    assert engine_options(url, read_only=True)["pool_size"] == DB_POOL_SIZE
+    assert "pool_size" not in engine_options("sqlite://")
+
+
+def test_sqlite_profile_pragmas_are_applied_on_connect(sqlite_engines):
+    writer, _ = sqlite_engines
+
+    names = ("journal_mode", "synchronous", "busy_timeout", "temp_store", "cache_size")
+    with writer.connect() as conn:
+        pragmas = {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in names
+        }
+
+    # synchronous 1 = NORMAL, temp_store 2 = MEMORY
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "busy_timeout": 5000,
+        "temp_store": 2,
+        "cache_size": -65536,
+    }
+
+
+def test_readers_neither_write_nor_wait_for_the_writer(sqlite_engines):
+    writer, reader = sqlite_engines
+
+    with writer.begin() as write:
+        write.execute(text("INSERT INTO item VALUES (2)"))
+        # Transaction d'écriture ouverte : la lecture voit le dernier COMMIT
+        with reader.connect() as read:
+            assert read.execute(text("SELECT count(*) FROM item")).scalar() == 1
+
+    with reader.connect() as read:
+        assert read.execute(text("SELECT count(*) FROM item")).scalar() == 2
+        with pytest.raises(OperationalError, match="readonly"):
+            read.execute(text("DELETE FROM item"))
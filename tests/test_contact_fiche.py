@@ -1,10 +1,12 @@
 import json
+from datetime import date, time
 from pathlib import Path
 
 import pytest
 
 from config.works_schemas_config import WorkSchemaConfigService
 from contact_fiche.contact_fiche_usecases import (
+    AgendaUsecase,
     CompletionFicheUsecase,
     CreateFicheUsecase,
     DeleteFicheUsecase,
@@ -13,6 +15,7 @@ from contact_fiche.contact_fiche_usecases import (
 )
 from contact_fiche.entities.works_planned_entity import WorksPlanned
 from contact_fiche.enums import Status
+from contact_fiche.exceptions import FicheConflictError
 from contact_fiche.in_memory_fiche_repository import InMemoryFicheRepository
 
 
@@ -116,6 +119,34 @@ def test_create_fiche(repository):
     assert fetched_fiche.status == Status.IN_PROGRESS
 
 
+def test_rdv_is_typed_and_serialized_to_the_minute(new_fiche):
+    assert (new_fiche.date_rdv, new_fiche.heure_rdv) == (date(2025, 1, 15), time(14))
+
+    new_fiche.heure_rdv = "09:05:42"
+
+    assert new_fiche.heure_rdv == time(9, 5)
+    dumped = json.loads(new_fiche.model_dump_json())
+    assert (dumped["date_rdv"], dumped["heure_rdv"]) == ("2025-01-15", "09:05")
+
+
+def test_update_fiche_parses_rdv_strings(repository, new_fiche):
+    fiche = UpdateFicheUsecase(repository)(
+        new_fiche.id, new_date_rdv="2025-02-01", new_heure_rdv="10:30:45"
+    )
+
+    assert (fiche.date_rdv, fiche.heure_rdv) == (date(2025, 2, 1), time(10, 30))
+
+
+def test_update_fiche_rejects_invalid_date(repository, new_fiche):
+    with pytest.raises(ValueError):
+        UpdateFicheUsecase(repository)(new_fiche.id, new_date_rdv="15/01/2025")
+
+
+def test_agenda_rejects_reversed_range(repository):
+    with pytest.raises(ValueError):
+        AgendaUsecase(repository)(date(2025, 2, 1), date(2025, 1, 1))
+
+
 def test_cant_update_fiche_not_existing(repository):
     update_usecase = UpdateFicheUsecase(repository)
 
@@ -132,6 +163,15 @@ def test_update_fiche_lastname_only(repository, new_fiche):
     assert fetched_fiche.lastname == "new_name"
 
 
+def test_update_fiche_checks_expected_version(repository, new_fiche):
+    update_usecase = UpdateFicheUsecase(repository)
+    update_usecase(new_fiche.id, new_lastname="Martin", expected_version=1)
+
+    with pytest.raises(FicheConflictError):
+        update_usecase(new_fiche.id, new_lastname="Durand", expected_version=1)
+    assert repository.get_by_id(new_fiche.id).lastname == "Martin"
+
+
 def test_update_fiche_firstname_only(repository, new_fiche):
     update_usecase = UpdateFicheUsecase(repository)
     updated_fiche = update_usecase(new_fiche.id, new_firstname="new_firstname")
@@ -284,3 +324,117 @@ def test_get_schema_invalid_key(sample_config_file):
     # Pour une clé qui n'existe pas, la méthode doit retourner un dictionnaire vide
     non_existent = service.get_schema("non_existent")
     assert non_existent == {}
+
+
+def test_completion_fiche(repository, new_fiche, config_service):
+    completion_fiche_usecase = CompletionFicheUsecase(repository, config_service)
+    details = {"type_window": "Fenetre 2 vantaux", "hauteur": 120}
+
+    completed = completion_fiche_usecase(
+        new_fiche.id, works_data=[{"work": "fenetre", "details": details}]
+    )
+
+    assert completed.status == Status.COMPLETED
+    assert completed.works_planned[0].details == details
+
+
+def test_cant_completion_fiche_invalid_details(repository, new_fiche, config_service):
+    completion_fiche_usecase = CompletionFicheUsecase(repository, config_service)
+
+    # Une fenêtre 1 vantail exige le champ "tirant"
+    with pytest.raises(ValueError):
+        completion_fiche_usecase(
+            new_fiche.id,
+            works_data=[
+                {"work": "fenetre", "details": {"type_window": "Fenetre 1 vantail"}}
+            ],
+        )
+
+
+def test_validators_are_compiled_once(config_service):
+    validator = config_service.get_validator("fenetre")
+
+    assert validator is not None
+    assert config_service.get_validator("fenetre") is validator
+    assert config_service.get_validator("definitions") is None
+    assert config_service.get_validator("non_existent") is None
+
+
+def test_validator_resolves_shared_definitions(tmp_path: Path):
+    data = {
+        "definitions": {"positive": {"type": "number", "minimum": 0}},
+        "porte": {"properties": {"hauteur": {"$ref": "#/definitions/positive"}}},
+    }
+    config_file = tmp_path / "work_schemas.json"
+    config_file.write_text(json.dumps(data))
+
+    validator = WorkSchemaConfigService(config_path=str(config_file)).get_validator(
+        "porte"
+    )
+
+    assert validator.is_valid({"hauteur": 200})
+    assert not validator.is_valid({"hauteur": -1})
+
+
+def test_config_reloads_when_file_changes(sample_config_file):
+    service = WorkSchemaConfigService(config_path=sample_config_file, reload_interval=0)
+    previous_hash = service.content_hash
+
+    Path(sample_config_file).write_text(json.dumps({"volet": {"fields": []}}))
+
+    assert "volet" in service.get_all_schemas()
+    assert service.get_schema("fenetre") == {}
+    assert service.content_hash != previous_hash
+
+
+def test_config_not_reloaded_before_interval(sample_config_file):
+    service = WorkSchemaConfigService(
+        config_path=sample_config_file, reload_interval=3600
+    )
+
+    Path(sample_config_file).write_text(json.dumps({"volet": {"fields": []}}))
+
+    assert "fenetre" in service.get_all_schemas()
+
+
+def test_config_keeps_last_valid_version_on_broken_file(sample_config_file):
+    service = WorkSchemaConfigService(config_path=sample_config_file, reload_interval=0)
+
+    Path(sample_config_file).write_text("{ invalide")
+
+    assert "fenetre" in service.get_all_schemas()
+    assert service.get_validator("fenetre") is not None
+
+
+def test_shared_config_service_is_singleton():
+    from config.works_schemas_config import get_work_schema_config_service
+
+    assert get_work_schema_config_service() is get_work_schema_config_service()
+
+
+def test_bulk_create_reports_each_item(repository):
+    from contact_fiche.contact_fiche_usecases import BulkCreateFicheUsecase
+
+    valid = {
+        "lastname": "Martin",
+        "firstname": "Hélène",
+        "date_rdv": "2025-02-01",
+        "heure_rdv": "10:00",
+        "telephone": "0601020304",
+        "email": "helene@mail.com",
+        "address": "2 rue de Lyon",
+        "code_postal": "69000",
+        "city": "Lyon",
+        "type_logement": "Maison",
+        "statut_habitation": "Propriétaire",
+        "origin_contact": "Salon",
+        "commentary": "",
+    }
+    bulk_usecase = BulkCreateFicheUsecase(repository)
+
+    results = bulk_usecase([valid, {"lastname": "Incomplet"}, valid], upsert=True)
+
+    assert [r.status for r in results] == ["created", "error", "updated"]
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].id == results[2].id
+    assert repository.get_by_id(results[0].id).status == Status.IN_PROGRESS
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+
+from infrastructure.api.export import CSV_COLUMNS, chunked, csv_lines, ndjson_lines
+
+ROWS = [
+    {
+        "id": "abc",
+        "lastname": "Dupont",
+        "firstname": "Hélène",
+        "date_rdv": "2025-01-15",
+        "heure_rdv": "14:00",
+        "telephone": "0601020304",
+        "email": "helene@mail.com",
+        "address": "10 rue de la Paix",
+        "code_postal": "75000",
+        "city": "Paris",
+        "type_logement": "Maison",
+        "statut_habitation": "Propriétaire",
+        "origin_contact": "Salon",
+        "status": "In Progress",
+        "commentary": "Rappeler, lundi",
+        "planned_works": ["fenetre"],
+        "works_planned": [{"work": "fenetre", "details": {"hauteur": 120}}],
+    }
+]
+
+
+def test_ndjson_lines_one_object_per_line():
+    body = b"".join(ndjson_lines(ROWS * 3)).decode("utf-8")
+
+    lines = body.splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0]) == ROWS[0]
+
+
+def test_csv_lines_serializes_nested_columns_as_json():
+    body = b"".join(csv_lines(ROWS)).decode("utf-8")
+
+    reader = csv.DictReader(io.StringIO(body))
+    assert reader.fieldnames == CSV_COLUMNS
+    row = next(reader)
+    assert row["firstname"] == "Hélène"
+    assert row["commentary"] == "Rappeler, lundi"
+    assert json.loads(row["works_planned"]) == ROWS[0]["works_planned"]
+
+
+def test_chunked_groups_lines_without_losing_bytes():
+    lines = [b"x" * 10 for _ in range(25)]
+
+    chunks = list(chunked(lines, chunk_size=64))
+
+    assert b"".join(chunks) == b"".join(lines)
+    assert all(len(chunk) >= 64 for chunk in chunks[:-1])
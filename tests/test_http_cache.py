@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from fastapi import Request
+
+from infrastructure.api.http_cache import (
+    cache_headers,
+    conditional,
+    is_not_modified,
+    not_modified,
+    version_etag,
+)
+from infrastructure.api.responses import ModelJSONResponse
+
+UPDATED_AT = datetime(2026, 10, 18, 9, 30, 15, 123456)
+
+
+def request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), v.encode()) for name, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = version_etag(3)
+
+    assert is_not_modified(request(if_none_match='"3"'), etag)
+    assert is_not_modified(request(if_none_match='W/"1", W/"3"'), etag)
+    assert is_not_modified(request(if_none_match="*"), etag)
+    assert not is_not_modified(request(if_none_match='W/"2"'), etag)
+
+
+def test_if_modified_since_has_second_precision():
+    headers = cache_headers(version_etag(1), "private, no-cache", UPDATED_AT)
+    assert headers["Last-Modified"] == "Sun, 18 Oct 2026 09:30:15 GMT"
+
+    since = request(if_modified_since=headers["Last-Modified"])
+    assert is_not_modified(since, '"x"', UPDATED_AT)
+    assert not is_not_modified(since, '"x"', UPDATED_AT + timedelta(seconds=1))
+    assert not is_not_modified(request(if_modified_since="hier"), '"x"', UPDATED_AT)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = cache_headers(version_etag(2), "private, no-cache", UPDATED_AT)
+    stale = request(
+        if_none_match=version_etag(1), if_modified_since=headers["Last-Modified"]
+    )
+
+    assert not_modified(stale, headers) is None
+
+
+def test_not_modified_keeps_validators_without_body():
+    headers = cache_headers(version_etag(1), "private, no-cache", UPDATED_AT)
+
+    response = not_modified(request(if_none_match='W/"1"'), headers)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == 'W/"1"'
+    assert response.headers["last-modified"] == headers["Last-Modified"]
+
+
+def test_conditional_hashes_the_rendered_body():
+    first = conditional(request(), ModelJSONResponse(["Paris"]), "private")
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private"
+    assert (
+        conditional(request(), ModelJSONResponse(["Paris"]), "private").headers["etag"]
+        == etag
+    )
+    assert (
+        conditional(request(), ModelJSONResponse(["Lyon"]), "private").headers["etag"]
+        != etag
+    )
+    cached = ModelJSONResponse(["Paris"], headers={"X-Next-Cursor": "abc"})
+    response = conditional(request(if_none_match=etag), cached, "private")
+    assert response.status_code == 304
+    assert response.headers["x-next-cursor"] == "abc"
@@ -0,0 +1,100 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jsonschema import Draft7Validator
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from contact_fiche.contact_fiche_usecases import validate_works
+from infrastructure.api.metrics_middleware import MetricsMiddleware
+from infrastructure.database.instrumentation import instrument_engine
+from infrastructure.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    MetricsRegistry,
+    start_request,
+)
+
+
+def test_histogram_renders_cumulative_buckets_in_prometheus_format():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "latency_seconds", "Latence.", ("route",), buckets=(0.1, 1.0)
+    )
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route='/a"b')
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latence.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 4.25',
+        'latency_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_engine_hooks_add_queries_and_pool_wait_to_the_current_request():
+    engine = instrument_engine(
+        create_engine("sqlite://", poolclass=StaticPool, future=True)
+    )
+    metrics = start_request()
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+
+    assert metrics.db_queries == 2
+    assert metrics.db_time > 0
+    assert metrics.pool_wait > 0
+
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 3"))
+    assert metrics.db_queries == 3
+
+
+class AnyObjectSchema:
+    def get_validator(self, work):
+        return Draft7Validator({"type": "object"})
+
+
+def test_validate_works_reports_each_validation():
+    observed = []
+
+    validate_works(
+        AnyObjectSchema(),
+        [{"work": "fenetre", "details": {}}, {"work": "porte", "details": {}}],
+        observe=lambda work, seconds: observed.append((work, seconds)),
+    )
+
+    assert [work for work, _ in observed] == ["fenetre", "porte"]
+    assert all(seconds >= 0 for _, seconds in observed)
+
+
+def test_middleware_records_route_template_status_and_log_fields(caplog):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = HTTP_REQUEST_DURATION.count(**labels)
+
+    with caplog.at_level(logging.INFO, "infrastructure.api.metrics_middleware"):
+        TestClient(app).get("/items/1")
+        TestClient(app).get("/items/2")
+
+    assert HTTP_REQUEST_DURATION.count(**labels) == before + 2
+    assert HTTP_REQUESTS.value(**labels, status="200") >= 2
+    assert HTTP_REQUESTS_IN_FLIGHT.value() == 0
+    record = [
+        r for r in caplog.records if r.name == "infrastructure.api.metrics_middleware"
+    ][-1]
+    assert (record.http_route, record.http_status) == ("/items/{item_id}", 200)
+    assert record.duration_ms > 0
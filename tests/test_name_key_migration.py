@@ -0,0 +1,65 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from contact_fiche.fiche_filter import FicheFilter, name_key
+from infrastructure.database.fiche_model import Base
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+
+MIGRATION = Path(__file__).parent.parent / "migrations" / "012_name_key_columns.py"
+
+
+@pytest.fixture(scope="module")
+def migration():
+    spec = importlib.util.spec_from_file_location("name_key_columns", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("name", ["Émile", "ÉMILE", "émile", "Strauß", "Doe"])
+def test_migration_computes_the_same_key_as_the_api(migration, name):
+    assert migration.name_key(name) == name_key(name)
+
+
+def test_missing_and_stale_keys_are_rewritten(migration, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE INDEX ix_fiche_lower_lastname ON fiche (lower(lastname))")
+        )
+        for id, lastname, lastname_key in [
+            ("new", "Émile", None),
+            ("renamed", "Élise", "martin"),
+            ("clean", "Doe", "doe"),
+        ]:
+            conn.execute(
+                text(
+                    "INSERT INTO fiche (id, lastname, firstname, lastname_key,"
+                    " firstname_key, date_rdv, heure_rdv, telephone, email, address,"
+                    " code_postal, city, type_logement, statut_habitation,"
+                    " origin_contact, status, commentary, version)"
+                    " VALUES (:id, :lastname, 'John', :lastname_key, 'john',"
+                    " '2025-01-15', '14:00', '0102', 'a@b.fr', '1 rue', '75000',"
+                    " 'Paris', 'Maison', 'Propriétaire', 'SALON', 'IN_PROGRESS',"
+                    " '', 1)"
+                ),
+                {"id": id, "lastname": lastname, "lastname_key": lastname_key},
+            )
+
+    assert migration.migrate(engine, batch_size=2) == 2
+    assert migration.migrate(engine) == 0
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("fiche")}
+    assert {"ix_fiche_lastname_key", "ix_fiche_firstname_key"} <= indexes
+    assert "ix_fiche_lower_lastname" not in indexes
+    with Session(engine) as session:
+        page = SQLiteFicheRepository(session=session).find(
+            FicheFilter(lastname_prefix="é"), limit=10
+        )
+    assert sorted(f.id for f in page.items) == ["new", "renamed"]
+    engine.dispose()
@@ -0,0 +1,170 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session
+
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import Status
+from contact_fiche.fiche_filter import FicheFilter
+from contact_fiche.pagination import encode_agenda_cursor, encode_cursor
+from infrastructure.database.fiche_model import Base, FicheModel
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+from tests.test_sqlite_fiche_repository import make_fiche
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, action):
+    """Exécute `action` et retourne le plan SQLite de chaque SELECT/DELETE émis."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    with engine.connect() as conn:
+        return [
+            " | ".join(
+                row[-1]
+                for row in conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + statement, parameters
+                )
+            )
+            for statement, parameters in statements
+        ]
+
+
+@pytest.fixture
+def repository(engine):
+    with Session(engine) as session:
+        repository = SQLiteFicheRepository(session=session)
+        for day in range(1, 21):
+            repository.save(make_fiche(date_rdv=f"2025-01-{day:02d}"))
+        yield repository
+
+
+def test_get_en_cours_uses_status_index(engine, repository):
+    fiche_plan, works_plan = query_plans(engine, repository.get_en_cours)
+
+    assert "USING INDEX ix_fiche_status_date_rdv_id (status=?)" in fiche_plan
+    assert "USING INDEX ix_work_planned_fiche_id" in works_plan
+
+
+def test_list_page_walks_date_rdv_index_without_sorting(engine, repository):
+    fiche_plan, _ = query_plans(engine, lambda: repository.list_page(limit=5))
+
+    assert "ix_fiche_date_rdv_id" in fiche_plan
+    assert "TEMP B-TREE" not in fiche_plan
+
+
+def test_list_page_by_status_uses_composite_index(engine, repository):
+    cursor = encode_cursor(date(2025, 1, 10), "")
+
+    fiche_plan, _ = query_plans(
+        engine,
+        lambda: repository.list_page(limit=5, cursor=cursor, status=Status.IN_PROGRESS),
+    )
+
+    assert "ix_fiche_status_date_rdv_id" in fiche_plan
+    assert "TEMP B-TREE" not in fiche_plan
+
+
+def test_agenda_is_a_range_scan_in_appointment_order(engine, repository):
+    cursor = encode_agenda_cursor(date(2025, 1, 5), time(14, 0), "")
+
+    fiche_plan, _ = query_plans(
+        engine,
+        lambda: repository.agenda(
+            date(2025, 1, 3), date(2025, 1, 9), limit=5, cursor=cursor
+        ),
+    )
+
+    assert "USING INDEX ix_fiche_date_rdv_heure_rdv_id (date_rdv>? AND" in fiche_plan
+    assert "TEMP B-TREE" not in fiche_plan
+
+
+def test_find_by_name_prefix_uses_name_key_index(engine, repository):
+    fiche_plan, _ = query_plans(
+        engine, lambda: repository.find(FicheFilter(lastname_prefix="Do"), limit=5)
+    )
+
+    assert (
+        "USING INDEX ix_fiche_lastname_key (lastname_key>? AND lastname_key<?)"
+        in fiche_plan
+    )
+
+
+def test_find_by_code_postal_prefix_uses_index(engine, repository):
+    fiche_plan, _ = query_plans(
+        engine, lambda: repository.find(FicheFilter(code_postal_prefix="75"), limit=5)
+    )
+
+    assert "ix_fiche_code_postal (code_postal>? AND code_postal<?)" in fiche_plan
+
+
+def test_distinct_cities_reads_city_index_only(engine, repository):
+    (plan,) = query_plans(
+        engine,
+        lambda: repository.session.execute(select(FicheModel.city).distinct()).all(),
+    )
+
+    assert "COVERING INDEX ix_fiche_city" in plan
+
+
+def test_update_looks_up_works_by_fiche_id_index(engine, repository):
+    fiche = make_fiche(works_planned=[WorksPlanned(work="fenetre", details={})])
+    repository.save(fiche)
+
+    plans = query_plans(engine, lambda: repository.update(fiche.id, fiche))
+
+    assert any("USING INDEX ix_work_planned_fiche_id" in plan for plan in plans)
+    assert not any("SCAN work_planned" in plan for plan in plans)
+
+
+def test_find_by_works_uses_promoted_columns_index(engine, repository):
+    for materiau, color in [("PVC", "BLANC"), ("ALU", "ALU_OPTION1")] * 10:
+        material_color = {"materiau": materiau, "color": color}
+        repository.save(
+            make_fiche(
+                works_planned=[
+                    WorksPlanned(
+                        work="fenetre", details={"material_color": material_color}
+                    )
+                ]
+            )
+        )
+    repository.session.execute(text("ANALYZE"))
+    filters = FicheFilter(work="fenetre", materiau="PVC", color="BLANC")
+
+    fiche_plan, _ = query_plans(engine, lambda: repository.find(filters, limit=5))
+
+    assert (
+        "ix_work_planned_work_materiau_color (work=? AND materiau=? AND color=?)"
+        in fiche_plan
+    )
+
+
+def test_delete_removes_search_row_by_rowid(engine, repository):
+    fiche = make_fiche()
+    repository.save(fiche)
+
+    plans = query_plans(engine, lambda: repository.delete(fiche.id))
+
+    # "INDEX 0:" seul serait un parcours de toute la table FTS5
+    search_plans = [plan for plan in plans if "fiche_search" in plan]
+    assert search_plans == ["SCAN fiche_search VIRTUAL TABLE INDEX 0:="]
+    assert repository.search("doe", limit=50)
+    assert fiche.id not in [f.id for f in repository.search("doe", limit=50)]
@@ -0,0 +1,118 @@
+import importlib.util
+from datetime import date, time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from infrastructure.database.fiche_model import Base
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+from tests.test_sqlite_fiche_repository import make_fiche
+
+MIGRATION = Path(__file__).parent.parent / "migrations" / "009_typed_rdv_columns.py"
+
+
+@pytest.fixture(scope="module")
+def migration():
+    spec = importlib.util.spec_from_file_location("typed_rdv_columns", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("2025-01-15", date(2025, 1, 15)),
+        (" 15/01/2025 ", date(2025, 1, 15)),
+        ("15.01.2025", date(2025, 1, 15)),
+        ("2025-01-15T14:00:00", date(2025, 1, 15)),
+        ("15/01/25", date(2025, 1, 15)),
+        ("mi-janvier", None),
+        ("31/02/2025", None),
+    ],
+)
+def test_parse_date(migration, raw, expected):
+    assert migration.parse_date(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("14:30", time(14, 30)),
+        ("14h30", time(14, 30)),
+        ("9H", time(9)),
+        ("09:05:42", time(9, 5)),
+        ("14.30", time(14, 30)),
+        ("matin", None),
+        ("25:00", None),
+    ],
+)
+def test_parse_time(migration, raw, expected):
+    assert migration.parse_time(raw) == expected
+
+
+def test_sqlite_rows_are_normalized_in_batches(migration, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    Base.metadata.create_all(engine)
+    legacy = {
+        "clean": ("2025-01-15", "14:00"),
+        "french": ("16/01/2025", "9h30"),
+        "iso": ("2025-01-17T00:00:00", "10:15:00"),
+        "broken": ("bientôt", "14:00"),
+    }
+    with engine.begin() as conn:
+        for id, (date_rdv, heure_rdv) in legacy.items():
+            conn.execute(
+                text(
+                    "INSERT INTO fiche (id, lastname, firstname, date_rdv, heure_rdv,"
+                    " telephone, email, address, code_postal, city, type_logement,"
+                    " statut_habitation, origin_contact, status, commentary, version)"
+                    " VALUES (:id, 'Doe', 'John', :date_rdv, :heure_rdv, '0102',"
+                    " 'a@b.fr', '1 rue', '75000', 'Paris', 'Maison', 'Propriétaire',"
+                    " 'SALON', 'IN_PROGRESS', '', 1)"
+                ),
+                {"id": id, "date_rdv": date_rdv, "heure_rdv": heure_rdv},
+            )
+
+    failures = migration.migrate(engine, batch_size=2)
+
+    assert failures == [("broken", "bientôt", "14:00")]
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, date_rdv, heure_rdv, version FROM fiche ORDER BY id")
+        ).all()
+    assert [tuple(row) for row in rows] == [
+        ("broken", "bientôt", "14:00", 1),
+        ("clean", "2025-01-15", "14:00", 1),
+        ("french", "2025-01-16", "09:30", 2),
+        ("iso", "2025-01-17", "10:15", 2),
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM fiche WHERE id = 'broken'"))
+    assert migration.migrate(engine) == []
+    with Session(engine) as session:
+        repository = SQLiteFicheRepository(session=session)
+        page = repository.agenda(date(2025, 1, 1), date(2025, 1, 31), limit=10)
+    assert [(f.id, f.heure_rdv) for f in page.items] == [
+        ("clean", time(14)),
+        ("french", time(9, 30)),
+        ("iso", time(10, 15)),
+    ]
+    engine.dispose()
+
+
+def test_new_fiches_are_stored_in_the_migrated_format(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/new.db")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        SQLiteFicheRepository(session=session).save(
+            make_fiche(id="new", date_rdv="2025-03-01", heure_rdv="08:05")
+        )
+        session.commit()
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT date_rdv, heure_rdv FROM fiche")).one()
+    assert tuple(row) == ("2025-03-01", "08:05")
+    engine.dispose()
@@ -0,0 +1,48 @@
+import json
+from typing import List
+
+from pydantic import TypeAdapter
+
+from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import OriginContact, Status
+from infrastructure.api.responses import FicheListResponse
+
+FICHE = Fiche(
+    id="abc",
+    lastname="Dupont",
+    firstname="Hélène",
+    date_rdv="2025-01-15",
+    heure_rdv="14:00",
+    telephone="0601020304",
+    email="helene@mail.com",
+    address="10 rue de la Paix",
+    code_postal="75000",
+    city="Paris",
+    type_logement="Maison",
+    statut_habitation="Propriétaire",
+    origin_contact=OriginContact.SALON,
+    status=Status.IN_PROGRESS,
+    commentary="",
+    planned_works=["fenetre"],
+    works_planned=[WorksPlanned(work="fenetre", details={"hauteur": 120})],
+)
+
+
+def test_fiche_list_response_matches_response_model_serialization():
+    response = FicheListResponse([FICHE])
+
+    expected = TypeAdapter(List[Fiche]).dump_json([FICHE])
+    assert json.loads(response.body) == json.loads(expected)
+    assert response.media_type == "application/json"
+
+
+def test_fiche_list_response_encodes_enums_and_details_as_json():
+    body = json.loads(FicheListResponse([FICHE]).body)
+
+    assert body[0]["origin_contact"] == "Salon"
+    assert body[0]["status"] == "In Progress"
+    assert body[0]["firstname"] == "Hélène"
+    assert body[0]["works_planned"] == [
+        {"work": "fenetre", "details": {"hauteur": 120}}
+    ]
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, MetaData, String, Table, create_engine, event, inspect
+
+from infrastructure.database.schema_ddl import create_with_table
+
+
+def test_ddl_runs_only_when_the_anchor_table_is_created(tmp_path):
+    metadata = MetaData()
+    Table("fiche", metadata, Column("id", String, primary_key=True))
+    create_with_table(metadata, "fiche", "sqlite", ["CREATE TABLE annexe (id VARCHAR)"])
+    engine = create_engine(f"sqlite:///{tmp_path}/schema.db")
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    metadata.create_all(engine)
+    assert "annexe" in inspect(engine).get_table_names()
+
+    # Base existante (redémarrage d'un worker) : aucun DDL rejoué
+    statements.clear()
+    metadata.create_all(engine)
+    assert not [s for s in statements if s.lstrip().startswith("CREATE")]
+
+    other = MetaData()
+    Table("fiche", other, Column("id", String, primary_key=True))
+    create_with_table(other, "fiche", "postgresql", ["SELECT invalid"])
+    other.create_all(create_engine("sqlite://"))
+    engine.dispose()
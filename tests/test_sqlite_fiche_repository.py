@@ -0,0 +1,701 @@
+from datetime import date, time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from contact_fiche.entities.fiche_entity import Fiche
+from contact_fiche.entities.works_planned_entity import WorksPlanned
+from contact_fiche.enums import OriginContact, StatsDimension, Status
+from contact_fiche.exceptions import FicheConflictError
+from contact_fiche.fiche_filter import FicheFilter, parse_detail_criteria
+from contact_fiche.in_memory_fiche_repository import InMemoryFicheRepository
+from infrastructure.database.fiche_model import Base
+from infrastructure.database.fiche_stats import rebuild_stats
+from infrastructure.repositories.sqlite_fiche_repository import SQLiteFicheRepository
+
+
+def make_fiche(**overrides) -> Fiche:
+    data = dict(
+        id=uuid4().hex,
+        lastname="Doe",
+        firstname="John",
+        date_rdv="2025-01-15",
+        heure_rdv="14:00",
+        telephone="0123456789",
+        email="johndoe@gmail.com",
+        address="1 rue de Paris",
+        code_postal="75000",
+        city="Paris",
+        type_logement="Maison",
+        statut_habitation="Propriétaire",
+        origin_contact=OriginContact.SALON,
+        commentary="",
+        status=Status.IN_PROGRESS,
+    )
+    data.update(overrides)
+    return Fiche(**data)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture(params=["memory", "sql"])
+def any_repository(request, session):
+    if request.param == "memory":
+        return InMemoryFicheRepository()
+    return SQLiteFicheRepository(session=session)
+
+
+def test_list_page_walks_all_fiches_in_order(any_repository):
+    fiches = [
+        make_fiche(date_rdv=f"2025-01-{day:02d}", id=f"{day:02d}-{n}")
+        for day in (3, 1, 2)
+        for n in range(3)
+    ]
+    for fiche in fiches:
+        any_repository.save(fiche)
+
+    seen = []
+    cursor = None
+    while True:
+        page = any_repository.list_page(limit=4, cursor=cursor)
+        seen.extend(f.id for f in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = sorted(fiches, key=lambda f: (f.date_rdv, f.id))
+    assert seen == [f.id for f in expected]
+
+
+def test_list_page_filters_on_status(any_repository):
+    any_repository.save(make_fiche(status=Status.IN_PROGRESS))
+    any_repository.save(make_fiche(status=Status.COMPLETED))
+
+    page = any_repository.list_page(limit=10, status=Status.IN_PROGRESS)
+
+    assert [f.status for f in page.items] == [Status.IN_PROGRESS]
+    assert page.next_cursor is None
+
+
+def test_agenda_walks_the_range_in_appointment_order(any_repository):
+    slots = [
+        ("2025-01-06", "16:00"),
+        ("2025-01-06", "09:30"),
+        ("2025-01-07", "08:00"),
+        ("2025-01-07", "08:00"),
+        ("2025-01-05", "10:00"),
+        ("2025-01-08", "10:00"),
+    ]
+    fiches = [
+        make_fiche(id=f"{n:02d}", date_rdv=day, heure_rdv=hour)
+        for n, (day, hour) in enumerate(slots)
+    ]
+    for fiche in fiches:
+        any_repository.save(fiche)
+
+    seen, cursor = [], None
+    while True:
+        page = any_repository.agenda(
+            date(2025, 1, 6), date(2025, 1, 7), limit=2, cursor=cursor
+        )
+        seen.extend(f.id for f in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == ["01", "00", "02", "03"]
+
+
+def test_list_page_rejects_invalid_cursor(any_repository):
+    with pytest.raises(ValueError):
+        any_repository.list_page(limit=10, cursor="pas-un-curseur")
+
+
+def seed_fiches_with_works(repository, count: int) -> None:
+    for n in range(count):
+        repository.save(
+            make_fiche(
+                works_planned=[
+                    WorksPlanned(work="fenetre", details={"hauteur": n}),
+                    WorksPlanned(work="porte_entree", details={"largeur": n}),
+                ]
+            )
+        )
+    repository.session.expunge_all()
+
+
+@pytest.mark.parametrize(
+    "list_fiches",
+    [
+        lambda repository: repository.get_all(),
+        lambda repository: repository.get_en_cours(),
+        lambda repository: repository.list_page(limit=100).items,
+    ],
+    ids=["get_all", "get_en_cours", "list_page"],
+)
+def test_listing_costs_constant_number_of_queries(session, list_fiches):
+    repository = SQLiteFicheRepository(session=session)
+    seed_fiches_with_works(repository, 50)
+
+    with repository.count_statements() as counter:
+        fiches = list_fiches(repository)
+
+    assert len(fiches) == 50
+    assert all(len(f.works_planned) == 2 for f in fiches)
+    # Un SELECT pour les fiches + un SELECT IN (...) pour les travaux
+    assert counter.count == 2
+
+
+def test_iter_all_streams_json_ready_rows(session):
+    repository = SQLiteFicheRepository(session=session)
+    seed_fiches_with_works(repository, 30)
+
+    rows = list(repository.iter_all(batch_size=7))
+
+    expected = [f.model_dump(mode="json") for f in repository.get_all()]
+    assert sorted(rows, key=lambda r: r["id"]) == sorted(
+        expected, key=lambda r: r["id"]
+    )
+
+
+def test_save_many_creates_all_fiches(any_repository):
+    fiches = [make_fiche(telephone=f"06000000{n:02d}") for n in range(7)]
+
+    results = any_repository.save_many(fiches, chunk_size=3)
+
+    assert [r.status for r in results] == ["created"] * 7
+    assert [r.index for r in results] == list(range(7))
+    assert all(any_repository.get_by_id(f.id) is not None for f in fiches)
+
+
+def test_save_many_upserts_on_natural_key(any_repository):
+    original = make_fiche(
+        status=Status.COMPLETED,
+        works_planned=[WorksPlanned(work="fenetre", details={"hauteur": 1})],
+    )
+    any_repository.save(original)
+    replaced = make_fiche(
+        city="Nice",
+        works_planned=[WorksPlanned(work="volet", details={"largeur": 1})],
+    )
+    incoming = make_fiche(
+        city="Lyon",
+        works_planned=[WorksPlanned(work="porte_entree", details={"largeur": 2})],
+    )
+    created = make_fiche(
+        telephone="0600000001",
+        works_planned=[WorksPlanned(work="volet", details={"largeur": 1})],
+    )
+    recreated = created.model_copy(
+        update={
+            "id": "ignored",
+            "city": "Lille",
+            "works_planned": [WorksPlanned(work="fenetre", details={"hauteur": 3})],
+        }
+    )
+
+    # Une clé répétée dans le lot : la dernière occurrence l'emporte
+    results = any_repository.save_many(
+        [replaced, incoming, created, recreated], upsert=True
+    )
+
+    assert [(r.status, r.id) for r in results] == [
+        ("updated", original.id),
+        ("updated", original.id),
+        ("created", created.id),
+        ("updated", created.id),
+    ]
+    stored = any_repository.get_by_id(original.id)
+    assert stored.city == "Lyon"
+    assert stored.status == Status.COMPLETED
+    assert [wp.work for wp in stored.works_planned] == ["porte_entree"]
+    assert any_repository.get_by_id(incoming.id) is None
+    stored = any_repository.get_by_id(created.id)
+    assert stored.city == "Lille"
+    assert [wp.work for wp in stored.works_planned] == ["fenetre"]
+    assert any_repository.get_by_id("ignored") is None
+
+
+def test_save_many_statements_grow_per_chunk_not_per_fiche(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiches = [
+        make_fiche(works_planned=[WorksPlanned(work="fenetre", details={"n": n})])
+        for n in range(200)
+    ]
+
+    with repository.count_statements() as counter:
+        repository.save_many(fiches, chunk_size=100)
+
+    # Par lot : un INSERT multi-lignes pour les fiches, les travaux et
+    # l'index de recherche
+    assert counter.count == 2 * 3
+    assert len(repository.get_all()) == 200
+
+
+def saved_with_works(repository, *works):
+    fiche = make_fiche(
+        works_planned=[WorksPlanned(work=w, details=d) for w, d in works]
+    )
+    repository.save(fiche)
+    # Comme UpdateFicheUsecase : lecture puis update dans la même session
+    return repository.get_by_id(fiche.id)
+
+
+def test_update_without_changes_emits_no_statement(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiche = saved_with_works(repository, ("fenetre", {"n": 1}), ("volet", {"n": 2}))
+
+    with repository.count_statements() as counter:
+        repository.update(fiche.id, fiche)
+
+    assert counter.statements == []
+
+
+def test_update_writes_only_changed_columns(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiche = saved_with_works(repository, ("fenetre", {"n": 1}))
+    fiche.heure_rdv = "16:30"
+
+    with repository.count_statements() as counter:
+        repository.update(fiche.id, fiche)
+
+    (statement,) = counter.statements
+    assert statement.startswith("UPDATE fiche SET heure_rdv=?")
+    assert repository.get_by_id(fiche.id).heure_rdv == time(16, 30)
+
+
+def test_update_diffs_works_planned(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiche = saved_with_works(
+        repository,
+        ("fenetre", {"n": 1}),
+        ("porte_entree", {"n": 2}),
+        ("volet", {"n": 3}),
+        ("volet", {"n": 4}),
+    )
+    saved_at = fiche.updated_at
+    fiche.works_planned = [
+        WorksPlanned(work="fenetre", details={"n": 1}),
+        WorksPlanned(work="porte_entree", details={"n": 20}),
+        WorksPlanned(work="store", details={"n": 5}),
+        WorksPlanned(work="store", details={"n": 6}),
+    ]
+
+    with repository.count_statements() as counter:
+        repository.update(fiche.id, fiche)
+
+    # Un UPDATE (porte), un INSERT groupé (stores), un DELETE groupé (volets),
+    # et l'UPDATE de la fiche elle-même (version, updated_at)
+    assert sorted(s.split()[0] for s in counter.statements) == [
+        "DELETE",
+        "INSERT",
+        "UPDATE",
+        "UPDATE",
+    ]
+    assert fiche.version == 2
+    assert saved_at is not None and fiche.updated_at >= saved_at
+    session.expire_all()
+    assert [
+        (wp.work, wp.details) for wp in repository.get_by_id(fiche.id).works_planned
+    ] == [
+        ("fenetre", {"n": 1}),
+        ("porte_entree", {"n": 20}),
+        ("store", {"n": 5}),
+        ("store", {"n": 6}),
+    ]
+
+
+def test_transition_status_is_one_conditional_update(session):
+    repository = SQLiteFicheRepository(session=session)
+    works = [
+        WorksPlanned(work="volet", details={"n": 2}),
+        WorksPlanned(work="fenetre", details={"n": 1}),
+    ]
+    fiche = make_fiche(works_planned=works)
+    repository.save(fiche)
+
+    with repository.count_statements() as counter:
+        validated = repository.transition_status(
+            fiche.id, Status.COMPLETED, from_statuses=[Status.IN_PROGRESS]
+        )
+
+    # Les travaux reviennent dans le RETURNING : un seul aller-retour
+    assert counter.count == 1
+    assert counter.statements[0].startswith("UPDATE fiche SET status=?, version=")
+    assert "RETURNING" in counter.statements[0]
+    assert (validated.status, validated.version) == (Status.COMPLETED, 2)
+    assert validated.works_planned == works
+
+
+def test_completion_diffs_works_without_reading_them(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiche = make_fiche(works_planned=[WorksPlanned(work="volet", details={"n": 1})])
+    repository.save(fiche)
+    works = [WorksPlanned(work="volet", details={"n": 2})]
+
+    with repository.count_statements() as counter:
+        completed = repository.transition_status(
+            fiche.id, Status.COMPLETED, works_planned=works
+        )
+
+    # L'UPDATE ... RETURNING de la fiche, puis celui du travail modifié
+    assert [s.split()[0] for s in counter.statements] == ["UPDATE", "UPDATE"]
+    assert completed.works_planned == works
+    session.expire_all()
+    stored = repository.get_by_id(fiche.id)
+    assert stored is not None and stored.works_planned == works
+
+
+def test_transition_status_refuses_concurrent_validation(any_repository):
+    fiche = make_fiche()
+    any_repository.save(fiche)
+    validate = dict(status=Status.COMPLETED, from_statuses=[Status.IN_PROGRESS])
+
+    any_repository.transition_status(fiche.id, **validate)
+
+    with pytest.raises(FicheConflictError):
+        any_repository.transition_status(fiche.id, **validate)
+    with pytest.raises(ValueError):
+        any_repository.transition_status("missing", **validate)
+
+
+def test_transition_status_checks_expected_version(any_repository):
+    fiche = make_fiche()
+    any_repository.save(fiche)
+
+    with pytest.raises(FicheConflictError):
+        any_repository.transition_status(fiche.id, Status.COMPLETED, expected_version=7)
+
+    completed = any_repository.transition_status(
+        fiche.id,
+        Status.COMPLETED,
+        expected_version=1,
+        works_planned=[WorksPlanned(work="fenetre", details={})],
+    )
+    assert completed.version == 2
+    assert [wp.work for wp in any_repository.get_by_id(fiche.id).works_planned] == [
+        "fenetre"
+    ]
+
+
+def test_update_refuses_stale_version(any_repository):
+    fiche = make_fiche()
+    any_repository.save(fiche)
+    first = any_repository.get_by_id(fiche.id).model_copy(deep=True)
+    second = any_repository.get_by_id(fiche.id).model_copy(deep=True)
+
+    first.lastname = "Martin"
+    any_repository.update(fiche.id, first)
+    second.lastname = "Durand"
+
+    with pytest.raises(FicheConflictError):
+        any_repository.update(fiche.id, second)
+    assert any_repository.get_by_id(fiche.id).lastname == "Martin"
+
+
+@pytest.fixture
+def searchable(any_repository):
+    fiches = [
+        make_fiche(
+            lastname="Martin",
+            city="Lyon",
+            code_postal="69003",
+            date_rdv="2025-02-01",
+        ),
+        make_fiche(lastname="martinez", firstname="Anne", date_rdv="2025-03-01"),
+        make_fiche(
+            lastname="Doe",
+            origin_contact=OriginContact.AFFICHAGE,
+            status=Status.COMPLETED,
+            date_rdv="2025-01-10",
+        ),
+        make_fiche(lastname="Marc", code_postal="75011", date_rdv="2025-02-15"),
+    ]
+    for fiche in fiches:
+        any_repository.save(fiche)
+    return any_repository
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (FicheFilter(), ["Doe", "Martin", "Marc", "martinez"]),
+        (FicheFilter(lastname_prefix="MART"), ["Martin", "martinez"]),
+        (FicheFilter(firstname_prefix="an"), ["martinez"]),
+        (FicheFilter(city="Lyon"), ["Martin"]),
+        (FicheFilter(code_postal_prefix="7500"), ["Doe", "martinez"]),
+        (FicheFilter(status=Status.COMPLETED), ["Doe"]),
+        (
+            FicheFilter(origin_contact=OriginContact.SALON),
+            ["Martin", "Marc", "martinez"],
+        ),
+        (
+            FicheFilter(date_rdv_from="2025-02-01", date_rdv_to="2025-02-15"),
+            ["Martin", "Marc"],
+        ),
+        (
+            FicheFilter(lastname_prefix="mar", date_rdv_from="2025-02-10"),
+            ["Marc", "martinez"],
+        ),
+        (FicheFilter(lastname_prefix="mz"), []),
+    ],
+)
+def test_find_applies_filters(searchable, filters, expected):
+    page = searchable.find(filters, limit=10)
+
+    assert [f.lastname for f in page.items] == expected
+    assert page.next_cursor is None
+
+
+def test_find_paginates_filtered_results(searchable):
+    filters = FicheFilter(lastname_prefix="mar")
+
+    first = searchable.find(filters, limit=2)
+    second = searchable.find(filters, limit=2, cursor=first.next_cursor)
+
+    assert [f.lastname for f in first.items] == ["Martin", "Marc"]
+    assert [f.lastname for f in second.items] == ["martinez"]
+    assert second.next_cursor is None
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        FicheFilter(lastname_prefix="é"),
+        FicheFilter(lastname_prefix="É"),
+        FicheFilter(lastname_prefix="ÉM"),
+        # "e" + accent combinant : même nom une fois composé
+        FicheFilter(lastname_prefix="e\u0301m"),
+        FicheFilter(firstname_prefix="hél"),
+    ],
+)
+def test_find_matches_accented_name_prefixes(any_repository, filters):
+    any_repository.save(make_fiche(lastname="Émile", firstname="Hélène"))
+    any_repository.save(make_fiche(lastname="Emile", firstname="Helene"))
+
+    page = any_repository.find(filters, limit=10)
+
+    assert [f.lastname for f in page.items] == ["Émile"]
+
+
+@pytest.fixture
+def quoted(any_repository):
+    def work(name, **details):
+        return WorksPlanned(work=name, details=details)
+
+    pvc_blanc = {"materiau": "PVC", "color": "BLANC"}
+    fiches = [
+        make_fiche(
+            lastname="Fenetre PVC",
+            works_planned=[
+                work("fenetre", material_color=pvc_blanc, hauteur=150, hab_int="Oui")
+            ],
+        ),
+        make_fiche(
+            lastname="Fenetre bois",
+            date_rdv="2025-02-03",
+            works_planned=[
+                work(
+                    "fenetre",
+                    material_color={"materiau": "BOIS", "color": "CHENE CLAIR"},
+                    hauteur=120,
+                ),
+                work("porte_entree", material_color=pvc_blanc, type_pose="Neuf"),
+            ],
+        ),
+        make_fiche(
+            lastname="Store",
+            works_planned=[work("store_exterieur", color="Rouge", allege=1)],
+        ),
+        make_fiche(lastname="Sans travaux"),
+    ]
+    for fiche in fiches:
+        any_repository.save(fiche)
+    return any_repository
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (FicheFilter(work="fenetre"), ["Fenetre PVC", "Fenetre bois"]),
+        (
+            FicheFilter(work="fenetre", materiau="PVC", color="BLANC"),
+            ["Fenetre PVC"],
+        ),
+        # Matériau et couleur doivent venir du même travail
+        (FicheFilter(work="fenetre", color="BLANC"), ["Fenetre PVC"]),
+        (FicheFilter(materiau="PVC"), ["Fenetre PVC", "Fenetre bois"]),
+        (FicheFilter(color="Rouge"), ["Store"]),
+        (
+            FicheFilter(work="porte_entree", date_rdv_from="2025-02-01"),
+            ["Fenetre bois"],
+        ),
+        (FicheFilter(details={"hauteur": 120}), ["Fenetre bois"]),
+        (
+            FicheFilter(details={"material_color.color": "BLANC"}),
+            ["Fenetre PVC", "Fenetre bois"],
+        ),
+        (FicheFilter(details={"type_pose": "Neuf", "hauteur": 120}), []),
+        (FicheFilter(details={"hauteur": "150"}), []),
+        (FicheFilter(details={"allege": True}), []),
+        (FicheFilter(details={"allege": 1}), ["Store"]),
+    ],
+)
+def test_find_filters_on_validated_works(quoted, filters, expected):
+    page = quoted.find(filters, limit=10)
+
+    assert sorted(f.lastname for f in page.items) == expected
+
+
+def test_parse_detail_criteria_reads_json_values():
+    assert parse_detail_criteria(
+        ["hauteur:150", "type_pose:Neuf", "material_color.color:CHENE CLAIR"]
+    ) == {"hauteur": 150, "type_pose": "Neuf", "material_color.color": "CHENE CLAIR"}
+    with pytest.raises(ValueError):
+        parse_detail_criteria(["hauteur"])
+    with pytest.raises(ValueError):
+        FicheFilter(details={"material_color.": "PVC"})
+
+
+def test_fiche_filter_rejects_inverted_date_range():
+    with pytest.raises(ValueError):
+        FicheFilter(date_rdv_from="2025-03-01", date_rdv_to="2025-01-01")
+
+
+@pytest.fixture
+def directory(any_repository):
+    fiches = [
+        make_fiche(id="helene", lastname="Dupré", firstname="Hélène"),
+        make_fiche(
+            id="rue",
+            lastname="Martin",
+            address="12 rue Hélène Boucher",
+            telephone="06 12 34 56 78",
+        ),
+        make_fiche(id="comment", lastname="Leroy", commentary="Rappeler Hélène"),
+        make_fiche(id="other", lastname="Bernard", email="bernard@reseaux.fr"),
+    ]
+    for fiche in fiches:
+        any_repository.save(fiche)
+    return any_repository
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("helene", ["helene", "rue", "comment"]),
+        ("HÉLÈNE", ["helene", "rue", "comment"]),
+        ("dupre hel", ["helene"]),
+        ("Réseaux", ["other"]),
+        ("06 12 34", ["rue"]),
+        ("0612", ["rue"]),
+        ("introuvable", []),
+        ("  ", []),
+    ],
+)
+def test_search_is_ranked_and_accent_insensitive(directory, query, expected):
+    assert [f.id for f in directory.search(query, limit=10)] == expected
+
+
+def test_search_index_follows_writes(any_repository):
+    fiche = make_fiche(lastname="Hélie")
+    any_repository.save(fiche)
+
+    any_repository.update(fiche.id, fiche.model_copy(update={"lastname": "Noël"}))
+    assert any_repository.search("helie", limit=10) == []
+    assert [f.id for f in any_repository.search("noel", limit=10)] == [fiche.id]
+
+    any_repository.delete(fiche.id)
+    assert any_repository.search("noel", limit=10) == []
+
+
+def test_search_index_follows_bulk_upsert(any_repository):
+    fiche = make_fiche(lastname="Garçon", commentary="")
+    any_repository.save_many([fiche])
+
+    any_repository.save_many(
+        [fiche.model_copy(update={"id": "ignored", "commentary": "véranda"})],
+        upsert=True,
+    )
+
+    assert [f.id for f in any_repository.search("veranda", limit=10)] == [fiche.id]
+    assert [f.id for f in any_repository.search("garcon", limit=10)] == [fiche.id]
+
+
+def test_bulk_upsert_indexes_a_key_repeated_in_one_chunk_once(session):
+    repository = SQLiteFicheRepository(session=session)
+    fiche = make_fiche(lastname="Garçon", commentary="")
+    repository.save_many([fiche])
+
+    results = repository.save_many(
+        [
+            fiche.model_copy(update={"id": "first", "commentary": "véranda"}),
+            fiche.model_copy(update={"id": "last", "commentary": "pergola"}),
+        ],
+        upsert=True,
+    )
+
+    assert [(r.status, r.id) for r in results] == [("updated", fiche.id)] * 2
+    assert repository.search("veranda", limit=10) == []
+    assert [f.id for f in repository.search("pergola", limit=10)] == [fiche.id]
+
+
+def write_stats_scenario(repository) -> None:
+    paris = make_fiche(works_planned=[WorksPlanned(work="fenetre", details={})])
+    lyon = make_fiche(
+        city="Lyon", telephone="0600000002", origin_contact=OriginContact.CLIENT
+    )
+    repository.save(paris)
+    repository.save_many([lyon])
+
+    moved = repository.get_by_id(paris.id)
+    moved.city = "Nantes"
+    moved.works_planned = [
+        WorksPlanned(work="fenetre", details={}),
+        WorksPlanned(work="volet", details={}),
+    ]
+    repository.update(paris.id, moved)
+    repository.transition_status(lyon.id, Status.COMPLETED)
+    repository.save_many([lyon.model_copy(update={"city": "Lille"})], upsert=True)
+
+    gone = make_fiche(telephone="0600000003")
+    repository.save(gone)
+    repository.delete(gone.id)
+
+
+def test_stats_follow_every_write(any_repository):
+    write_stats_scenario(any_repository)
+
+    assert any_repository.stats() == {
+        "status": {"Completed": 1, "In Progress": 1},
+        "origin_contact": {"Ancien client": 1, "Salon": 1},
+        "city": {"Lille": 1, "Nantes": 1},
+        "work": {"fenetre": 1, "volet": 1},
+    }
+    assert any_repository.stats(StatsDimension.CITY) == {
+        "city": {"Lille": 1, "Nantes": 1}
+    }
+
+
+def test_stats_triggers_match_a_full_recount(session):
+    repository = SQLiteFicheRepository(session=session)
+    write_stats_scenario(repository)
+    maintained = repository.stats()
+
+    rebuild_stats(session)
+
+    assert repository.stats() == maintained